@@ -1,3 +1,8 @@
+import sys
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
 import customtkinter as ctk
 from customtkinter import CTkFont
 from PIL import Image
@@ -6,20 +11,30 @@ import os
 from datetime import datetime
 import shutil
 import sqlite3
-import json
 import threading
 import queue
 import weakref
+import bisect
+from collections import OrderedDict
 from utils.db_manager import DatabaseManager
 from utils.file_handler import FileHandler
 from datetime import datetime
 from utils.extra_images import ExtraImagesManager
 from utils.settings import SettingsModal
-from utils.import_characters import ImportModal
-from utils.aicc_site_functions import AICCImporter
+from utils.blob_store import blob_store
+from utils.image_ingest import crop_thumbnail
+from utils.import_pipeline import ImportPipeline
 from utils.st_tag_manager import TagsManager
 from utils.st_tag_manager_edit_panel import SillyTavernTagManager
+from utils.tag_mirror import TagMirror
 from utils.import_lorebooks import LorebookManager
+from utils.job_manager import JobManager, format_duration
+from utils.jobs_panel import JobsPanel
+from utils.card_viewer import CardDataViewer
+from utils.character_model import Character, load_characters
+from utils.sort_index import SortIndex
+from utils.character_query import CharacterQuery, LIST_QUERY_THRESHOLD, count_characters
+from utils.startup_profile import StartupProfiler
 from tkinter.filedialog import askopenfilename
 from tkinter.messagebox import askyesno
 from utils.card_metadata import PNGMetadataReader
@@ -43,48 +58,77 @@ from utils.lorebook_functions import (
     unlink_character_from_lorebook
 )
 
+DEFAULT_SETTINGS = {
+    "appearance_mode": "dark",
+    "sillytavern_path": "",
+    "default_sort_order": "A - Z",
+    "items_per_page": "5",
+    "tags_per_page": "10",
+}
+
+
 class CharacterCardManagerApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, profile_startup=False):
+        self.startup_profiler = StartupProfiler(STARTUP_STARTED, enabled=profile_startup)
+        self.startup_profiler.mark("imports")
         super().__init__()
         self.title("AI Card Vault")
         self.geometry("1400x710")
         ctk.set_appearance_mode("dark")  # Use system theme
         ctk.set_default_color_theme("assets/AiCardVaultTheme.json")
         self.current_page = 0  # Start at the first page
-        
+        self.startup_profiler.mark("window")
 
         # Initialize database and file handler
         self.db_manager = DatabaseManager()
         self.file_handler = FileHandler()
-
-        # Load settings from the database
+        self.startup_profiler.mark("database")
+
+        # Shared executor for sync, import and other background jobs
+        self.job_manager = JobManager(self, self.db_manager.db_path)
+        self.jobs_panel = JobsPanel(self, self.job_manager)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Load settings from the database in one query, storing defaults for any that are missing
+        stored_settings = self.db_manager.get_all_settings()
+        missing_defaults = {key: value for key, value in DEFAULT_SETTINGS.items() if not stored_settings.get(key)}
+        if missing_defaults:
+            self.db_manager.ensure_settings(missing_defaults)
+        stored_settings = {**DEFAULT_SETTINGS, **{key: value for key, value in stored_settings.items() if value}}
         self.settings = {
-            "appearance_mode": self.db_manager.get_setting("appearance_mode", "dark"),
-            "sillytavern_path": Path(self.db_manager.get_setting("sillytavern_path", "")).resolve(),
-            "default_sort_order": self.db_manager.get_setting("default_sort_order", "A - Z"),
-            "items_per_page": int(self.db_manager.get_setting("items_per_page", "5")),  # Default to 5 if not set
-            "tags_per_page": int(self.db_manager.get_setting("tags_per_page", "10")),  # Default to 10 if not set
+            "appearance_mode": stored_settings["appearance_mode"],
+            "sillytavern_path": Path(stored_settings["sillytavern_path"]).resolve(),
+            "default_sort_order": stored_settings["default_sort_order"],
+            "items_per_page": int(stored_settings["items_per_page"]),
+            "tags_per_page": int(stored_settings["tags_per_page"]),
         }
-
-        # Initialize SillyTavernTagManager after settings are loaded
-        self.tag_manager = SillyTavernTagManager(self.settings["sillytavern_path"])
-
-        # Ensure default sort order is set if not already present
-        if not self.db_manager.get_setting("default_sort_order"):
-            self.db_manager.set_setting("default_sort_order", "A - Z")
-
-        # Ensure items_per_page and tags_per_page are set if not already present
-        if not self.db_manager.get_setting("items_per_page"):
-            self.db_manager.set_setting("items_per_page", "5")
-        if not self.db_manager.get_setting("tags_per_page"):
-            self.db_manager.set_setting("tags_per_page", "10")
-
-        # Load items_per_page and tags_per_page from settings
-        self.items_per_page = int(self.db_manager.get_setting("items_per_page", "5"))  # Default to 5
-        self.tags_per_page = int(self.db_manager.get_setting("tags_per_page", "10"))  # Default to 10
+        self.items_per_page = self.settings["items_per_page"]
+        self.tags_per_page = self.settings["tags_per_page"]
+        self.startup_profiler.mark("settings")
+
+        # SillyTavern tags and lorebooks are loaded on first use (see the tag_manager / lorebook_manager properties)
+        self._tag_manager = None
+        self.tag_mirror = TagMirror(self.db_manager.db_path)  # SQLite copy of the tags, synced by the tag manager
+        self._lorebook_manager = None
+
+        # Built on first use as well (see the properties below __init__)
+        self._http_cache = None
+        self._relationship_dashboard = None
+        self._relationship_graph = None
+        self._relationship_graph_view = None
+        self._duplicate_index = None
+        self._duplicates_view = None
+        self._prefetcher = None
+        self._subsystem_lock = threading.Lock()  # duplicate_index is first reached from thumbnail threads
+        self.prefetch_after_id = None
+        self.pending_selection_id = None
+        self.selection_after_id = None
 
         self.total_pages = 0  # Calculate based on the number of items
-        self.filtered_characters = []  # This will hold the search results
+        self.all_characters = []
+        self.sort_index = SortIndex()  # all_characters presorted in every sort order
+        self.query_mode = False  # Large libraries are listed through CharacterQuery instead of all_characters
+        self.filtered_characters = []  # This will hold the search results (a CharacterQuery in query mode)
         self.search_debounce_timer = None
 
         # Pagination variables for tags
@@ -95,6 +139,10 @@ class CharacterCardManagerApp(ctk.CTk):
         self.potential_tags_full_list = []
 
         self.thumbnail_queue = queue.Queue()  # Initialize the queue
+        self.thumbnail_cache = OrderedDict()  # (path, mtime) -> CTkImage, least recently used first
+        self.thumbnail_cache_lock = threading.Lock()
+        self.thumbnail_cache_size = 500
+        self.placeholder_thumbnails = {}  # size -> CTkImage
         self.process_thumbnail_queue()        # Start processing the queue
 
                 # Initialize ExtraImagesManager
@@ -105,9 +153,8 @@ class CharacterCardManagerApp(ctk.CTk):
             show_message_callback=self.show_message,
         )
 
-        db_path=self.db_manager.db_path
-        self.lorebook_manager = LorebookManager(self.settings["sillytavern_path"], db_path)
         self.selected_lorebook_id = None  # Initialize with None
+        self.startup_profiler.mark("subsystems")
 
         # Layout
         self.grid_columnconfigure(0, weight=1)  # Sidebar grows slightly
@@ -117,13 +164,115 @@ class CharacterCardManagerApp(ctk.CTk):
 
         # Create UI components
         self.create_sidebar()
+        self.startup_profiler.mark("sidebar")
         self.create_character_list()
+        self.startup_profiler.mark("character list")
         self.create_edit_panel()
+        self.startup_profiler.mark("edit panel")
+
+        # Keyboard navigation through the character list (ignored while typing in a text field)
+        self.bind("<Up>", lambda event: self.navigate_characters(event, -1))
+        self.bind("<Down>", lambda event: self.navigate_characters(event, 1))
+        self.bind("<Prior>", lambda event: self.navigate_characters(event, -self.items_per_page))
+        self.bind("<Next>", lambda event: self.navigate_characters(event, self.items_per_page))
+
+        # The window is drawn with the list first; the first character is selected once it is up
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        self.update_idletasks()
+        self.startup_profiler.mark("first draw")
+        # Automatically select the first character if none is selected
+        if not hasattr(self, "selected_character_id") and self.filtered_characters:
+            self.select_character_by_id(self.filtered_characters[0].id)
+        self.startup_profiler.finish("first selection")
+
+    @property
+    def tag_manager(self):
+        """SillyTavern tags, read from settings.json the first time they are needed."""
+        if self._tag_manager is None:
+            self._tag_manager = SillyTavernTagManager(self.settings["sillytavern_path"], self.tag_mirror)
+        return self._tag_manager
+
+    @tag_manager.setter
+    def tag_manager(self, tag_manager):
+        self._tag_manager = tag_manager
+
+    @property
+    def lorebook_manager(self):
+        """Lorebook manager, created when the lorebooks are first opened."""
+        if self._lorebook_manager is None:
+            self._lorebook_manager = LorebookManager(self.settings["sillytavern_path"], self.db_manager.db_path)
+        return self._lorebook_manager
+
+    @property
+    def http_cache(self):
+        """Conditional-request cache for AICC downloads, created (with its folder) on the first download."""
+        if self._http_cache is None:
+            from utils.http_cache import HTTPCache  # Imported on first use, like the subsystems below
+            self._http_cache = HTTPCache(self.db_manager.db_path)
+        return self._http_cache
+
+    @property
+    def relationship_dashboard(self):
+        """Character / lorebook / tag cross-reference queries and their dashboard."""
+        if self._relationship_dashboard is None:
+            from utils.relationship_queries import RelationshipQueries
+            from utils.relationship_dashboard import RelationshipDashboard
+            queries = RelationshipQueries(self.db_manager.db_path, lambda: self.tag_manager)
+            self._relationship_dashboard = RelationshipDashboard(self, self.job_manager, queries)
+        return self._relationship_dashboard
+
+    @property
+    def relationship_graph(self):
+        if self._relationship_graph is None:
+            from utils.relationship_graph import RelationshipGraph
+            self._relationship_graph = RelationshipGraph(self.db_manager.db_path)
+        return self._relationship_graph
+
+    @property
+    def relationship_graph_view(self):
+        if self._relationship_graph_view is None:
+            from utils.relationship_graph_view import RelationshipGraphView
+            self._relationship_graph_view = RelationshipGraphView(
+                self, self.db_manager.db_path, self.relationship_graph, self.select_character_by_id
+            )
+        return self._relationship_graph_view
+
+    @property
+    def duplicate_index(self):
+        with self._subsystem_lock:
+            if self._duplicate_index is None:
+                from utils.duplicates import DuplicateIndex
+                self._duplicate_index = DuplicateIndex(self.db_manager.db_path)
+            return self._duplicate_index
+
+    @property
+    def duplicates_view(self):
+        if self._duplicates_view is None:
+            from utils.duplicates_view import DuplicatesView
+            self._duplicates_view = DuplicatesView(self, self.job_manager, self.duplicate_index, self.select_character_by_id)
+        return self._duplicates_view
+
+    @property
+    def prefetcher(self):
+        """Neighbour prefetching; its worker thread starts with the first selection, after the window is drawn."""
+        if self._prefetcher is None:
+            from utils.prefetch import CharacterPrefetcher
+            self._prefetcher = CharacterPrefetcher(
+                self.db_manager.db_path, self.create_thumbnail, self.create_thumbnail_small
+            )
+        return self._prefetcher
 
 ######################################################################################################
 ############################################# APP SETTINGS ###########################################
 ######################################################################################################
 
+    def on_close(self):
+        """Cancel background jobs before the window closes."""
+        self.job_manager.shutdown()
+        self.destroy()
+
     def open_settings(self):
         """Open the settings modal."""
         settings_modal = SettingsModal(
@@ -159,7 +308,8 @@ class CharacterCardManagerApp(ctk.CTk):
                 return
 
             print("Reinitializing SillyTavernTagManager with the new path...")
-            self.tag_manager = SillyTavernTagManager(new_sillytavern_path)
+            self.tag_manager = SillyTavernTagManager(new_sillytavern_path, self.tag_mirror)
+            self._lorebook_manager = None
 
         # Update items_per_page and tags_per_page dynamically in the UI
         self.items_per_page = int(updated_settings["items_per_page"])
@@ -190,12 +340,14 @@ class CharacterCardManagerApp(ctk.CTk):
         self.add_character_button = ctk.CTkButton(self.sidebar, text="Add Character", command=self.add_character)
         self.add_character_button.pack(pady=10, padx=10, fill="x")
 
-        # self.import_button = ctk.CTkButton(self.sidebar, text="Import Cards From SillyTavern", command=self.open_import_modal)
-        # self.import_button.pack(pady=10, padx=10, fill="x")
+        self.bulk_import_button = ctk.CTkButton(self.sidebar, text="Bulk Import Cards", command=self.open_import_modal)
+        self.bulk_import_button.pack(pady=10, padx=10, fill="x")
 
         self.sync_button = ctk.CTkButton(self.sidebar, text="Sync Data from SillyTavern", command=self.sync_cards_from_sillytavern)
         self.sync_button.pack(pady=10, padx=10, fill="x")
 
+        self.aicc_updates_button = ctk.CTkButton(self.sidebar, text="Check AICC Updates", command=self.check_aicc_updates)
+        self.aicc_updates_button.pack(pady=10, padx=10, fill="x")
 
         self.import_button = ctk.CTkButton(self.sidebar, text="Manage Tags", command=self.open_import_tags_modal)
         self.import_button.pack(pady=10, padx=10, fill="x")
@@ -203,10 +355,22 @@ class CharacterCardManagerApp(ctk.CTk):
         self.manage_lorebooks_button = ctk.CTkButton(self.sidebar, text="Manage Lorebooks", command=self.open_lorebooks_modal_action)
         self.manage_lorebooks_button.pack(pady=10, padx=10, fill="x")
 
+        self.dashboard_button = ctk.CTkButton(
+            self.sidebar, text="Relationship Dashboard",
+            command=lambda: self.relationship_dashboard.open(getattr(self, "selected_character_id", None))
+        )
+        self.dashboard_button.pack(pady=10, padx=10, fill="x")
+
+        self.duplicates_button = ctk.CTkButton(self.sidebar, text="Find Duplicates", command=lambda: self.duplicates_view.open())
+        self.duplicates_button.pack(pady=10, padx=10, fill="x")
+
 
         # self.export_button = ctk.CTkButton(self.sidebar, text="Export Data", command=self.export_data)
         # self.export_button.pack(pady=10, padx=10, fill="x")
 
+        self.jobs_button = ctk.CTkButton(self.sidebar, text="Background Jobs", command=self.jobs_panel.open)
+        self.jobs_button.pack(pady=10, padx=10, fill="x")
+
         self.settings_button = ctk.CTkButton(self.sidebar, text="Settings", command=self.open_settings)
         self.settings_button.pack(pady=10, padx=10, fill="x")
 
@@ -246,7 +410,7 @@ class CharacterCardManagerApp(ctk.CTk):
         left_spacer.pack(side="left", expand=True)
 
         # Sort Dropdown
-        default_sort_order = self.db_manager.get_setting("default_sort_order", "A - Z")
+        default_sort_order = self.settings["default_sort_order"]
         self.sort_var = ctk.StringVar(value=default_sort_order)
         sort_dropdown = ctk.CTkOptionMenu(
             sort_and_filter_frame,
@@ -259,6 +423,7 @@ class CharacterCardManagerApp(ctk.CTk):
 
         # Character Tags Filter Button
         self.character_tags_filter = []
+        self.character_untagged_filter = False  # "No tags" filter, kept with the tag filter
         char_tags_button = ctk.CTkButton(
             sort_and_filter_frame,
             text="Filter by Tags",
@@ -292,11 +457,13 @@ class CharacterCardManagerApp(ctk.CTk):
         self.card_count_label.pack(pady=(0, 5))
 
         # Load and display all characters initially
-        self.all_characters = self.get_character_list()
+        self.load_character_list()
 
         # Default Sort
-        
-        self.filtered_characters = self.all_characters.copy()  # Initially, no filtering
+        if self.query_mode:
+            self.filtered_characters = CharacterQuery(self.db_manager.db_path, default_sort_order)
+        else:
+            self.filtered_characters = list(self.all_characters)  # Initially, no filtering
         self.sort_character_list(default_sort_order)
 
         # Display characters
@@ -405,29 +572,38 @@ class CharacterCardManagerApp(ctk.CTk):
             self.scrollable_frame._parent_canvas.yview_moveto(0)
 
 
-    def filter_character_list(self, no_tags_only=False):
-        """Filter the character list based on search query and selected tags."""
-        query = self.search_var.get().lower().strip()
+    def filter_character_list(self, no_tags_only=None):
+        """
+        Filter the character list based on search query and selected tags, in the selected sort order.
+        no_tags_only sets the "no tags" filter; by default the current one is kept.
+        """
+        if no_tags_only is None:
+            no_tags_only = self.character_untagged_filter
+        self.character_untagged_filter = no_tags_only
+        query = self.search_var.get().casefold().strip()
         selected_tags = self.character_tags_filter
-
-        def character_has_selected_tags(character_name):
-            character_name_png = f"{character_name}.png" if not character_name.endswith(".png") else character_name
-            character_tags = [
-                self.tag_manager.get_tag_by_id(tag_id)["name"]
-                for tag_id in self.tag_manager.tag_map.get(character_name_png, [])
+        if selected_tags or no_tags_only:
+            # Tag filters read the tag mirror, which the tag manager syncs when settings.json changed
+            self.tag_manager.reload_tags_if_changed()
+
+        if isinstance(self.filtered_characters, CharacterQuery):
+            self.filtered_characters.close()  # Also when the list just left query mode
+        if self.query_mode:
+            # Search, tag filter and sort run in SQL; only the page shown is fetched
+            self.filtered_characters = CharacterQuery(
+                self.db_manager.db_path, self.sort_var.get(), self.search_var.get().strip(),
+                self.tag_mirror, selected_tags, no_tags_only,
+            )
+        else:
+            tagged_names = self.tag_mirror.names_with_tags(selected_tags) if selected_tags else None
+            untagged_excluded = self.tag_mirror.tagged_names() if no_tags_only else None
+            # Filtering the presorted order keeps the results in the selected sort order
+            self.filtered_characters = [
+                char for char in self.sort_index.ordered(self.sort_var.get())
+                if (not query or query in char.name_key)
+                and (tagged_names is None or char.name in tagged_names)
+                and (untagged_excluded is None or char.name not in untagged_excluded)
             ]
-            return all(tag in character_tags for tag in selected_tags)
-
-        def character_has_no_tags(character_name):
-            character_name_png = f"{character_name}.png" if not character_name.endswith(".png") else character_name
-            return character_name_png not in self.tag_manager.tag_map or not self.tag_manager.tag_map[character_name_png]
-
-        self.filtered_characters = [
-            char for char in self.all_characters
-            if (not query or query in char["name"].lower())
-            and (not selected_tags or character_has_selected_tags(char["name"]))
-            and (not no_tags_only or character_has_no_tags(char["name"]))
-        ]
 
         # Recalculate pages and refresh the display
         self.total_pages = (len(self.filtered_characters) + self.items_per_page - 1) // self.items_per_page
@@ -438,17 +614,11 @@ class CharacterCardManagerApp(ctk.CTk):
 
     def sort_character_list(self, sort_option):
         """Sort the character list based on the selected option."""
-        # Sort logic
-        if sort_option == "A - Z":
-            self.filtered_characters.sort(key=lambda char: char["name"].lower())
-        elif sort_option == "Z - A":
-            self.filtered_characters.sort(key=lambda char: char["name"].lower(), reverse=True)
-        elif sort_option == "Newest":
-            self.filtered_characters.sort(key=lambda char: char["created_date"], reverse=True)
-        elif sort_option == "Oldest":
-            self.filtered_characters.sort(key=lambda char: char["created_date"])
-        elif sort_option == "Most Recently Edited":
-            self.filtered_characters.sort(key=lambda char: char["last_modified_date"], reverse=True)
+        if self.query_mode:
+            self.filtered_characters = self.filtered_characters.sorted(sort_option)
+        else:
+            # Read the filtered characters off the presorted order (no sort needed)
+            self.filtered_characters = self.sort_index.ordered(sort_option, self.filtered_characters)
 
         # Recalculate pages and refresh the display
         self.total_pages = (len(self.filtered_characters) + self.items_per_page - 1) // self.items_per_page
@@ -459,38 +629,53 @@ class CharacterCardManagerApp(ctk.CTk):
 
     def get_character_list(self):
         """Retrieve the list of characters from the database."""
-        connection = sqlite3.connect(self.db_manager.db_path)
-        cursor = connection.cursor()
-        cursor.execute(
-            "SELECT id, name, main_file, created_date, last_modified_date FROM characters"
-        )
-        characters = cursor.fetchall()
-        connection.close()
+        return load_characters(self.db_manager.db_path)
 
-        # Convert to a list of dictionaries
-        return [
-            {
-                "id": row[0],
-                "name": row[1],
-                "image_path": row[2],
-                "main_file": row[2],
-                "created_date": row[3],
-                "last_modified_date": row[4]
-            }
-            for row in characters
-        ]
+    def set_character_list(self, characters):
+        """Replace the in-memory character list and its sort orders."""
+        self.all_characters = characters
+        self.sort_index.rebuild(characters)
+
+    def load_character_list(self):
+        """
+        Load the characters into memory, or for libraries over LIST_QUERY_THRESHOLD switch to query mode,
+        where the list is read page by page from SQL and memory use doesn't grow with the library.
+        Callers refresh the view with filter_character_list afterwards.
+        """
+        self.query_mode = count_characters(self.db_manager.db_path) > LIST_QUERY_THRESHOLD
+        self.set_character_list([] if self.query_mode else self.get_character_list())
+
+    def check_list_mode(self):
+        """
+        After characters were added or deleted, switch between the in-memory list and query mode if the
+        library crossed LIST_QUERY_THRESHOLD. Returns True if it switched (the list is then reloaded and
+        redrawn with the current filters).
+        """
+        if (count_characters(self.db_manager.db_path) > LIST_QUERY_THRESHOLD) == self.query_mode:
+            return False
+        self.load_character_list()
+        self.filter_character_list()
+        return True
+
+    def character_position(self, character_id):
+        """Index of a character in the filtered list, or None if it isn't shown."""
+        if self.query_mode:
+            return self.filtered_characters.position(character_id)
+        return next(
+            (index for index, character in enumerate(self.filtered_characters) if character.id == character_id), None
+        )
     
 
     def add_character_to_list(self, character):
         """Add a character entry to the list with a thumbnail image."""
         char_frame = ctk.CTkFrame(self.scrollable_frame, corner_radius=5, border_width=0, border_color="")
-        char_frame.character_id = character["id"]  # Assign the character ID
-        char_frame.character_name = character["name"]  # Assign the character name
+        char_frame.character_id = character.id  # Assign the character ID
+        char_frame.character_name = character.name  # Assign the character name
         char_frame.pack(pady=(0, 1), padx=5, fill="x")
 
-        image_path = character.get("image_path", "assets/default_thumbnail.png")
-        created_date = character.get("created_date", "Unknown Date")
-        last_modified_date = character.get("last_modified_date", "Unknown Date")
+        image_path = character.main_file or "assets/default_thumbnail.png"
+        created_date = character.created_date
+        last_modified_date = character.last_modified_date
 
         # Reformat dates for display
         formatted_created_date = self.format_date(created_date)
@@ -500,13 +685,8 @@ class CharacterCardManagerApp(ctk.CTk):
         char_frame.grid_columnconfigure(0, weight=0)  # Fixed size for image column
         char_frame.grid_columnconfigure(1, weight=1)  # Flexible size for text column
 
-        # Add Placeholder Thumbnail
-        placeholder_thumbnail = ctk.CTkImage(Image.open("assets/default_thumbnail.png"), size=(50, 75))
-        thumbnail_label = ctk.CTkLabel(char_frame, image=placeholder_thumbnail, text="")
-        thumbnail_label.grid(row=0, column=0, rowspan=3, padx=5, pady=5, sticky="n")
-
-        # Add Thumbnail with lazy loading
-        thumbnail_label = ctk.CTkLabel(char_frame, text="")
+        # Thumbnail with lazy loading (shared placeholder until it arrives)
+        thumbnail_label = ctk.CTkLabel(char_frame, image=self.placeholder_thumbnail((50, 75)), text="")
         thumbnail_label.grid(row=0, column=0, rowspan=3, padx=5, pady=5, sticky="n")
         self.create_thumbnail(
             image_path,
@@ -515,7 +695,7 @@ class CharacterCardManagerApp(ctk.CTk):
         )
 
             # Character Name Label
-        name_label = ctk.CTkLabel(char_frame, text=character["name"], anchor="w", font=ctk.CTkFont(size=14, weight="bold"))
+        name_label = ctk.CTkLabel(char_frame, text=character.name, anchor="w", font=ctk.CTkFont(size=14, weight="bold"))
         name_label.grid(row=0, column=1, sticky="w", pady=2, padx=5)
 
         # Created Date Label
@@ -529,17 +709,24 @@ class CharacterCardManagerApp(ctk.CTk):
         # Bind click events to `select_character_by_id`
         widgets_to_bind = [char_frame, thumbnail_label, name_label, created_date_label, modified_date_label]
         for widget in widgets_to_bind:
-            widget.bind("<Button-1>", lambda e, char_id=character["id"]: self.select_character_by_id(char_id))
+            widget.bind("<Button-1>", lambda e, char_id=character.id: self.request_character_selection(char_id))
 
         
     def remove_character_from_list(self, character_id):
         """Remove the character from the in-memory lists and refresh the UI."""
         try:
-            # Remove from the all_characters list
-            self.all_characters = [char for char in self.all_characters if char["id"] != character_id]
+            if self.check_list_mode():
+                return  # Back under the threshold: reloaded into memory
+            if self.query_mode:
+                # The row is already deleted; the next page read reflects it
+                self.filtered_characters.refresh()
+            else:
+                # Remove from the all_characters list
+                self.all_characters = [char for char in self.all_characters if char.id != character_id]
+                self.sort_index.remove(character_id)
 
-            # Remove from the filtered_characters list
-            self.filtered_characters = [char for char in self.filtered_characters if char["id"] != character_id]
+                # Remove from the filtered_characters list
+                self.filtered_characters = [char for char in self.filtered_characters if char.id != character_id]
 
             # Recalculate total pages and reset to the current page
             self.total_pages = (len(self.filtered_characters) + self.items_per_page - 1) // self.items_per_page
@@ -587,15 +774,8 @@ class CharacterCardManagerApp(ctk.CTk):
 
         # Add character image
         try:
-            img = Image.open(image_path)
-
-            # Resize to fit within sidebar
-            max_width = 200
-            aspect_ratio = img.width / img.height
-            new_height = int(max_width / aspect_ratio)
-
-            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-            ctk_image = ctk.CTkImage(img, size=(max_width, new_height))
+            # Resized to fit within the sidebar; usually already prefetched
+            ctk_image = self.prefetcher.portrait(image_path)
         except Exception as e:
             print(f"Error loading character image: {e}")
             # Use a default image in case of error
@@ -624,22 +804,14 @@ class CharacterCardManagerApp(ctk.CTk):
         
         # Update the specific character in the list
         for character in self.all_characters:
-            if character["id"] == character_id:
-                character["name"] = character_name
-                character["last_modified_date"] = last_modified_date
+            if character.id == character_id:
+                character.update(character_name, last_modified_date)
+                self.sort_index.update(character)
                 break
 
-        # Sort the list alphabetically by name (optional, depending on UI requirements)
-        self.all_characters.sort(key=lambda char: char["name"].lower())
-
-        # Refresh filtered characters and pagination
-        self.filtered_characters = self.all_characters
-        self.total_pages = (len(self.filtered_characters) + self.items_per_page - 1) // self.items_per_page
-        self.current_page = 0  # Reset to the first page
-
-        # Refresh UI
-        self.display_characters()
-        self.update_navigation_buttons()
+        # Refresh filtered characters and pagination with the current sort, search and tag filter
+        # (in query mode this closes the previous query and opens a new one)
+        self.filter_character_list()
 
         # Update UI for the specific character in the scrollable frame
         for widget in self.scrollable_frame.winfo_children():
@@ -656,125 +828,197 @@ class CharacterCardManagerApp(ctk.CTk):
 
                 # Rebind click events for the updated frame and its children
                 for sub_widget in widget.winfo_children():
-                    sub_widget.bind("<Button-1>", lambda e, char_id=character_id: self.select_character_by_id(char_id))
-                widget.bind("<Button-1>", lambda e, char_id=character_id: self.select_character_by_id(char_id))
+                    sub_widget.bind("<Button-1>", lambda e, char_id=character_id: self.request_character_selection(char_id))
+                widget.bind("<Button-1>", lambda e, char_id=character_id: self.request_character_selection(char_id))
                 return
             
 
+    def schedule_prefetch(self, character_id):
+        """Warm the caches for the characters around the selection once browsing pauses and the UI is idle."""
+        self.prefetcher.cancel()
+        if self.prefetch_after_id:
+            self.after_cancel(self.prefetch_after_id)
+
+        def start():
+            self.prefetch_after_id = None
+            self.after_idle(plan)
+
+        def plan():
+            index = self.character_position(character_id)
+            if index is None:
+                return
+            # Only the selection's page and its neighbours are needed (and fetched, in query mode)
+            start_index = max(index - index % self.items_per_page - self.items_per_page, 0)
+            window = self.filtered_characters[start_index:start_index + 3 * self.items_per_page]
+            self.prefetcher.schedule_around([character.id for character in window], character_id, self.items_per_page)
+
+        self.prefetch_after_id = self.after(300, start)
+
+    def request_character_selection(self, character_id):
+        """
+        Select a character from a list click or keyboard navigation. The list highlight moves at once;
+        the edit panel follows in one idle callback for whichever character is latest by then, so
+        selections made faster than the panel can render are dropped.
+        """
+        self.pending_selection_id = character_id
+        self.highlight_selected_character(character_id)
+        if self.selection_after_id is None:
+            self.selection_after_id = self.after_idle(self._apply_pending_selection)
+
+    def _apply_pending_selection(self):
+        self.selection_after_id = None
+        character_id, self.pending_selection_id = self.pending_selection_id, None
+        if character_id is not None:
+            self.select_character_by_id(character_id)
+
     def select_character_by_id(self, character_id):
-        """Handle character selection by ID and populate the edit panel."""
+        """Handle character selection by ID: collect its state, then populate the edit panel in one pass."""
         try:
-            # Get the currently visible tab, if any
-            current_tab_name = None
-            if hasattr(self, "edit_panel"):
-                for widget in self.edit_panel.winfo_children():
-                    if isinstance(widget, ctk.CTkTabview):
-                        current_tab_name = widget.get()  # Get the name of the currently active tab
-                        break
+            state = self._collect_selection_state(character_id)
+            if state:
+                self._apply_selection_state(state)
+            else:
+                # Handle case where the character does not exist
+                self.clear_edit_panel()
+                self.show_message("Character not found. Please refresh the list.", "error")
+        except Exception as e:
+            print(f"Error in select_character_by_id: {e}")
 
-            # Fetch character details from the database
-            connection = sqlite3.connect(self.db_manager.db_path)
-            cursor = connection.cursor()
-            cursor.execute(
+    def _collect_selection_state(self, character_id):
+        """Read everything the edit panel shows for a character, without touching any widget."""
+        # Fetch character details from the database
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            result = connection.execute(
                 """
-                SELECT id, name, main_file, notes, misc_notes, created_date, last_modified_date 
+                SELECT id, name, main_file, notes, misc_notes, created_date, last_modified_date
                 FROM characters WHERE id = ?
                 """,
                 (character_id,),
-            )
-            result = cursor.fetchone()
-            connection.close()
+            ).fetchone()
+        if not result:
+            return None
+
+        name, main_file, notes, misc_notes, created_date, last_modified_date = result[1:]
+        image_path = Path("CharacterCards") / name / main_file if main_file else Path("assets/default_thumbnail.png")
+
+        # Parse char metadata if main_file exists (cached when prefetched)
+        if not main_file:
+            card_data = {"Error": "No main file specified."}
+        elif not image_path.exists():
+            card_data = {"Error": "Main file not found."}
+        else:
+            try:
+                card_data = self.prefetcher.metadata(image_path)
+            except Exception as e:
+                print(f"Error parsing metadata: {e}")
+                card_data = {"Error": "Could not parse metadata."}
+
+        return {
+            "id": result[0],
+            "name": name,
+            "image_path": str(image_path),
+            "card_data": card_data,
+            "fields": {
+                "name_entry": (name, "entry"),
+                "main_file_label": (f"Main File: {main_file}", "label"),
+                "notes_textbox": (notes or "", "textbox"),
+                "misc_notes_textbox": (misc_notes or "", "textbox"),
+                "created_date_label": (
+                    f"Created: {datetime.strptime(created_date, '%Y-%m-%d %H:%M:%S').strftime('%m/%d/%Y %I:%M %p')}",
+                    "label",
+                ),
+                "last_modified_date_label": (
+                    f"Last Modified: {datetime.strptime(last_modified_date, '%Y-%m-%d %H:%M:%S').strftime('%m/%d/%Y %I:%M %p')}",
+                    "label",
+                ),
+            },
+        }
 
-            if result:
-                # Extract data
-                self.selected_character_id = result[0]
-                self.selected_character_name = result[1]
-                name, main_file, notes, misc_notes, created_date, last_modified_date = result[1:]
-
-                # Handle None values
-                notes = notes or ""
-                misc_notes = misc_notes or ""
-
-                # Unified UI update
-                fields_to_update = {
-                    "name_entry": (name, "entry"),
-                    "main_file_label": (f"Main File: {main_file}", "label"),
-                    "notes_textbox": (notes, "textbox"),
-                    "misc_notes_textbox": (misc_notes, "textbox"),
-                    "created_date_label": (
-                        f"Created: {datetime.strptime(created_date, '%Y-%m-%d %H:%M:%S').strftime('%m/%d/%Y %I:%M %p')}",
-                        "label",
-                    ),
-                    "last_modified_date_label": (
-                        f"Last Modified: {datetime.strptime(last_modified_date, '%Y-%m-%d %H:%M:%S').strftime('%m/%d/%Y %I:%M %p')}",
-                        "label",
-                    ),
-                }
-
-                for field_name, (value, field_type) in fields_to_update.items():
-                    if hasattr(self, field_name):
-                        field = getattr(self, field_name)
-                        if field.winfo_exists():
-                            if field_type == "entry":
-                                field.delete(0, "end")
-                                field.insert(0, value)
-                            elif field_type == "label":
-                                field.configure(text=value)
-                            elif field_type == "textbox":
-                                field.delete("1.0", "end")
-                                field.insert("1.0", value)
-                            field.update_idletasks()
-
-                # Load extra images for the selected character
-                self.extra_images_manager.load_extra_images(
-                    self.selected_character_id,
-                    self.extra_images_frame,
-                    self.create_thumbnail,
-                )
+    def _apply_selection_state(self, state):
+        """Apply a collected selection to the edit panel; Tk lays everything out once afterwards."""
+        current_tab_name = self.edit_tabview.get()
+
+        self.selected_character_id = state["id"]
+        self.selected_character_name = state["name"]
+
+        # Unified UI update (no per-field layout passes)
+        for field_name, (value, field_type) in state["fields"].items():
+            field = getattr(self, field_name, None)
+            if field is None or not field.winfo_exists():
+                continue
+            if field_type == "entry":
+                field.delete(0, "end")
+                field.insert(0, value)
+            elif field_type == "label":
+                field.configure(text=value)
+            elif field_type == "textbox":
+                field.delete("1.0", "end")
+                field.insert("1.0", value)
+
+        # Load extra images for the selected character
+        self.extra_images_manager.load_extra_images(
+            self.selected_character_id,
+            self.extra_images_frame,
+            self.create_thumbnail,
+        )
 
-                self.load_related_characters()
-                self.load_tags_for_character(name)
+        self.load_related_characters()
+        self.load_tags_for_character(state["name"])
 
-                # Update the currently selected character in the sidebar
-                image_path = (
-                    Path("CharacterCards") / name / main_file
-                    if main_file else Path("assets/default_thumbnail.png")
-                )
-                self.update_currently_selected_character(name, str(image_path))
-
-                # Parse and load char metadata if main_file exists
-                if main_file:
-                    png_path = Path("CharacterCards") / name / main_file
-                    if png_path.exists():
-                        try:
-                            metadata = PNGMetadataReader.extract_text_metadata(str(png_path))
-                            highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
-                            self.load_card_data(highest_spec_metadata)  # Load into the Card Data tab
-                        except Exception as e:
-                            print(f"Error parsing metadata: {e}")
-                            self.load_card_data({"Error": "Could not parse metadata."})
-                    else:
-                        self.load_card_data({"Error": "Main file not found."})
-                else:
-                    self.load_card_data({"Error": "No main file specified."})
+        # Update the currently selected character in the sidebar and the Card Data tab
+        self.update_currently_selected_character(state["name"], state["image_path"])
+        self.load_card_data(state["card_data"])
 
+        # Highlight the selected character in the list
+        self.highlight_selected_character(state["id"])
+        self.schedule_prefetch(state["id"])
 
-                # Highlight the selected character in the list
-                self.highlight_selected_character(character_id)
+        # Restore the previously active tab
+        if self.edit_tabview.get() != current_tab_name:
+            self.edit_tabview.set(current_tab_name)
 
-                # Restore the previously active tab
-                if hasattr(self, "edit_panel") and current_tab_name:
-                    for widget in self.edit_panel.winfo_children():
-                        if isinstance(widget, ctk.CTkTabview):
-                            widget.set(current_tab_name)  # Restore the active tab
-                            break
-            else:
-                # Handle case where the character does not exist
-                self.clear_edit_panel()
-                self.show_message("Character not found. Please refresh the list.", "error")
+    def navigate_characters(self, event, step):
+        """Move the selection through the filtered list with the keyboard, turning pages as needed."""
+        # Leave arrow and page keys to text fields
+        widget = event.widget
+        if hasattr(widget, "winfo_class") and widget.winfo_class() in ("Entry", "Text", "TEntry", "TCombobox"):
+            return None
+        if not self.filtered_characters:
+            return "break"
 
-        except Exception as e:
-            print(f"Error in select_character_by_id: {e}")
+        current_id = self.pending_selection_id or getattr(self, "selected_character_id", None)
+        index = self.character_position(current_id) if current_id is not None else None
+        new_index = 0 if index is None else max(0, min(index + step, len(self.filtered_characters) - 1))
+        if new_index == index:
+            return "break"
+
+        page = new_index // self.items_per_page
+        if page != self.current_page:
+            self.current_page = page
+            self.display_characters()
+            self.update_navigation_buttons()
+
+        character_id = self.filtered_characters[new_index].id
+        self.request_character_selection(character_id)
+        self.after_idle(lambda: self.scroll_character_into_view(character_id))
+        return "break"
+
+    def scroll_character_into_view(self, character_id):
+        """Scroll the character list just enough to show a character's row."""
+        canvas = self.scrollable_frame._parent_canvas
+        total_height = self.scrollable_frame.winfo_height()
+        if total_height <= 0:
+            return
+        for widget in self.scrollable_frame.winfo_children():
+            if getattr(widget, "character_id", None) == character_id:
+                top = widget.winfo_y()
+                bottom = top + widget.winfo_height()
+                view_top, view_bottom = (fraction * total_height for fraction in canvas.yview())
+                if top < view_top:
+                    canvas.yview_moveto(top / total_height)
+                elif bottom > view_bottom:
+                    canvas.yview_moveto((bottom - (view_bottom - view_top)) / total_height)
+                break
 
 ######################################################################################################
 ########################################## GUI EDIT PANEL ############################################
@@ -824,6 +1068,7 @@ class CharacterCardManagerApp(ctk.CTk):
         # Create a CTkTabview for organizing sections
         tabview = ctk.CTkTabview(self.edit_panel, height=500)
         tabview.pack(fill="both", expand=True, padx=10, pady=10)
+        self.edit_tabview = tabview
 
         # Notes Tab
         notes_tab = tabview.add("Notes")
@@ -851,9 +1096,8 @@ class CharacterCardManagerApp(ctk.CTk):
         )
         chardata_label.pack(anchor="w", padx=0, pady=0)
 
-        # Frame to hold dynamically created fields
-        self.chardata_frame = ctk.CTkScrollableFrame(chardata_tab)
-        self.chardata_frame.pack(fill="both", expand=True, padx=0, pady=0)
+        # One reused viewer for all card fields
+        self.card_viewer = CardDataViewer(chardata_tab)
 
         # Extra Images Tab
         images_tab = tabview.add("Images")
@@ -876,6 +1120,13 @@ class CharacterCardManagerApp(ctk.CTk):
             command=self.open_link_character_modal
         )
         self.add_related_character_button.pack(pady=2, padx=10)
+
+        self.relationship_graph_button = ctk.CTkButton(
+            related_tab,
+            text="Relationship Graph",
+            command=lambda: self.relationship_graph_view.open(getattr(self, "selected_character_id", None))
+        )
+        self.relationship_graph_button.pack(pady=2, padx=10)
         
         # Search Bar for Related Characters
         self.related_search_var = ctk.StringVar()
@@ -1037,11 +1288,6 @@ class CharacterCardManagerApp(ctk.CTk):
         self.bind_mouse_wheel(self.assigned_tags_frame)
         self.bind_mouse_wheel(self.potential_tags_frame)
 
-        # Automatically select the first character if none is selected
-        if not hasattr(self, "selected_character_id") and self.filtered_characters:
-            first_character_id = self.filtered_characters[0]["id"]
-            self.select_character_by_id(first_character_id)
-
 
     def load_extra_images(self):
         """Delegate to ExtraImagesManager."""
@@ -1053,50 +1299,8 @@ class CharacterCardManagerApp(ctk.CTk):
 
 
     def load_card_data(self, card_data):
-        """
-        Dynamically create labels and textboxes for each key in the card data, with custom heights for specific keys.
-        """
-        # Define custom heights for specific keys
-        custom_heights = {
-            "name": 20,
-            "description": 150,
-            "personality": 150,
-            "scenario": 150,
-            "first_mes": 150,
-            "mes_example": 150,
-            "creator_notes": 100,
-            "creator": 20,
-            "creatorcomment": 50,
-            "character_version": 20,
-            "extensions": 50,
-            "alternate_greetings": 100,
-            "group_only_greetings": 50,
-            "tags": 100,
-        }
-        default_height = 50  # Default height for unspecified keys
-
-        # Clear previous fields
-        for widget in self.chardata_frame.winfo_children():
-            widget.destroy()
-
-        # Create a field for each key-value pair in the card data
-        for key, value in card_data.items():
-            # Label for the key
-            key_label = ctk.CTkLabel(
-                self.chardata_frame,
-                text=f"{key}:",
-                font=ctk.CTkFont(size=12, weight="bold")
-            )
-            key_label.pack(anchor="w", padx=0, pady=0)
-
-            # Determine the height of the textbox
-            height = custom_heights.get(key, default_height)
-
-            # Read-only textbox for the value
-            value_text = ctk.CTkTextbox(self.chardata_frame, height=height, state="normal", wrap="word")
-            value_text.insert("1.0", json.dumps(value, indent=4) if isinstance(value, (dict, list)) else str(value))
-            value_text.configure(state="disabled")  # Make the textbox read-only
-            value_text.pack(fill="x", padx=0, pady=(0, 2))
+        """Show the card's fields in the Card Data tab (large values start collapsed)."""
+        self.card_viewer.show(card_data)
 
 
     def display_character_metadata(self, character_metadata):
@@ -1155,22 +1359,22 @@ class CharacterCardManagerApp(ctk.CTk):
             connection.commit()
             connection.close()
 
-            # Update the internal list dynamically
-            for character in self.all_characters:
-                if character["id"] == self.selected_character_id:
-                    character["name"] = character_name
-                    character["last_modified_date"] = last_modified_date
-                    break
+            if self.query_mode:
+                self.filtered_characters.refresh()
+            else:
+                # Update the internal list dynamically
+                for character in self.all_characters:
+                    if character.id == self.selected_character_id:
+                        character.update(character_name, last_modified_date)
+                        self.sort_index.update(character)
+                        break
 
-            # Sort the list if required
-            sort_option = self.sort_var.get()
-            self.sort_character_list(sort_option)
+                # Re-read the filtered list from the sort orders (only the edited character moved)
+                self.filtered_characters = self.sort_index.ordered(self.sort_var.get(), self.filtered_characters)
+            self.total_pages = (len(self.filtered_characters) + self.items_per_page - 1) // self.items_per_page
 
             # Find the updated character's index in the filtered list
-            new_index = next(
-                (index for index, char in enumerate(self.filtered_characters) if char["id"] == self.selected_character_id),
-                0
-            )
+            new_index = self.character_position(self.selected_character_id) or 0
 
             # Calculate the page the character belongs to
             self.current_page = new_index // self.items_per_page
@@ -1309,8 +1513,18 @@ class CharacterCardManagerApp(ctk.CTk):
             connection = sqlite3.connect(self.db_manager.db_path)
             cursor = connection.cursor()
             cursor.execute("DELETE FROM characters WHERE id = ?", (self.selected_character_id,))
+            self.relationship_graph.remove_character(self.selected_character_id, cursor)
+
+            # Drop the character's extra images and any image blobs no one else uses
+            cursor.execute(
+                "SELECT DISTINCT content_hash FROM character_images WHERE character_id = ?",
+                (self.selected_character_id,)
+            )
+            content_hashes = [row[0] for row in cursor.fetchall()]
+            cursor.execute("DELETE FROM character_images WHERE character_id = ?", (self.selected_character_id,))
             connection.commit()
             connection.close()
+            blob_store.release(self.db_manager.db_path, content_hashes)
 
             # Remove the character from the UI list
             self.remove_character_from_list(self.selected_character_id)
@@ -1371,8 +1585,8 @@ class CharacterCardManagerApp(ctk.CTk):
         self.file_path_entry = ctk.CTkEntry(file_frame, placeholder_text="Select File", width=240)
         self.file_path_entry.pack(side="left", padx=5)
 
-        browse_button = ctk.CTkButton(file_frame, text="Browse", width=100, command=self.browse_file_add_char)
-        browse_button.pack(side="left", padx=5)
+        self.add_character_browse_button = ctk.CTkButton(file_frame, text="Browse", width=100, command=self.browse_file_add_char)
+        self.add_character_browse_button.pack(side="left", padx=5)
 
         # Character Name Section
         name_frame = ctk.CTkFrame(scrollable_frame)
@@ -1406,8 +1620,16 @@ class CharacterCardManagerApp(ctk.CTk):
         self.auto_add_checkbox.pack_forget()  # Hide initially
 
         # Submit Button
-        submit_button = ctk.CTkButton(scrollable_frame, text="Add Character", command=self.save_character_with_message)
-        submit_button.pack(pady=5, padx=10, anchor="w")
+        self.add_character_submit_button = ctk.CTkButton(scrollable_frame, text="Add Character", command=self.save_character_with_message)
+        self.add_character_submit_button.pack(pady=5, padx=10, anchor="w")
+
+        # Pipeline Progress (shown while an import or save runs in the background)
+        self.add_character_progress_frame = ctk.CTkFrame(self.add_character_window)
+        self.add_character_stage_label = ctk.CTkLabel(self.add_character_progress_frame, text="", anchor="w")
+        self.add_character_stage_label.pack(fill="x", padx=5)
+        self.add_character_progress_bar = ctk.CTkProgressBar(self.add_character_progress_frame)
+        self.add_character_progress_bar.set(0)
+        self.add_character_progress_bar.pack(fill="x", padx=5, pady=(0, 5))
         
         # API Import Section
         api_frame = ctk.CTkFrame(self.add_character_window)
@@ -1419,14 +1641,22 @@ class CharacterCardManagerApp(ctk.CTk):
         self.card_id_entry = ctk.CTkEntry(api_frame, placeholder_text="e.g., AICC/aicharcards/the-game-master", width=240)
         self.card_id_entry.pack(side="left", padx=5)
 
-        import_button = ctk.CTkButton(api_frame, text="Import", command=self.import_aicc_card)
-        import_button.pack(side="left", padx=5)
+        self.add_character_import_button = ctk.CTkButton(api_frame, text="Import", command=self.import_aicc_card)
+        self.add_character_import_button.pack(side="left", padx=5)
+
+        batch_import_button = ctk.CTkButton(
+            self.add_character_window,
+            text="Batch Import from AICC...",
+            command=self.open_aicc_batch_import_modal,
+        )
+        batch_import_button.pack(pady=(0, 10), padx=10, anchor="e")
 
         # Bind the mouse wheel to the scrollable frame
         self.bind_mouse_wheel(scrollable_frame)
 
     def import_aicc_card(self):
         """Import a card from AICC and handle only the file import."""
+        from utils.aicc_site_functions import AICCImporter  # Imported on use: pulls in requests
         card_id = self.card_id_entry.get().strip()
         if not card_id:
             self.show_add_character_message("Please enter a valid Card ID.", "error")
@@ -1437,13 +1667,10 @@ class CharacterCardManagerApp(ctk.CTk):
             sillytavern_path = Path(self.settings["sillytavern_path"]).resolve() / "characters"
 
             # Parse the card ID to get the file name
-            parts = card_id.split("/")
-            if len(parts) != 3 or parts[0] != "AICC":
-                raise ValueError("Invalid card ID format. Expected 'AICC/author/title'.")
-            title = parts[2]  # Extract the title as the file name
+            _, title = AICCImporter.parse_card_id(card_id)
             target_file_path = sillytavern_path / f"{title}.png"
 
-            # Check if the file already exists
+            # Check if the file already exists (dialogs stay on the UI thread, before the pipeline starts)
             if target_file_path.exists():
                 response = askyesno(
                     "File Conflict",
@@ -1459,75 +1686,285 @@ class CharacterCardManagerApp(ctk.CTk):
                 else:
                     self.show_add_character_message("Import canceled due to name conflict.", "error")
                     return
+        except Exception as e:
+            self.show_add_character_message(f"Error importing card: {str(e)}", "error")
+            return
 
-            # Fetch the card details and download the PNG file
-            card_details, downloaded_file = AICCImporter.fetch_card(card_id, target_file_path)
-
-            # Extract details from the API response
-            card_name = card_details.get("title", None)
-            excerpt = card_details.get("excerpt", "").strip()
-            content = card_details.get("content", "").strip()
+        def fetch(ctx, job):
+            # Download the PNG; metadata is parsed from the stream as it arrives
+            ctx["card_details"], ctx["file_path"], ctx["metadata"] = AICCImporter.fetch_card(
+                card_id, target_file_path, cache=self.http_cache, job=job
+            )
 
-            # Attempt to read metadata from the file for fallback
-            try:
-                metadata = PNGMetadataReader.extract_text_metadata(str(downloaded_file))
-                highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
-                creator_notes = highest_spec_metadata.get("creator_notes", "").strip()
-                description = highest_spec_metadata.get("description", "").strip()
-            except Exception as e:
-                print(f"Error reading metadata: {e}")
-                creator_notes = ""
-                description = ""
+        def remove_download(ctx):
+            # The import was canceled or failed after the card was placed
+            Path(ctx["file_path"]).unlink(missing_ok=True)
 
-            # Define the unwanted text
-            unwanted_notes = (
-                "This card was uploaded to https://aicharactercards.com, "
-                "please come back and rate the card if you enjoy it to help other users find the card."
+        def parse(ctx, job):
+            ctx["card_name"], ctx["notes"] = self.aicc_card_fields(
+                ctx["card_details"], ctx["file_path"], title, ctx["metadata"]
             )
-            if creator_notes == unwanted_notes:
-                creator_notes = ""
-            elif unwanted_notes in creator_notes:
-                creator_notes = creator_notes.replace(unwanted_notes, "").strip()
 
-            # Populate the file path and name fields
-            self.file_path_entry.delete(0, "end")
-            self.file_path_entry.insert(0, str(downloaded_file))
+        window = self.add_character_window
 
-            if card_name:
-                self.add_character_name_entry.delete(0, "end")
-                self.add_character_name_entry.insert(0, card_name)
-            else:
-                formatted_name = " ".join(word.capitalize() for word in title.replace("_", " ").replace("-", " ").split())
-                self.add_character_name_entry.delete(0, "end")
-                self.add_character_name_entry.insert(0, formatted_name)
-
-            # Prioritize notes: excerpt > content > creator_notes > description
-            if excerpt:
-                notes = excerpt
-            elif content:
-                notes = content
-            elif creator_notes:
-                notes = creator_notes
-            elif description:
-                notes = self.truncate_to_100_words(description)
-            else:
-                notes = ""
-
-            self.add_character_notes_textbox.delete("1.0", "end")
-            self.add_character_notes_textbox.insert("1.0", notes)
+        def on_done(job):
+            ctx = job.result
+            if not window.winfo_exists():
+                # Closed while the download was finishing: nothing will save the card
+                remove_download(ctx)
+                return
+            self.fill_add_character_fields(ctx["file_path"], ctx["card_name"], ctx["notes"])
 
-            # Set the flag to indicate the file was imported
+            # Set the flag to indicate the file was imported, and delete it if the dialog is closed unsaved
             self.is_imported_flag = True
+            self.temp_imported_file = ctx["file_path"]
 
             self.show_add_character_message("Card imported successfully. Fill in other details before saving.", "success")
 
+        pipeline = ImportPipeline(self.job_manager, "add_character_import")
+        pipeline.add_stage("Downloading card...", fetch, undo=remove_download).add_stage("Reading card data...", parse)
+        self.add_character_read_job = self.run_add_character_pipeline(pipeline, on_done, "Error importing card")
+
+    def aicc_card_fields(self, card_details, downloaded_file, title, metadata=None):
+        """Work out the character name and notes for a downloaded AICC card."""
+        # Extract details from the API response
+        card_name = card_details.get("title", None)
+        excerpt = (card_details.get("excerpt") or "").strip()
+        content = (card_details.get("content") or "").strip()
+
+        # Attempt to read metadata from the file for fallback (skipped when the download already parsed it)
+        try:
+            if metadata is None:
+                metadata = PNGMetadataReader.extract_text_metadata(str(downloaded_file))
+            highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
+            creator_notes = highest_spec_metadata.get("creator_notes", "").strip()
+            description = highest_spec_metadata.get("description", "").strip()
         except Exception as e:
-            self.show_add_character_message(f"Error importing card: {str(e)}", "error")
+            print(f"Error reading metadata: {e}")
+            creator_notes = ""
+            description = ""
+
+        # Define the unwanted text
+        unwanted_notes = (
+            "This card was uploaded to https://aicharactercards.com, "
+            "please come back and rate the card if you enjoy it to help other users find the card."
+        )
+        if creator_notes == unwanted_notes:
+            creator_notes = ""
+        elif unwanted_notes in creator_notes:
+            creator_notes = creator_notes.replace(unwanted_notes, "").strip()
+
+        if not card_name:
+            card_name = " ".join(word.capitalize() for word in title.replace("_", " ").replace("-", " ").split())
+
+        # Prioritize notes: excerpt > content > creator_notes > description
+        if excerpt:
+            notes = excerpt
+        elif content:
+            notes = content
+        elif creator_notes:
+            notes = creator_notes
+        elif description:
+            notes = self.truncate_to_100_words(description)
+        else:
+            notes = ""
+
+        return card_name, notes
+
+    def open_import_modal(self, paths=None):
+        """Open the bulk import modal for many card files or a folder of cards."""
+        from utils.import_characters import ImportModal  # Imported on first use
+        def refresh():
+            self.tag_manager.reload_tags()
+            self.load_character_list()
+            self.filter_character_list()
+
+        if not getattr(self, "import_modal", None):
+            self.import_modal = ImportModal(self, self.db_manager, self.settings["sillytavern_path"], refresh)
+        self.import_modal.sillytavern_path = Path(self.settings["sillytavern_path"])
+        self.import_modal.open(paths)
+
+    def open_aicc_batch_import_modal(self):
+        """Open a modal to import many AICC cards from a pasted list or a text file."""
+        from utils.aicc_site_functions import AICCBatchImporter  # Imported on use: pulls in requests
+        modal = ctk.CTkToplevel(self)
+        modal.title("Batch Import from AICC")
+        modal.geometry("450x460")
+        modal.transient(self)
+        modal.grab_set()
+
+        ids_label = ctk.CTkLabel(modal, text="Card IDs (one per line, e.g. AICC/author/title):", anchor="w")
+        ids_label.pack(pady=(10, 0), padx=10, anchor="w")
+
+        ids_textbox = ctk.CTkTextbox(modal, height=220)
+        ids_textbox.pack(fill="x", pady=5, padx=10)
+
+        status_label = ctk.CTkLabel(modal, text="", anchor="w", wraplength=420, justify="left")
+        status_label.pack(pady=(0, 5), padx=10, anchor="w")
+
+        progress_var = ctk.DoubleVar()
+        progress_bar = ctk.CTkProgressBar(modal, variable=progress_var)
+        progress_bar.pack(fill="x", pady=5, padx=10)
+        progress_bar.set(0)
+
+        # Offer to resume a batch that was interrupted or had failures
+        checkpoint = self.job_manager.load_checkpoint("aicc_batch_import")
+        if checkpoint and checkpoint.get("pending") and not self.job_manager.is_running("aicc_batch_import"):
+            ids_textbox.insert("1.0", "\n".join(checkpoint["pending"]))
+            status_label.configure(text=f"Resuming {len(checkpoint['pending'])} cards left over from the last batch.")
+
+        def load_from_file():
+            file_path = askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+            if file_path:
+                try:
+                    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                        ids_textbox.insert("end", f.read().strip() + "\n")
+                except OSError as e:
+                    status_label.configure(text=f"Failed to read file: {e}")
+
+        def on_progress(progress):
+            if progress_bar.winfo_exists() and progress["total"]:
+                progress_var.set(progress["done"] / progress["total"])
+                status_label.configure(
+                    text=f"Imported {progress['done']}/{progress['total']} "
+                         f"({progress['rate']:.1f}/s, ETA {format_duration(progress['eta'])}) {progress['message']}"
+                )
+
+        def start():
+            card_ids, invalid = AICCBatchImporter.parse_card_ids(ids_textbox.get("1.0", "end"))
+            if not card_ids:
+                status_label.configure(text="No valid card IDs found.")
+                return
+            if invalid:
+                print(f"Skipping invalid card IDs: {invalid}")
+            start_button.configure(state="disabled")
+            self.start_aicc_batch_import(card_ids, on_progress, on_finished=lambda job: modal.winfo_exists() and modal.destroy())
+
+        button_frame = ctk.CTkFrame(modal, fg_color="transparent")
+        button_frame.pack(fill="x", pady=10, padx=10)
+
+        load_button = ctk.CTkButton(button_frame, text="Load from File", command=load_from_file)
+        load_button.pack(side="left", padx=5)
+
+        start_button = ctk.CTkButton(button_frame, text="Start Import", command=start)
+        start_button.pack(side="right", padx=5)
+
+        # Closing the modal cancels the batch; the unfinished IDs stay queued for next time
+        def close():
+            self.job_manager.cancel("aicc_batch_import")
+            modal.destroy()
+
+        modal.protocol("WM_DELETE_WINDOW", close)
+
+    def start_aicc_batch_import(self, card_ids, on_progress=None, on_finished=None):
+        """Download and register a list of AICC cards as a background job."""
+        from utils.aicc_site_functions import AICCImporter, AICCBatchImporter  # Imported on use: pulls in requests
+        target_dir = Path(self.settings["sillytavern_path"]).resolve() / "characters"
+
+        def register_card(card_id, card_details, file_path, metadata):
+            _, title = AICCImporter.parse_card_id(card_id)
+            card_name, notes = self.aicc_card_fields(card_details, file_path, title, metadata)
+            created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                connection.execute(
+                    """INSERT INTO characters (name, main_file, notes, created_date, last_modified_date)
+                    VALUES (?, ?, ?, ?, ?)""",
+                    (card_name, str(file_path), notes, created_date, created_date),
+                )
+
+        def run(job):
+            importer = AICCBatchImporter(target_dir, max_workers=4, cache=self.http_cache)
+            result = importer.run(card_ids, job=job, on_card=register_card)
+            if not result["failed"]:
+                job.clear_checkpoint()  # Failures stay queued so reopening the modal offers to retry them
+            return result
+
+        def on_done(job):
+            result = job.result
+            self.load_character_list()
+            self.filter_character_list()
+            message = f"Imported {len(result['imported'])} cards."
+            if result["failed"]:
+                message += f" {len(result['failed'])} failed and were kept for retry."
+            self.show_message(message, "success" if not result["failed"] else "error")
+            if on_finished:
+                on_finished(job)
+
+        def on_stopped(job):
+            # Cards finished before the stop are already in the database
+            self.load_character_list()
+            self.filter_character_list()
+            if job.status == "failed":
+                self.show_message(f"Batch import failed: {job.error}", "error")
+            else:
+                self.show_message("Batch import canceled. Remaining cards will be offered next time.", "error")
+            if on_finished:
+                on_finished(job)
+
+        return self.job_manager.submit(
+            "aicc_batch_import", run, on_progress=on_progress, on_done=on_done, on_error=on_stopped, on_cancel=on_stopped
+        )
+
+    def check_aicc_updates(self):
+        """Revalidate AICC-sourced cards in the background and download only the ones that changed."""
+        from utils.aicc_site_functions import AICCImporter  # Imported on use: pulls in requests
+        if self.job_manager.is_running("aicc_update_check"):
+            self.show_message("An update check is already running. Open Background Jobs to see its progress.", "error")
+            return
 
+        updated_rows = []  # (id, name, last modified) of replaced cards, applied to the list on the main thread
+
+        def update_card(card_id, card_details, file_path, metadata):
+            # Same fields as a fresh import, re-read from the replaced PNG
+            _, title = AICCImporter.parse_card_id(card_id)
+            card_name, notes = self.aicc_card_fields(card_details, file_path, title, metadata)
+            last_modified_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                character_ids = [row[0] for row in connection.execute(
+                    "SELECT id FROM characters WHERE main_file = ?", (str(file_path),)
+                )]
+                connection.execute(
+                    "UPDATE characters SET name = ?, notes = ?, last_modified_date = ? WHERE main_file = ?",
+                    (card_name, notes, last_modified_date, str(file_path)),
+                )
+            updated_rows.extend((character_id, card_name, last_modified_date) for character_id in character_ids)
+
+        def run(job):
+            return AICCImporter.check_for_updates(self.http_cache, job=job, on_card=update_card)
+
+        def on_done(job):
+            result = job.result
+            if not result["checked"]:
+                self.show_message("No cards imported from AICC to check.", "success")
+                return
+            for character_id, card_name, last_modified_date in updated_rows:
+                self.update_character_list(character_id, card_name, last_modified_date)
+            message = f"Checked {result['checked']} AICC cards, {len(result['updated'])} updated."
+            if result["failed"]:
+                message += f" {len(result['failed'])} could not be checked."
+            self.show_message(message, "success" if not result["failed"] else "error")
+            if result["updated"]:
+                # Refresh the edit panel in case the selected card was replaced
+                if getattr(self, "selected_character_id", None):
+                    self.select_character_by_id(self.selected_character_id)
+
+        def on_error(job):
+            self.show_message(f"AICC update check failed: {job.error}", "error")
+
+        self.job_manager.submit("aicc_update_check", run, on_done=on_done, on_error=on_error)
+        self.show_message("Checking AICC cards for updates...", "success")
 
     def cleanup_temp_imported_file(self):
         """Cleanup the temporary imported file if it exists and close the modal."""
-        if hasattr(self, "temp_imported_file") and self.temp_imported_file:
+        # Stop any download or read still running for this dialog; its stages remove their own files
+        read_job = getattr(self, "add_character_read_job", None)
+        if read_job and not read_job.is_finished:
+            read_job.cancel()
+
+        # A save that is still running owns the imported file and is left to finish
+        save_job = getattr(self, "add_character_save_job", None)
+        saving = save_job and not save_job.is_finished
+        if not saving and getattr(self, "temp_imported_file", None):
             try:
                 temp_file = Path(self.temp_imported_file)
                 if temp_file.exists():
@@ -1567,58 +2004,117 @@ class CharacterCardManagerApp(ctk.CTk):
             # Update file path entry
             self.file_path_entry.delete(0, "end")
             self.file_path_entry.insert(0, file_path)
+            self.is_imported_flag = False
 
-            # Attempt to read metadata from the file
-            try:
-                if file_path.endswith(".png"):  # Only parse PNG files for metadata
-                    metadata = PNGMetadataReader.extract_text_metadata(file_path)
-                    highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
-                    card_name = highest_spec_metadata.get("name", None)  # Extract the 'name' field
-                    creator_notes = highest_spec_metadata.get("creator_notes", "").strip()
-                    description = highest_spec_metadata.get("description", "").strip()
-                else:
-                    card_name = None
-                    creator_notes = ""
-                    description = ""
-            except Exception as e:
-                print(f"Error reading metadata: {e}")
+            def parse(ctx, job):
+                ctx["card_name"], ctx["notes"] = self.card_file_fields(file_path)
+
+            window = self.add_character_window
+
+            def on_done(job):
+                if window.winfo_exists():
+                    self.fill_add_character_fields(file_path, job.result["card_name"], job.result["notes"])
+
+            pipeline = ImportPipeline(self.job_manager, "add_character_parse")
+            pipeline.add_stage("Reading card data...", parse)
+            self.add_character_read_job = self.run_add_character_pipeline(pipeline, on_done, "Error reading card")
+
+    def card_file_fields(self, file_path):
+        """Work out the default character name and notes from a local card file."""
+        # Attempt to read metadata from the file
+        try:
+            if file_path.endswith(".png"):  # Only parse PNG files for metadata
+                metadata = PNGMetadataReader.extract_text_metadata(file_path)
+                highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
+                card_name = highest_spec_metadata.get("name", None)  # Extract the 'name' field
+                creator_notes = highest_spec_metadata.get("creator_notes", "").strip()
+                description = highest_spec_metadata.get("description", "").strip()
+            else:
                 card_name = None
                 creator_notes = ""
                 description = ""
+        except Exception as e:
+            print(f"Error reading metadata: {e}")
+            card_name = None
+            creator_notes = ""
+            description = ""
+
+        # Default character name to the 'name' from metadata or formatted file name
+        if card_name:
+            default_name = card_name
+        else:
+            default_name = Path(file_path).stem
+            default_name = " ".join(word.capitalize() for word in default_name.replace("_", " ").replace("-", " ").split())
 
-            # Default character name to the 'name' from metadata or formatted file name
-            if card_name:
-                default_name = card_name
-            else:
-                default_name = Path(file_path).stem
-                default_name = " ".join(word.capitalize() for word in default_name.replace("_", " ").replace("-", " ").split())
+        # Skip unwanted creator_notes text
+        unwanted_notes = (
+            "This card was uploaded to https://aicharactercards.com, "
+            "please come back and rate the card if you enjoy it to help other users find the card."
+        )
+        if creator_notes == unwanted_notes:
+            creator_notes = ""  # Treat it as empty
+        elif unwanted_notes in creator_notes:
+            # Remove unwanted text if other content exists
+            creator_notes = creator_notes.replace(unwanted_notes, "").strip()
+
+        # Populate character notes
+        if creator_notes:
+            notes = creator_notes
+        elif description:
+            notes = self.truncate_to_100_words(description)
+        else:
+            notes = ""
 
-            self.add_character_name_entry.delete(0, "end")
-            self.add_character_name_entry.insert(0, default_name)
+        return default_name, notes
 
-            # Skip unwanted creator_notes text
-            unwanted_notes = (
-                "This card was uploaded to https://aicharactercards.com, "
-                "please come back and rate the card if you enjoy it to help other users find the card."
-            )
-            if creator_notes == unwanted_notes:
-                creator_notes = ""  # Treat it as empty
-            elif unwanted_notes in creator_notes:
-                # Remove unwanted text if other content exists
-                creator_notes = creator_notes.replace(unwanted_notes, "").strip()
-
-            # Populate character notes
-            if creator_notes:
-                notes = creator_notes
-            elif description:
-                notes = self.truncate_to_100_words(description)
+    def fill_add_character_fields(self, file_path, card_name, notes):
+        """Populate the Add Character form once a background read has finished."""
+        self.file_path_entry.delete(0, "end")
+        self.file_path_entry.insert(0, str(file_path))
+
+        self.add_character_name_entry.delete(0, "end")
+        self.add_character_name_entry.insert(0, card_name)
+
+        self.add_character_notes_textbox.delete("1.0", "end")
+        self.add_character_notes_textbox.insert("1.0", notes)
+
+    def run_add_character_pipeline(self, pipeline, on_done, error_prefix):
+        """
+        Run an Add Character pipeline with live stage progress and the form buttons disabled.
+        Returns the job. Its callbacks only touch the dialog that started it, if that is still open.
+        """
+        window = self.add_character_window
+        buttons = (self.add_character_browse_button, self.add_character_import_button, self.add_character_submit_button)
+
+        def set_busy(busy):
+            if not window.winfo_exists():
+                return
+            for button in buttons:
+                button.configure(state="disabled" if busy else "normal")
+            if busy:
+                self.add_character_stage_label.configure(text="Starting...")
+                self.add_character_progress_bar.set(0)
+                self.add_character_progress_frame.pack(fill="x", padx=10, pady=(0, 5))
             else:
-                notes = ""
+                self.add_character_progress_frame.pack_forget()
 
-            self.add_character_notes_textbox.delete("1.0", "end")
-            self.add_character_notes_textbox.insert("1.0", notes)
+        def on_progress(progress):
+            if window.winfo_exists():
+                self.add_character_stage_label.configure(text=progress["message"] or "")
+                if progress["total"]:
+                    self.add_character_progress_bar.set(progress["done"] / progress["total"])
 
+        def finished(job):
+            set_busy(False)
+            on_done(job)
 
+        def on_error(job):
+            set_busy(False)
+            if window.winfo_exists():
+                self.show_add_character_message(f"{error_prefix}: {job.error}", "error")
+
+        set_busy(True)
+        return pipeline.start(on_progress=on_progress, on_done=finished, on_error=on_error, on_cancel=lambda job: set_busy(False))
 
 
 ######################################################################################################
@@ -1626,12 +2122,21 @@ class CharacterCardManagerApp(ctk.CTk):
 ######################################################################################################
 
     def sync_cards_from_sillytavern(self):
-        """Sync cards from SillyTavern."""
+        """Sync cards from SillyTavern as a cancellable, resumable background job."""
+        if self.job_manager.is_running("card_sync"):
+            self.show_message("A sync is already running. Open Background Jobs to see its progress.", "error")
+            return
+
+        characters_path = Path(self.settings["sillytavern_path"]).resolve() / "characters"
+        if not characters_path.exists():
+            self.show_message("SillyTavern path not configured or does not exist. Set it in Settings.", "error")
+            return
+
         try:
             # Create a modal for progress feedback
             self.sync_modal = ctk.CTkToplevel(self)
             self.sync_modal.title("Syncing Cards")
-            self.sync_modal.geometry("300x200")
+            self.sync_modal.geometry("300x220")
             self.sync_modal.transient(self)
             self.sync_modal.grab_set()
 
@@ -1649,178 +2154,220 @@ class CharacterCardManagerApp(ctk.CTk):
             batch_progress_label = ctk.CTkLabel(self.sync_modal, text="Processed: 0/0")
             batch_progress_label.pack(pady=(5, 10), padx=10)
 
-            # Function to perform sync in the background
-            def perform_sync():
-                try:
-                    # Normalize paths
-                    def sanitize_path(path: str):
-                        return Path(path).resolve()
-
-                    characters_path = sanitize_path(self.settings["sillytavern_path"]) / "characters"
-                    app_characters_path = Path("CharacterCards").resolve()
-
-                    if not characters_path.exists():
-                        self.show_message("SillyTavern path not configured or does not exist. Set it in Settings.", "error")
-                        return
+            # Closing the modal or pressing Cancel stops the worker at its next checkpoint
+            cancel_button = ctk.CTkButton(
+                self.sync_modal, text="Cancel", command=lambda: self.job_manager.cancel("card_sync")
+            )
+            cancel_button.pack(pady=(0, 10))
+            self.sync_modal.protocol("WM_DELETE_WINDOW", lambda: self.job_manager.cancel("card_sync"))
 
-                    app_characters_path.mkdir(parents=True, exist_ok=True)
-
-                    new_characters_added = False
-
-                    png_files = list(characters_path.glob("*.png"))
-                    total_files = len(png_files)
-
-                    for idx, png_file in enumerate(png_files, start=1):
-                        character_name = png_file.stem
-                        character_folder = app_characters_path / character_name
-
-                        # Ensure character folder exists
-                        character_folder.mkdir(parents=True, exist_ok=True)
-
-                        # Skip cards that already exist in the database
-                        with sqlite3.connect(self.db_manager.db_path) as connection:
-                            cursor = connection.cursor()
-                            cursor.execute("SELECT id FROM characters WHERE main_file = ?", (str(png_file),))
-                            if cursor.fetchone():
-                                continue
-
-                        # Extract metadata
-                        try:
-                            metadata = PNGMetadataReader.extract_text_metadata(str(png_file))
-                            highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
-                            new_name = highest_spec_metadata.get("name", character_name)
-                            new_notes = highest_spec_metadata.get("creator_notes", "").strip()
-                            description = highest_spec_metadata.get("description", "").strip()
-
-                            # Process notes
-                            unwanted_notes = (
-                                "This card was uploaded to https://aicharactercards.com, "
-                                "please come back and rate the card if you enjoy it to help other users find the card."
-                            )
-                            if new_notes == unwanted_notes:
-                                new_notes = ""
-                            elif unwanted_notes in new_notes:
-                                new_notes = new_notes.replace(unwanted_notes, "").strip()
-
-                            if not new_notes and description:
-                                new_notes = self.truncate_to_100_words(description)
-
-                        except Exception as e:
-                            print(f"Error reading metadata for {png_file}: {e}")
-                            new_name = character_name
-                            new_notes = ""
-
-                        # Get file creation and modification dates
-                        file_stat = os.stat(png_file)
-                        created_date = datetime.fromtimestamp(file_stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-                        last_modified_date = datetime.fromtimestamp(file_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-
-                        # Add new character to database
-                        with sqlite3.connect(self.db_manager.db_path) as connection:
-                            cursor = connection.cursor()
-                            cursor.execute(
-                                """
-                                INSERT INTO characters (name, main_file, notes, created_date, last_modified_date) 
-                                VALUES (?, ?, ?, ?, ?)
-                                """,
-                                (new_name, str(png_file), new_notes, created_date, last_modified_date),
-                            )
-                            connection.commit()
-                            new_characters_added = True
-
-                        # Update progress bar safely
-                        try:
-                            if progress_bar.winfo_exists():
-                                progress_var.set(idx / total_files)
-                                progress_bar.update_idletasks()
-                        except Exception as e:
-                            print(f"Error updating progress bar: {e}")
-
-                        # Update batch progress label safely
-                        try:
-                            if batch_progress_label.winfo_exists():
-                                if idx % 10 == 0 or idx == total_files:
-                                    batch_progress_label.configure(text=f"Processed: {idx}/{total_files}")
-                                    batch_progress_label.update_idletasks()
-                        except Exception as e:
-                            print(f"Error updating batch progress label: {e}")
-
-            # Sync lorebooks
-                    print("Starting lorebook synchronization...")
-                    try:
-                        lorebook_manager = LorebookManager(self.settings["sillytavern_path"], self.db_manager.db_path)
-                        lorebook_manager.sync_lorebooks()
-                        print("Lorebook synchronization completed.")
-                    except Exception as e:
-                        print(f"Error during lorebook sync: {e}")
-                        self.show_message("Failed to sync lorebooks. Check logs for details.", "error")
-
-                    # Refresh tags after sync
-                    self.refresh_tags_after_sync()
-                    self.show_message("Sync completed successfully!", "success")
+            def close_sync_modal():
+                if self.sync_modal and self.sync_modal.winfo_exists():
+                    self.sync_modal.destroy()
 
-                except Exception as e:
-                    print(f"Error during sync: {e}")
-                    self.show_message(f"Failed to sync cards: {e}", "error")
-                finally:
-                    # Ensure modal still exists before destroying it
-                    if self.sync_modal and self.sync_modal.winfo_exists():
-                        self.sync_modal.destroy()
+            def on_progress(progress):
+                if not progress_bar.winfo_exists():
+                    return
+                if progress["total"]:
+                    progress_var.set(progress["done"] / progress["total"])
+                batch_progress_label.configure(
+                    text=f"Processed: {progress['done']}/{progress['total']} "
+                         f"({progress['rate']:.0f}/s, ETA {format_duration(progress['eta'])})"
+                )
 
-            # Run the sync in a background thread to keep the UI responsive
-            threading.Thread(target=perform_sync, daemon=True).start()
+            def on_done(job):
+                close_sync_modal()
+                print(f"Card sync finished: {job.result} new cards in {format_duration(job.elapsed)}.")
+                self.refresh_tags_after_sync()
+                self.show_message("Sync completed successfully!", "success")
+
+            def on_error(job):
+                close_sync_modal()
+                self.show_message(f"Failed to sync cards: {job.error}", "error")
+
+            def on_cancel(job):
+                close_sync_modal()
+                self.show_message("Sync canceled. The next sync will resume where this one stopped.", "error")
+
+            # Lorebooks sync independently alongside the cards
+            self.sync_lorebooks_in_background()
+
+            self.job_manager.submit(
+                "card_sync",
+                lambda job: self._sync_cards_job(job, characters_path),
+                on_progress=on_progress,
+                on_done=on_done,
+                on_error=on_error,
+                on_cancel=on_cancel,
+            )
 
         except Exception as e:
             print(f"Error initializing sync: {e}")
             self.show_message(f"Failed to start sync: {e}", "error")
 
+    def _sync_cards_job(self, job, characters_path, batch_size=100):
+        """Worker for the card sync job. Commits in batches and checkpoints after each commit."""
+        app_characters_path = Path("CharacterCards").resolve()
+        app_characters_path.mkdir(parents=True, exist_ok=True)
+
+        # Sorted so a checkpoint (last committed file name) identifies a resume position
+        png_files = sorted(characters_path.glob("*.png"), key=lambda p: p.name)
+        total_files = len(png_files)
+
+        # Load known files once instead of querying per card
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            existing_files = {row[0] for row in connection.execute("SELECT main_file FROM characters")}
+
+        work_files = png_files
+        resume_after = ""
+        checkpoint = job.load_checkpoint()
+        if checkpoint and checkpoint.get("last_file"):
+            resume_after = checkpoint["last_file"]
+            start_index = bisect.bisect_right([p.name for p in png_files], checkpoint["last_file"])
+            # Everything committed before the checkpoint is in the database; files ahead of the resume
+            # position that are not were added to SillyTavern since, so they are synced too.
+            missed_files = [p for p in png_files[:start_index] if str(p) not in existing_files]
+            work_files = missed_files + png_files[start_index:]
+            print(
+                f"Resuming card sync after {checkpoint['last_file']} ({start_index}/{total_files}, "
+                f"{len(missed_files)} new earlier files)."
+            )
+        skipped = total_files - len(work_files)
+        job.mark_resumed_from(skipped)
+        job.report(total=total_files, message="Scanning cards...")
+
+        unwanted_notes = (
+            "This card was uploaded to https://aicharactercards.com, "
+            "please come back and rate the card if you enjoy it to help other users find the card."
+        )
+
+        pending_rows = []
+        processed_since_commit = 0
+        added = 0
+
+        def commit_batch(last_file):
+            nonlocal pending_rows, processed_since_commit, added, resume_after
+            if pending_rows:
+                with sqlite3.connect(self.db_manager.db_path) as connection:
+                    connection.executemany(
+                        """
+                        INSERT INTO characters (name, main_file, notes, created_date, last_modified_date)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        pending_rows,
+                    )
+                added += len(pending_rows)
+                pending_rows = []
+            processed_since_commit = 0
+            # Never move the resume position back while catching up on files added before it
+            resume_after = max(resume_after, last_file)
+            job.save_checkpoint({"last_file": resume_after, "added": added})
+
+        for idx, png_file in enumerate(work_files, start=skipped):
+            job.check()
+            character_name = png_file.stem
+
+            # Ensure character folder exists
+            (app_characters_path / character_name).mkdir(parents=True, exist_ok=True)
+
+            if str(png_file) not in existing_files:
+                # Extract metadata
+                try:
+                    metadata = PNGMetadataReader.extract_text_metadata(str(png_file))
+                    highest_spec_metadata = PNGMetadataReader.get_highest_spec_fields(metadata)
+                    new_name = highest_spec_metadata.get("name", character_name)
+                    new_notes = highest_spec_metadata.get("creator_notes", "").strip()
+                    description = highest_spec_metadata.get("description", "").strip()
+
+                    # Process notes
+                    if new_notes == unwanted_notes:
+                        new_notes = ""
+                    elif unwanted_notes in new_notes:
+                        new_notes = new_notes.replace(unwanted_notes, "").strip()
+
+                    if not new_notes and description:
+                        new_notes = self.truncate_to_100_words(description)
+
+                except Exception as e:
+                    print(f"Error reading metadata for {png_file}: {e}")
+                    new_name = character_name
+                    new_notes = ""
+
+                # Get file creation and modification dates
+                file_stat = os.stat(png_file)
+                created_date = datetime.fromtimestamp(file_stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
+                last_modified_date = datetime.fromtimestamp(file_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+
+                pending_rows.append((new_name, str(png_file), new_notes, created_date, last_modified_date))
+                existing_files.add(str(png_file))
+
+            processed_since_commit += 1
+            if processed_since_commit >= batch_size:
+                commit_batch(png_file.name)
+
+            job.report(done=idx + 1, message=png_file.name)
+
+        if work_files:
+            commit_batch(work_files[-1].name)
+        job.clear_checkpoint()
+        job.report(done=total_files, message="Done")
+        return added
+
+    def sync_lorebooks_in_background(self):
+        """Sync lorebooks from SillyTavern as a background job."""
+        def run(job):
+            job.report(message="Syncing lorebooks...")
+            lorebook_manager = LorebookManager(self.settings["sillytavern_path"], self.db_manager.db_path)
+            return lorebook_manager.sync_lorebooks(job)
+
+        def on_done(job):
+            summary = job.result
+            if summary["added"] or summary["changed"] or summary["removed"]:
+                self.show_message(
+                    f"Lorebooks: {summary['added']} added, {summary['changed']} changed, {summary['removed']} removed.",
+                    "success",
+                )
+            else:
+                print("Lorebook synchronization completed. No changes.")
+
+        self.job_manager.submit(
+            "lorebook_sync",
+            run,
+            on_done=on_done,
+            on_error=lambda job: self.show_message("Failed to sync lorebooks. Check logs for details.", "error"),
+        )
 
     def refresh_tags_after_sync(self):
         """Refresh tags specifically after syncing new characters from SillyTavern."""
-        try:
+        def load(job):
             print("Starting refresh of tags after sync...")
 
             # Reload the tag manager to ensure we have the latest tag data
             self.tag_manager.reload_tags()
-            print("After reload tags...")
-
-            # Refresh the character list from the database
-            self.all_characters = self.get_character_list()
-            self.filtered_characters = self.all_characters.copy()  # Reset filtered characters
-
-            # Update tag associations for all characters
-            for character in self.all_characters:
-                main_file_path = character.get("main_file", "")
-                if not main_file_path:
-                    print(f"Character {character['name']} does not have a main_file entry. Skipping.")
-                    continue
-
-                character_name_png = Path(main_file_path).name  # Extract the filename from the path
-                normalized_name = self.tag_manager.normalize_filename(character_name_png)
-
-                # Debugging output
-                if normalized_name not in self.tag_manager.tag_map:
-                    print(f"Character {character_name_png} not found in tag_map after normalization.")
-                    continue
-
-                associated_tags = [
-                    tag["name"]
-                    for tag_id in self.tag_manager.tag_map.get(normalized_name, [])
-                    for tag in self.tag_manager.tags if tag["id"] == tag_id
-                ]
-                character["tags"] = associated_tags  # Update character tags in memory
-                # print(f"Character: {character['name']}, Tags: {associated_tags}")  # Debug
-
-            # Refresh the UI to reflect tag updates
-            self.display_characters()  # Update the character display
-            self.update_navigation_buttons()  # Update navigation buttons if needed
-            self.update_idletasks()  # Force UI update
+            job.check()
+
+            # Refresh the character list from the database (tag filters read the reloaded tag map directly);
+            # the sync may have taken the library over or under the query-mode threshold
+            if count_characters(self.db_manager.db_path) > LIST_QUERY_THRESHOLD:
+                return None  # Query mode reads the database on every page
+            characters = self.get_character_list()
+            job.report(done=len(characters), total=len(characters))
+            return characters
+
+        def apply(job):
+            # Swap in the refreshed list and redraw on the main thread, keeping the sort, search and tag filter
+            self.query_mode = job.result is None
+            self.set_character_list(job.result or [])
+            self.filter_character_list()
             print("Tags successfully reloaded and UI refreshed.")
             self.show_message("Tags refreshed successfully after sync.", "success")
 
-        except Exception as e:
-            self.show_message(f"Error refreshing tags after sync: {str(e)}", "error")
-            print(f"Error refreshing tags after sync: {str(e)}", "error")
+        def failed(job):
+            self.show_message(f"Error refreshing tags after sync: {job.error}", "error")
+            print(f"Error refreshing tags after sync: {job.error}")
+
+        self.job_manager.submit("tag_refresh", load, on_done=apply, on_error=failed)
+
 
 ######################################################################################################
 ################################### Related Character Linking ########################################
@@ -1852,11 +2399,14 @@ class CharacterCardManagerApp(ctk.CTk):
             char_frame = ctk.CTkFrame(self.related_characters_frame, corner_radius=5)
             char_frame.pack(pady=5, padx=5, fill="x")
 
-            # Thumbnail
-            thumbnail = self.create_thumbnail_small(char["image_path"])
-            thumbnail_label = ctk.CTkLabel(char_frame, image=thumbnail, text="")
-            thumbnail_label.image = thumbnail  # Prevent garbage collection
+            # Thumbnail (placeholder until the real one loads in the background)
+            thumbnail_label = ctk.CTkLabel(char_frame, image=self.placeholder_thumbnail((25, 37.5)), text="")
             thumbnail_label.grid(row=0, column=0, padx=5)
+            self.create_thumbnail_small(
+                char["image_path"],
+                callback=self.update_thumbnail_label,
+                widget_ref=weakref.ref(thumbnail_label),
+            )
 
             # Character Name
             name_label = ctk.CTkLabel(char_frame, text=char["name"], anchor="w", font=ctk.CTkFont(size=12, weight="bold"))
@@ -1946,7 +2496,7 @@ class CharacterCardManagerApp(ctk.CTk):
 
         # Cached Character List and Pagination
         all_characters = self.get_character_list()
-        filtered_characters = [char for char in all_characters if char["id"] != self.selected_character_id]
+        filtered_characters = [char for char in all_characters if char.id != self.selected_character_id]
         items_per_page = 20
         current_page = [0]  # Use a mutable object to allow nested functions to update the value
 
@@ -1971,21 +2521,24 @@ class CharacterCardManagerApp(ctk.CTk):
                 char_frame.grid_columnconfigure(2, weight=0)  # Link button column
                 char_frame.pack(pady=5, padx=5, fill="x")
 
-                # Thumbnail
-                thumbnail = self.create_thumbnail(char["image_path"])
-                thumbnail_label = ctk.CTkLabel(char_frame, image=thumbnail, text="")
-                thumbnail_label.image = thumbnail  # Prevent garbage collection
+                # Thumbnail (placeholder until the real one loads in the background)
+                thumbnail_label = ctk.CTkLabel(char_frame, image=self.placeholder_thumbnail((50, 75)), text="")
                 thumbnail_label.grid(row=0, column=0, padx=5, sticky="w")
+                self.create_thumbnail(
+                    char.main_file,
+                    callback=self.update_thumbnail_label,
+                    widget_ref=weakref.ref(thumbnail_label),
+                )
 
                 # Character Name
-                name_label = ctk.CTkLabel(char_frame, text=char["name"], anchor="w", font=ctk.CTkFont(size=12, weight="bold"))
+                name_label = ctk.CTkLabel(char_frame, text=char.name, anchor="w", font=ctk.CTkFont(size=12, weight="bold"))
                 name_label.grid(row=0, column=1, padx=5, sticky="w")
 
                 # Link Button
                 link_button = ctk.CTkButton(
                     char_frame,
                     text="Link",
-                    command=lambda char_id=char["id"]: self.link_character(char_id, self.link_character_window),
+                    command=lambda char_id=char.id: self.link_character(char_id, self.link_character_window),
                 )
                 link_button.grid(row=0, column=2, padx=5, sticky="e")
 
@@ -2004,10 +2557,10 @@ class CharacterCardManagerApp(ctk.CTk):
 
         def filter_characters(*args):
             """Filter characters based on the search query."""
-            query = search_var.get().lower().strip()
+            query = search_var.get().casefold().strip()
             nonlocal filtered_characters
             filtered_characters = [
-                char for char in all_characters if char["id"] != self.selected_character_id and query in char["name"].lower()
+                char for char in all_characters if char.id != self.selected_character_id and query in char.name_key
             ]
             current_page[0] = 0  # Reset to the first page
             update_modal_display()
@@ -2028,33 +2581,11 @@ class CharacterCardManagerApp(ctk.CTk):
             return
 
         try:
-            connection = sqlite3.connect(self.db_manager.db_path)
-            cursor = connection.cursor()
-
-            # Ensure the characters aren't already linked
-            cursor.execute("""
-                SELECT COUNT(*) FROM character_relationships 
-                WHERE (character_id = ? AND related_character_id = ?)
-                OR (character_id = ? AND related_character_id = ?)
-            """, (self.selected_character_id, related_character_id,
-                related_character_id, self.selected_character_id))
-            if cursor.fetchone()[0] > 0:
+            # The graph index answers the duplicate check without scanning the table
+            if not self.relationship_graph.link(self.selected_character_id, related_character_id):
                 self.show_message("These characters are already linked.", "error")
-                connection.close()
                 return
 
-            # Insert bi-directional relationships
-            cursor.execute("""
-                INSERT INTO character_relationships (character_id, related_character_id)
-                VALUES (?, ?)
-            """, (self.selected_character_id, related_character_id))
-            cursor.execute("""
-                INSERT INTO character_relationships (character_id, related_character_id)
-                VALUES (?, ?)
-            """, (related_character_id, self.selected_character_id))
-            connection.commit()
-            connection.close()
-
             # Refresh related characters
             self.load_related_characters()
             modal.destroy()
@@ -2066,18 +2597,8 @@ class CharacterCardManagerApp(ctk.CTk):
     def unlink_character(self, related_character_id):
         """Unlink a related character."""
         try:
-            connection = sqlite3.connect(self.db_manager.db_path)
-            cursor = connection.cursor()
-
             # Delete relationships in both directions
-            cursor.execute("""
-                DELETE FROM character_relationships 
-                WHERE (character_id = ? AND related_character_id = ?)
-                OR (character_id = ? AND related_character_id = ?)
-            """, (self.selected_character_id, related_character_id,
-                related_character_id, self.selected_character_id))
-            connection.commit()
-            connection.close()
+            self.relationship_graph.unlink(self.selected_character_id, related_character_id)
 
             # Refresh related characters
             self.load_related_characters()
@@ -2103,7 +2624,7 @@ class CharacterCardManagerApp(ctk.CTk):
 
     def load_tags_for_character(self, character_name):
         """Load tags for the selected character and apply default sorting."""
-        self.tag_manager.reload_tags()
+        self.tag_manager.reload_tags_if_changed()
 
         if not character_name:
             self.clear_tags()
@@ -2195,7 +2716,7 @@ class CharacterCardManagerApp(ctk.CTk):
         header_frame.pack(fill="x", padx=10, pady=5)
 
         # No Tags Assigned Checkbox
-        no_tags_var = ctk.BooleanVar(value=False)
+        no_tags_var = ctk.BooleanVar(value=self.character_untagged_filter)
         no_tags_checkbox = ctk.CTkCheckBox(
             header_frame, text="No Tags Assigned", variable=no_tags_var
         )
@@ -2238,13 +2759,8 @@ class CharacterCardManagerApp(ctk.CTk):
     def get_associated_tags(self):
         """Get tags with their associated character counts, sorted A-Z by default."""
         self.tag_manager.reload_tags()
-        tags_with_counts = [
-            (tag["name"], sum(tag["id"] in ids for ids in self.tag_manager.tag_map.values()))
-            for tag in self.tag_manager.tags
-        ]
-        # Sort alphabetically by tag name
-        tags_with_counts.sort(key=lambda x: x[0].lower())
-        return tags_with_counts
+        # Counted in SQL on the tag mirror, sorted alphabetically by tag name
+        return self.tag_mirror.tag_counts()
 
 
     def apply_tag_filter(self, selected_tags, no_tags_only):
@@ -2255,16 +2771,8 @@ class CharacterCardManagerApp(ctk.CTk):
 
     def search_tags(self, query):
         """Search globally available tags."""
-        connection = sqlite3.connect(self.db_manager.db_path)
-        cursor = connection.cursor()
-
-        cursor.execute("""
-            SELECT name FROM tags WHERE name LIKE ?
-        """, (f"%{query}%"))
-        tags = [row[0] for row in cursor.fetchall()]
-
-        connection.close()
-        return tags
+        self.tag_manager.reload_tags_if_changed()  # Keeps the tag mirror current
+        return self.tag_mirror.search(query)
     
     def update_sorted_tags(self):
         """Update the sorting of assigned and potential tags based on the dropdown selection."""
@@ -2593,7 +3101,6 @@ class CharacterCardManagerApp(ctk.CTk):
             handle_lorebook_save_func=handle_lorebook_save,  # Function to save lorebook changes
             add_image_modal_func=add_image_modal,  # Function to add an image modal
             open_link_character_modal_func=open_link_character_modal_for_lorebook,  # Link character modal function
-            get_character_list_func=self.get_character_list,  # Function to retrieve a list of characters
             get_linked_characters_func=get_linked_characters,  # Function to retrieve linked characters
             handle_unlink_character_func=self.handle_unlink_character,  # Function to unlink characters
             align_modal_top_left_func=self._align_modal_top_left,  # Utility to align modal top-left
@@ -2621,7 +3128,7 @@ class CharacterCardManagerApp(ctk.CTk):
 
     ########## Lorebook Extra Images ####################
     def display_images(self, frame, images, lorebook):
-        display_images(frame=frame, images=images, lorebook=lorebook, create_thumbnail_func=self.create_thumbnail, edit_image_func=self.edit_image, delete_image_func=self.delete_image,)
+        display_images(frame=frame, images=images, lorebook=lorebook, create_thumbnail_func=self.create_thumbnail, edit_image_func=self.edit_image, delete_image_func=self.delete_image, placeholder_thumbnail_func=self.placeholder_thumbnail,)
 
     def add_image_modal(self, lorebook_id, images_frame):
         add_image_modal(parent=self, lorebook_id=lorebook_id, images_frame=images_frame, browse_image_file_func=self.browse_image_file, save_image_func=self.lorebook_manager.save_image, refresh_images_func=self.refresh_images, show_message_func=self.show_message,)
@@ -2708,9 +3215,10 @@ class CharacterCardManagerApp(ctk.CTk):
         # Check if the file was imported (use flag) or browsed via file dialog
         is_imported = getattr(self, "is_imported_flag", False)
         final_file_path = sillytavern_path / file_path.name
+        copy_file = False
 
         if not is_imported:
-            # Handle conflict only for browsed files
+            # Handle conflict only for browsed files (the prompt stays on the UI thread)
             if final_file_path.exists():
                 response = askyesno(
                     "File Conflict",
@@ -2724,50 +3232,63 @@ class CharacterCardManagerApp(ctk.CTk):
                     while final_file_path.exists():
                         final_file_path = sillytavern_path / f"{base_name}_{counter}{extension}"
                         counter += 1
-                    # Move the file to the new path
-                    shutil.copy(str(file_path), str(final_file_path))
+                    copy_file = True
                 else:
                     self.show_add_character_message("File import canceled due to name conflict.", "error")
                     return
-            else:
-                # Move the file if no conflict exists
-                shutil.move(str(file_path), str(final_file_path))
 
-        try:
+        def copy(ctx, job):
+            if is_imported:
+                return  # Already downloaded into the SillyTavern folder
+            if not copy_file:
+                # Move the file if no conflict exists (a rename unless it is on another drive)
+                try:
+                    os.rename(file_path, final_file_path)
+                    ctx["moved"] = True
+                    return
+                except OSError:
+                    pass
+            # Copy in chunks so a cancel stops mid-file; the source of a cross-drive move goes once copied
+            FileHandler.copy_file(file_path, final_file_path, job)
+            ctx["copied"] = True
+            if not copy_file:
+                file_path.unlink()
+                ctx["moved"] = True
+
+        def undo_copy(ctx):
+            if ctx.get("moved"):
+                shutil.move(str(final_file_path), str(file_path))
+            elif ctx.get("copied"):
+                final_file_path.unlink(missing_ok=True)
+
+        def insert(ctx, job):
             # Generate timestamps
             created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            last_modified_date = created_date
+            ctx["created_date"] = created_date
 
             # Add character data to the database
-            connection = sqlite3.connect(self.db_manager.db_path)
-            cursor = connection.cursor()
-            cursor.execute(
-                """INSERT INTO characters 
-                (name, main_file, notes, misc_notes, created_date, last_modified_date) 
-                VALUES (?, ?, ?, ?, ?, ?)""",
-                (character_name, str(final_file_path), character_notes, misc_notes, created_date, last_modified_date),
-            )
-            connection.commit()
-
-            # Get the newly created character ID
-            new_character_id = cursor.lastrowid
-            connection.close()
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                cursor = connection.cursor()
+                cursor.execute(
+                    """INSERT INTO characters 
+                    (name, main_file, notes, misc_notes, created_date, last_modified_date) 
+                    VALUES (?, ?, ?, ?, ?, ?)""",
+                    (character_name, str(final_file_path), character_notes, misc_notes, created_date, created_date),
+                )
+                # Get the newly created character ID
+                ctx["character_id"] = cursor.lastrowid
 
-            # Add the character to the in-memory list
-            new_character = {
-                "id": new_character_id,
-                "name": character_name,
-                "image_path": str(final_file_path),  # Use the file directly in SillyTavern
-                "created_date": created_date,
-                "last_modified_date": last_modified_date,
-            }
-            self.all_characters.append(new_character)
+        def undo_insert(ctx):
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                connection.execute("DELETE FROM characters WHERE id = ?", (ctx["character_id"],))
 
+        def tag(ctx, job):
             # Process tags if any exist in the metadata
             try:
                 if hasattr(self, "latest_metadata"):  # Ensure metadata is loaded
                     tags = self.latest_metadata.get("tags", [])
-                    tag_manager = SillyTavernTagManager(self.settings["sillytavern_path"])
+                    # A separate manager, as this runs off the main thread; it keeps the tag mirror in sync
+                    tag_manager = SillyTavernTagManager(self.settings["sillytavern_path"], self.tag_mirror)
 
                     for tag in tags:
                         # Assign tags to the character in the settings.json
@@ -2777,19 +3298,45 @@ class CharacterCardManagerApp(ctk.CTk):
             except Exception as e:
                 print(f"Error processing tags: {e}")
 
-            # Refresh filtered characters and display
-            self.filter_character_list()
-            self.sort_character_list(self.sort_var.get())
+        def on_done(job):
+            ctx = job.result
+            self.temp_imported_file = None  # Saved: the file now belongs to the character
+
+            # Pick up tags written by the tag stage
+            if self._tag_manager is not None:
+                self._tag_manager.reload_tags_if_changed()
+
+            # Add the character to the in-memory list
+            new_character = Character(
+                ctx["character_id"],
+                character_name,
+                str(final_file_path),  # Use the file directly in SillyTavern
+                ctx["created_date"],
+                ctx["created_date"],
+            )
+            if not self.query_mode:
+                self.all_characters.append(new_character)
+                self.sort_index.add(new_character)
+
+            # Refresh filtered characters and display (filtering keeps the sort order); crossing the
+            # threshold reloads the list in the other mode instead
+            if not self.check_list_mode():
+                self.filter_character_list()
 
             # Highlight the new character
-            self.select_character_by_id(new_character_id)
+            self.select_character_by_id(ctx["character_id"])
 
             # Show success message and close the modal
-            self.show_add_character_message("Character added successfully!", "success")
-            self.add_character_window.after(500, self.add_character_window.destroy())
+            if window.winfo_exists():
+                self.show_add_character_message("Character added successfully!", "success")
+                window.after(500, window.destroy)
 
-        except Exception as e:
-            self.show_add_character_message(f"Error saving character: {str(e)}", "error")
+        window = self.add_character_window
+        pipeline = ImportPipeline(self.job_manager, "add_character_save")
+        pipeline.add_stage("Copying card file...", copy, undo=undo_copy)
+        pipeline.add_stage("Saving to database...", insert, undo=undo_insert)
+        pipeline.add_stage("Applying tags...", tag)
+        self.add_character_save_job = self.run_add_character_pipeline(pipeline, on_done, "Error saving character")
 
 
     def highlight_selected_character(self, selected_id):
@@ -2909,34 +3456,50 @@ class CharacterCardManagerApp(ctk.CTk):
 
     def create_thumbnail(self, image_path, callback=None, widget_ref=None):
         """Create a thumbnail for the character list using CTkImage with thread-safe UI updates."""
+        return self._request_thumbnail(image_path, (50, 75), callback, widget_ref)
+
+    def _request_thumbnail(self, image_path, size, callback=None, widget_ref=None):
+        """
+        Return a cached or freshly built thumbnail of the given display size. With a callback the
+        image is built on a worker thread and delivered through the thumbnail queue instead.
+        """
+        try:
+            cache_key = (str(image_path), os.stat(image_path).st_mtime_ns, size)
+        except (OSError, TypeError):
+            cache_key = None
+
+        # Serve recently built thumbnails from the cache
+        if cache_key:
+            with self.thumbnail_cache_lock:
+                cached = self.thumbnail_cache.get(cache_key)
+                if cached:
+                    self.thumbnail_cache.move_to_end(cache_key)
+            if cached:
+                if callback:
+                    self.thumbnail_queue.put((callback, cached, widget_ref))
+                    return
+                return cached
+
         def load_thumbnail():
             try:
                 img = Image.open(image_path)
-
-                # Calculate the target aspect ratio
-                target_aspect_ratio = 50 / 75
-                img_width, img_height = img.size
-                img_aspect_ratio = img_width / img_height
-
-                # Crop the image to the target aspect ratio
-                if img_aspect_ratio > target_aspect_ratio:
-                    # Image is wider than target aspect ratio
-                    new_width = int(img_height * target_aspect_ratio)
-                    offset = (img_width - new_width) // 2
-                    img = img.crop((offset, 0, offset + new_width, img_height))
-                elif img_aspect_ratio < target_aspect_ratio:
-                    # Image is taller than target aspect ratio
-                    new_height = int(img_width / target_aspect_ratio)
-                    offset = (img_height - new_height) // 2
-                    img = img.crop((0, offset, img_width, offset + new_height))
-
-                # Resize to the target dimensions
-                img = img.resize((50, 75), Image.Resampling.LANCZOS)
-                thumbnail = ctk.CTkImage(img, size=(50, 75))
+                if cache_key:
+                    # The image is decoded anyway, so record its perceptual hash for duplicate detection
+                    self.duplicate_index.note_image(image_path, cache_key[1], img)
+
+                # Crop and resize to 50x75 pixels; smaller display sizes are scaled down by CTkImage
+                img = crop_thumbnail(img, (50, 75))
+                thumbnail = ctk.CTkImage(img, size=size)
+
+                if cache_key:
+                    with self.thumbnail_cache_lock:
+                        self.thumbnail_cache[cache_key] = thumbnail
+                        while len(self.thumbnail_cache) > self.thumbnail_cache_size:
+                            self.thumbnail_cache.popitem(last=False)
             except Exception:
                 # Fallback to default image if loading fails
                 default_img = Image.open("assets/default_thumbnail.png")
-                thumbnail = ctk.CTkImage(default_img, size=(50, 75))
+                thumbnail = ctk.CTkImage(default_img, size=size)
 
             # If a callback is provided, pass the thumbnail to it
             if callback:
@@ -2973,46 +3536,21 @@ class CharacterCardManagerApp(ctk.CTk):
         self.after(100, self.process_thumbnail_queue)
 
 
+    def placeholder_thumbnail(self, size):
+        """Return the shared default thumbnail shown while real thumbnails load."""
+        if size not in self.placeholder_thumbnails:
+            self.placeholder_thumbnails[size] = ctk.CTkImage(Image.open("assets/default_thumbnail.png"), size=size)
+        return self.placeholder_thumbnails[size]
+
     def update_thumbnail_label(self, widget, thumbnail):
         """Safely update the thumbnail label with a new image."""
         if widget and widget.winfo_exists():
             widget.configure(image=thumbnail)
 
         
-    def create_thumbnail_small(self, image_path):
-        """Create a thumbnail for the character list using CTkImage."""
-        try:
-            # Open the image
-            img = Image.open(image_path)
-
-            # Calculate the target aspect ratio
-            target_aspect_ratio = 25 / 37.5
-
-            # Get the image's current dimensions
-            img_width, img_height = img.size
-            img_aspect_ratio = img_width / img_height
-
-            # Crop the image to the target aspect ratio
-            if img_aspect_ratio > target_aspect_ratio:
-                # Image is wider than target aspect ratio
-                new_width = int(img_height * target_aspect_ratio)
-                offset = (img_width - new_width) // 2
-                img = img.crop((offset, 0, offset + new_width, img_height))
-            elif img_aspect_ratio < target_aspect_ratio:
-                # Image is taller than target aspect ratio
-                new_height = int(img_width / target_aspect_ratio)
-                offset = (img_height - new_height) // 2
-                img = img.crop((0, offset, img_width, offset + new_height))
-
-            # Resize to the target dimensions
-            img = img.resize((25, 37.5), Image.Resampling.LANCZOS)
-
-            # Return the resized image wrapped in a CTkImage
-            return ctk.CTkImage(img, size=(25, 37.5))
-        except Exception:
-            # Use default thumbnail if image cannot be loaded
-            default_img = Image.open("assets/default_thumbnail.png")
-            return ctk.CTkImage(default_img, size=(25, 37.5))
+    def create_thumbnail_small(self, image_path, callback=None, widget_ref=None):
+        """Create a small thumbnail for the related characters list using CTkImage."""
+        return self._request_thumbnail(image_path, (25, 37.5), callback, widget_ref)
 
     def bind_mouse_wheel(self, frame, parent_frame=None):
         """Bind the mouse wheel event to a CTkScrollableFrame and prioritize it when hovered."""
@@ -3171,5 +3709,5 @@ class MultiSelectModal(ctk.CTkToplevel):
 
 
 if __name__ == "__main__":
-    app = CharacterCardManagerApp()
+    app = CharacterCardManagerApp(profile_startup="--profile-startup" in sys.argv[1:])
     app.mainloop()
@@ -0,0 +1,134 @@
+import base64
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+
+def make_card_png(name, description="", color=(120, 80, 200)):
+    """A small PNG card with a 'chara' tEXt chunk, as AICC serves them."""
+    card = {"spec": "chara_card_v2", "spec_version": "2.0", "data": {"name": name, "description": description}}
+    info = PngInfo()
+    info.add_text("chara", base64.b64encode(json.dumps(card).encode("utf-8")).decode("ascii"))
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, format="PNG", pnginfo=info)
+    return buffer.getvalue()
+
+
+class StandInServer:
+    """
+    Local stand-in for the AICC details API and file host. Routes are set per path; each can be made to
+    fail with 503 a number of times, to answer slowly, and to honor ETag / Last-Modified validators.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.routes = {}    # path -> {"body", "content_type", "etag", "last_modified"}
+        self.failures = {}  # path -> 503 responses still to send
+        self.requests = []  # (path, status) of every request answered
+        self.max_active = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def url(self, path=""):
+        return f"http://127.0.0.1:{self._httpd.server_port}{path}"
+
+    @property
+    def details_base(self):
+        return self.url("/details")
+
+    def set_route(self, path, body, content_type="application/octet-stream", validators=True, version=1):
+        self.routes[path] = {
+            "body": body,
+            "content_type": content_type,
+            "etag": f'"{path}-v{version}"' if validators else None,
+            "last_modified": f"Mon, 0{version} Jan 2024 00:00:00 GMT" if validators else None,
+        }
+
+    def add_card(self, author, title, png=None, validators=True, version=1):
+        """Serve the details JSON and the PNG for 'AICC/author/title'. Returns the card ID."""
+        png = png if png is not None else make_card_png(title)
+        file_path = f"/files/{author}/{title}.png"
+        details = {"name": title, "author": author, "file": self.url(file_path)}
+        self.set_route(f"/details/{author}/{title}", json.dumps(details).encode("utf-8"), "application/json", validators, version)
+        self.set_route(file_path, png, "image/png", validators, version)
+        return f"AICC/{author}/{title}"
+
+    def fail(self, path, times=1):
+        self.failures[path] = times
+
+    def count(self, path, status=None):
+        return sum(1 for p, s in self.requests if p == path and (status is None or s == status))
+
+    def _respond(self, handler):
+        path = handler.path
+        with self._lock:
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            with self._lock:
+                failures = self.failures.get(path, 0)
+                if failures:
+                    self.failures[path] = failures - 1
+            route = self.routes.get(path)
+            if failures:
+                status = 503
+            elif route is None:
+                status = 404
+            elif (route["etag"] and handler.headers.get("If-None-Match") == route["etag"]) or (
+                route["last_modified"] and handler.headers.get("If-Modified-Since") == route["last_modified"]
+            ):
+                status = 304
+            else:
+                status = 200
+
+            # Recorded before answering, so a client that got its response always sees it counted
+            with self._lock:
+                self.requests.append((path, status))
+            handler.send_response(status)
+            if status == 200:
+                handler.send_header("Content-Type", route["content_type"])
+                handler.send_header("Content-Length", str(len(route["body"])))
+                if route["etag"]:
+                    handler.send_header("ETag", route["etag"])
+                if route["last_modified"]:
+                    handler.send_header("Last-Modified", route["last_modified"])
+                handler.end_headers()
+                handler.wfile.write(route["body"])
+            else:
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real site
+
+            def do_GET(self):
+                server._respond(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,213 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.stand_in_server import StandInServer, make_card_png
+from utils.aicc_site_functions import AICCImporter, AICCBatchImporter
+from utils.db_manager import DatabaseManager
+from utils.job_manager import Job, JobCancelled, JobManager
+
+
+class _NoTk:
+    """Stands in for the Tk root: the job manager only needs after() to poll its event queue."""
+
+    def after(self, delay, callback):
+        pass
+
+
+class VaultTestCase(unittest.TestCase):
+    """Runs each test in a fresh working directory, so the app's db/ and cache/ folders are throwaway."""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self._temp_dir.name)
+        self.root = Path(self._temp_dir.name)
+        self.db_manager = DatabaseManager()
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._temp_dir.cleanup()
+
+
+class ParseCardIdTests(unittest.TestCase):
+    def test_id_form(self):
+        self.assertEqual(AICCImporter.parse_card_id("AICC/aicharcards/the-game-master"), ("aicharcards", "the-game-master"))
+        self.assertEqual(AICCImporter.parse_card_id("  AICC/author/title\n"), ("author", "title"))
+
+    def test_malformed_ids_are_rejected(self):
+        for card_id in ("", "AICC/author", "AICC/author/", "AICC//title", "aicc/author/title", "AICC/a/b/c"):
+            with self.subTest(card_id=card_id), self.assertRaises(ValueError):
+                AICCImporter.parse_card_id(card_id)
+
+    def test_url_form_is_rejected(self):
+        for url in (
+            "https://aicharactercards.com/charactercards/fantasy/author/title/",
+            "https://aicharactercards.com/wp-json/pngapi/v1/details/author/title",
+        ):
+            with self.subTest(url=url), self.assertRaises(ValueError):
+                AICCImporter.parse_card_id(url)
+
+    def test_details_url_quotes_components(self):
+        self.assertEqual(
+            AICCImporter.details_url("AICC/some author/title?x", "http://localhost/details"),
+            "http://localhost/details/some%20author/title%3Fx",
+        )
+        self.assertEqual(
+            AICCImporter.details_url("AICC/author/title"), f"{AICCImporter.BASE_URL}/author/title"
+        )
+
+    def test_parse_card_ids_splits_and_dedupes(self):
+        valid, invalid = AICCBatchImporter.parse_card_ids("AICC/a/one, AICC/a/two\nnot-an-id AICC/a/one\n\n")
+        self.assertEqual(valid, ["AICC/a/one", "AICC/a/two"])
+        self.assertEqual(invalid, ["not-an-id"])
+
+
+class WriteAtomicallyTests(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_writes_file_and_reads_metadata(self):
+        png = make_card_png("Alice", "A test card")
+        target = self.dir / "Alice.png"
+        content_hash, metadata = AICCImporter.write_atomically([png[:100], png[100:]], target)
+        self.assertEqual(target.read_bytes(), png)
+        self.assertEqual(len(content_hash), 64)
+        self.assertEqual(metadata["data"]["name"], "Alice")
+
+    def test_failed_write_leaves_no_partial_file(self):
+        def chunks():
+            yield b"\x89PNG\r\n\x1a\n partial"
+            raise ConnectionError("connection dropped")
+
+        target = self.dir / "Broken.png"
+        with self.assertRaises(ConnectionError):
+            AICCImporter.write_atomically(chunks(), target)
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_failed_write_keeps_existing_file(self):
+        target = self.dir / "Existing.png"
+        target.write_bytes(b"original")
+
+        def chunks():
+            yield b"replacement"
+            raise ConnectionError("connection dropped")
+
+        with self.assertRaises(ConnectionError):
+            AICCImporter.write_atomically(chunks(), target)
+        self.assertEqual(target.read_bytes(), b"original")
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["Existing.png"])
+
+
+class BatchImportTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job_manager = JobManager(_NoTk(), self.db_manager.db_path)
+        self.target_dir = self.root / "CharacterCards"
+
+    def tearDown(self):
+        self.job_manager.shutdown()
+        super().tearDown()
+
+    def new_job(self):
+        return Job("aicc_batch_import", None, self.job_manager)
+
+    def test_downloads_concurrently_within_the_worker_bound(self):
+        with StandInServer(delay=0.1) as server:
+            card_ids = [server.add_card("author", f"card-{i}") for i in range(8)]
+            importer = AICCBatchImporter(self.target_dir, max_workers=3, base_url=server.details_base)
+            seen = []
+            result = importer.run(card_ids, on_card=lambda card_id, details, path, metadata: seen.append(metadata))
+
+            self.assertEqual(sorted(result["imported"]), sorted(card_ids))
+            self.assertEqual(result["failed"], {})
+            self.assertGreater(server.max_active, 1)
+            self.assertLessEqual(server.max_active, 3)
+
+        self.assertEqual(sorted(p.name for p in self.target_dir.iterdir()), sorted(f"card-{i}.png" for i in range(8)))
+        self.assertEqual(sorted(m["data"]["name"] for m in seen), sorted(f"card-{i}" for i in range(8)))
+
+    def test_same_title_gets_distinct_files(self):
+        with StandInServer() as server:
+            card_ids = [server.add_card("first", "twin"), server.add_card("second", "twin")]
+            importer = AICCBatchImporter(self.target_dir, max_workers=2, base_url=server.details_base)
+            importer.run(card_ids)
+        self.assertEqual(sorted(p.name for p in self.target_dir.iterdir()), ["twin.png", "twin_1.png"])
+
+    def test_retries_server_errors(self):
+        with StandInServer() as server:
+            card_id = server.add_card("author", "flaky")
+            server.fail("/details/author/flaky")
+            server.fail("/files/author/flaky.png")
+            importer = AICCBatchImporter(self.target_dir, base_url=server.details_base)
+            result = importer.run([card_id])
+
+            self.assertEqual(result["imported"], [card_id])
+            self.assertEqual(server.count("/details/author/flaky", 503), 1)
+            self.assertEqual(server.count("/details/author/flaky", 200), 1)
+            self.assertEqual(server.count("/files/author/flaky.png", 503), 1)
+        self.assertTrue((self.target_dir / "flaky.png").exists())
+
+    def test_failed_cards_are_reported_and_leave_no_file(self):
+        with StandInServer() as server:
+            good = server.add_card("author", "good")
+            importer = AICCBatchImporter(self.target_dir, base_url=server.details_base)
+            result = importer.run([good, "AICC/author/missing"])
+
+        self.assertEqual(result["imported"], [good])
+        self.assertEqual(list(result["failed"]), ["AICC/author/missing"])
+        self.assertEqual([p.name for p in self.target_dir.iterdir()], ["good.png"])
+
+    def test_resumes_from_checkpoint_after_cancel(self):
+        with StandInServer(delay=0.05) as server:
+            card_ids = [server.add_card("author", f"card-{i}") for i in range(6)]
+            importer = AICCBatchImporter(self.target_dir, max_workers=2, base_url=server.details_base)
+
+            job = self.new_job()
+            first_run = []
+
+            def cancel_after_first(card_id, *_):
+                first_run.append(card_id)
+                job.cancel()
+
+            with self.assertRaises(JobCancelled):
+                importer.run(card_ids, job=job, on_card=cancel_after_first)
+
+            checkpoint = self.job_manager.load_checkpoint("aicc_batch_import")
+            self.assertTrue(checkpoint["pending"])
+            self.assertEqual(sorted(first_run + checkpoint["pending"]), sorted(card_ids))
+
+            second_run = []
+            result = importer.run(checkpoint["pending"], job=self.new_job(), on_card=lambda card_id, *_: second_run.append(card_id))
+
+            self.assertEqual(sorted(result["imported"]), sorted(checkpoint["pending"]))
+            self.assertEqual(sorted(first_run + second_run), sorted(card_ids))
+            self.assertEqual(self.job_manager.load_checkpoint("aicc_batch_import"), {"pending": [], "failed": {}})
+            # Cards finished before the cancel were not downloaded again
+            for card_id in first_run:
+                self.assertEqual(server.count(f"/details/{card_id[5:]}"), 1)
+
+        self.assertEqual(len(list(self.target_dir.iterdir())), len(card_ids))
+
+    def test_cancel_keeps_failed_cards_queued(self):
+        with StandInServer() as server:
+            card_ids = ["AICC/author/missing"] + [server.add_card("author", f"card-{i}") for i in range(4)]
+            importer = AICCBatchImporter(self.target_dir, max_workers=1, base_url=server.details_base)
+            job = self.new_job()
+
+            with self.assertRaises(JobCancelled):
+                importer.run(card_ids, job=job, on_card=lambda *_: job.cancel())
+
+        checkpoint = self.job_manager.load_checkpoint("aicc_batch_import")
+        self.assertEqual(list(checkpoint["failed"]), ["AICC/author/missing"])
+        self.assertIn("AICC/author/missing", checkpoint["pending"])
+        self.assertEqual(sorted(checkpoint["pending"]), sorted(card_ids[:1] + card_ids[2:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import sqlite3
+import unittest
+
+from PIL import Image
+
+from tests.test_aicc_import import VaultTestCase
+from utils.blob_store import BlobStore, blob_store
+from utils.image_ingest import ingested_image, thumbnail_file
+
+
+class BlobStoreReleaseTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store = BlobStore(self.root / "Blobs")
+        self.source = self.root / "image.png"
+        self.source.write_bytes(b"image bytes")
+
+    def add_row(self, digest):
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.execute("INSERT INTO characters (name, main_file, created_date, last_modified_date) VALUES ('A', 'A.png', '', '')")
+            connection.execute(
+                "INSERT INTO character_images (image_name, created_date, last_modified_date, character_id, content_hash) "
+                "VALUES ('art', '', '', 1, ?)", (digest,)
+            )
+
+    def test_unreferenced_blob_and_derived_files_are_deleted(self):
+        digest = self.store.put(self.source)
+        self.store.unpin(digest)
+        thumbnail = self.store.path(digest).with_name(digest + ".thumb.png")
+        thumbnail.write_bytes(b"thumb")
+
+        self.store.release(self.db_manager.db_path, [digest, None])
+        self.assertFalse(self.store.path(digest).exists())
+        self.assertFalse(thumbnail.exists())
+
+    def test_rolled_back_delete_keeps_blob(self):
+        digest = self.store.put(self.source)
+        self.add_row(digest)
+        self.store.unpin(digest)
+
+        connection = sqlite3.connect(self.db_manager.db_path)
+        connection.execute("DELETE FROM character_images WHERE content_hash = ?", (digest,))
+        connection.rollback()
+        connection.close()
+        self.store.release(self.db_manager.db_path, [digest])
+        self.assertTrue(self.store.path(digest).exists())
+
+    def test_pinned_blob_survives_release(self):
+        digest = self.store.put(self.source)
+        # Another add of the same bytes is still between storing the blob and committing its row
+        self.assertEqual(self.store.put(self.source), digest)
+        self.store.unpin(digest)
+
+        self.store.release(self.db_manager.db_path, [digest])
+        self.assertTrue(self.store.path(digest).exists())
+
+        self.store.unpin(digest)
+        self.store.release(self.db_manager.db_path, [digest])
+        self.assertFalse(self.store.path(digest).exists())
+
+
+class IngestedImageTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self._root = blob_store.root
+        blob_store.root = self.root / "Blobs"  # The shared store was created for the process's start directory
+        self.image = self.root / "art.png"
+        Image.new("RGB", (60, 90), (200, 40, 40)).save(self.image)
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.execute("INSERT INTO lorebooks (filename, created_date, last_modified_date) VALUES ('a.json', '', '')")
+            connection.execute("INSERT INTO lorebooks (filename, created_date, last_modified_date) VALUES ('b.json', '', '')")
+
+    def tearDown(self):
+        blob_store.root = self._root
+        super().tearDown()
+
+    def add(self, lorebook_id, image_name):
+        with ingested_image(self.image, self.db_manager.db_path) as image:
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                connection.execute(
+                    "INSERT INTO lorebook_images (lorebook_id, image_name, created_date, last_modified_date, content_hash) "
+                    "VALUES (?, ?, '', '', ?)", (lorebook_id, image_name, image["content_hash"])
+                )
+        return image["content_hash"]
+
+    def test_added_image_keeps_blob_and_thumbnail(self):
+        digest = self.add(1, "map")
+        self.assertTrue(blob_store.path(digest).exists())
+        self.assertTrue(thumbnail_file(digest).exists())
+        self.assertEqual(sorted(p.name for p in blob_store.path(digest).parent.iterdir()), sorted([digest, digest + ".thumb.png"]))
+
+    def test_failed_insert_leaves_no_files(self):
+        digest = self.add(1, "map")
+        Image.new("RGB", (60, 90), (10, 200, 10)).save(self.image)
+
+        # Image names are unique across all lorebooks
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.add(2, "map")
+        self.assertEqual(sorted(p.name for p in blob_store.root.rglob("*") if p.is_file()), sorted([digest, digest + ".thumb.png"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import sqlite3
+import unittest
+
+from tests.test_aicc_import import VaultTestCase
+from utils.character_query import CharacterQuery
+
+NAMES = ["Alice", "ÁLVARO", "Élodie", "Straße", "STRASSE", "Ørjan", "100% Real", "1000 Years", "under_score", "underXscore"]
+
+
+class CharacterQuerySearchTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.executemany(
+                "INSERT INTO characters (name, main_file, created_date, last_modified_date) VALUES (?, ?, ?, ?)",
+                [(name, f"{name}.png", "2024-01-01 00:00:00", "2024-01-01 00:00:00") for name in NAMES],
+            )
+
+    def search(self, text):
+        query = CharacterQuery(self.db_manager.db_path, "A - Z", text)
+        try:
+            return sorted(character.name for character in query[0:len(query)])
+        finally:
+            query.close()
+
+    def test_matches_in_memory_casefold_search(self):
+        for text in ("al", "ÁL", "élo", "ÉLO", "strasse", "STRASSE", "straße", "ørj", "ØRJ", "100%", "r_s", "_", "%"):
+            with self.subTest(text=text):
+                expected = sorted(name for name in NAMES if text.casefold() in name.casefold())
+                self.assertEqual(self.search(text), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
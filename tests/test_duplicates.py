@@ -0,0 +1,95 @@
+import io
+import sqlite3
+import unittest
+
+from PIL import Image, ImageDraw
+
+from tests.test_aicc_import import VaultTestCase
+from utils.duplicates import MAX_DISTANCE, DuplicateIndex, card_hash, hash_distance, image_hash
+
+
+def artwork(seed):
+    """A small picture with some structure, so its difference hash isn't flat."""
+    img = Image.new("RGB", (240, 320), (30, 30, 30))
+    draw = ImageDraw.Draw(img)
+    for i in range(8):
+        x, y = (seed * 37 + i * 53) % 200, (seed * 61 + i * 41) % 280
+        draw.ellipse((x, y, x + 40 + i * 5, y + 30 + i * 7), fill=((seed * 90 + i * 30) % 256, 120 + i * 15, 200 - i * 20))
+    return img
+
+
+def reencoded(img, size, quality):
+    buffer = io.BytesIO()
+    img.resize(size, Image.Resampling.LANCZOS).save(buffer, format="JPEG", quality=quality)
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+class ImageHashTests(unittest.TestCase):
+    def test_reencoded_copy_is_near_and_other_art_is_far(self):
+        original = artwork(1)
+        self.assertLessEqual(hash_distance(image_hash(original), image_hash(reencoded(original, (180, 240), 70))), MAX_DISTANCE)
+        self.assertGreater(hash_distance(image_hash(original), image_hash(artwork(2))), MAX_DISTANCE)
+
+    def test_hash_fits_a_signed_64_bit_column(self):
+        for img in (Image.new("L", (9, 8), 0), artwork(3), Image.linear_gradient("L").rotate(90)):
+            value = image_hash(img)
+            self.assertGreaterEqual(value, -(1 << 63))
+            self.assertLess(value, 1 << 63)
+
+    def test_card_hash_ignores_key_order(self):
+        self.assertEqual(card_hash({"a": 1, "b": [1, 2]}), card_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(card_hash({"a": 1}), card_hash({"a": 2}))
+
+
+class FindDuplicatesTests(VaultTestCase):
+    def add(self, name, card_value=None, image_value=None):
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.execute(
+                "INSERT INTO characters (name, main_file, created_date, last_modified_date, card_hash, image_hash) "
+                "VALUES (?, ?, '', '', ?, ?)", (name, f"{name}.png", card_value, image_value)
+            )
+
+    def groups(self, **kwargs):
+        return [sorted(member["name"] for member in group) for group in DuplicateIndex(self.db_manager.db_path).find_duplicates(**kwargs)]
+
+    def test_groups_exact_and_near_duplicates_only(self):
+        original = artwork(1)
+        self.add("Original", card_hash({"name": "A"}), image_hash(original))
+        self.add("Same Card", card_hash({"name": "A"}), image_hash(artwork(4)))
+        self.add("Reencoded", card_hash({"name": "A v2"}), image_hash(reencoded(original, (180, 240), 70)))
+        self.add("Copy", card_hash({"name": "A v3"}), image_hash(original))
+        self.add("Other", card_hash({"name": "B"}), image_hash(artwork(2)))
+        self.add("Not A Card", "", None)
+        self.add("Also Not A Card", "", None)
+
+        self.assertEqual(self.groups(), [["Copy", "Original", "Reencoded", "Same Card"]])
+        group = DuplicateIndex(self.db_manager.db_path).find_duplicates()[0]
+        reasons = {member["name"]: member["reason"] for member in group}
+        self.assertIn("same card data", reasons["Same Card"])
+        self.assertIn("same image", reasons["Copy"])
+
+    def test_distance_is_capped(self):
+        base = 0x0123456789ABCDEF
+        self.add("Base", image_value=base)
+        self.add("Three Bits", image_value=base ^ 0b111)  # Within MAX_DISTANCE
+        self.add("Four Bits", image_value=base ^ (0b1111 << 40))  # One bit too far
+        self.add("Chain", image_value=base ^ (0b1111 << 40) ^ (1 << 60))
+
+        self.assertEqual(self.groups(), [["Base", "Three Bits"], ["Chain", "Four Bits"]])
+        group = DuplicateIndex(self.db_manager.db_path).find_duplicates()[0]
+        self.assertEqual({member["reason"] for member in group}, {"similar image"})
+        # Asking for more than the bucketing can guarantee is capped at MAX_DISTANCE
+        self.assertEqual(self.groups(max_distance=10), self.groups())
+        self.assertEqual(self.groups(max_distance=0), [])
+
+    def test_groups_are_largest_first(self):
+        for name in ("b1", "b2", "b3"):
+            self.add(name, card_hash({"name": "b"}))
+        for name in ("a1", "a2"):
+            self.add(name, card_hash({"name": "a"}))
+        self.assertEqual(self.groups(), [["b1", "b2", "b3"], ["a1", "a2"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
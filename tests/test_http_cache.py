@@ -0,0 +1,180 @@
+import sqlite3
+import unittest
+
+from tests.stand_in_server import StandInServer, make_card_png
+from tests.test_aicc_import import VaultTestCase
+from utils.aicc_site_functions import AICCImporter
+from utils.http_cache import HTTPCache
+
+
+class HTTPCacheTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = HTTPCache(self.db_manager.db_path)
+        self.session = AICCImporter.get_session()
+
+    def blobs(self):
+        return sorted(path.name for path in self.cache.cache_dir.glob("??/*"))
+
+    def test_not_modified_reuses_cached_body(self):
+        with StandInServer() as server:
+            server.set_route("/data.json", b'{"value": 1}', "application/json")
+            first = self.cache.fetch(self.session, server.url("/data.json"))
+            second = self.cache.fetch(self.session, server.url("/data.json"))
+
+            self.assertEqual(server.count("/data.json", 200), 1)
+            self.assertEqual(server.count("/data.json", 304), 1)
+
+        self.assertFalse(first["from_cache"])
+        self.assertTrue(first["changed"])
+        self.assertTrue(second["from_cache"])
+        self.assertFalse(second["changed"])
+        self.assertEqual(second["content_hash"], first["content_hash"])
+        self.assertEqual(HTTPCache.read_json(second), {"value": 1})
+
+    def test_sends_both_validators(self):
+        with StandInServer() as server:
+            server.set_route("/file.png", b"png bytes", "image/png")
+            self.cache.fetch(self.session, server.url("/file.png"))
+            entry = self.cache.get_entry(server.url("/file.png"))
+
+            # The server only matches Last-Modified once the ETag no longer does
+            server.routes["/file.png"]["etag"] = '"other"'
+            result = self.cache.fetch(self.session, server.url("/file.png"))
+
+        self.assertEqual(entry["etag"], '"/file.png-v1"')
+        self.assertEqual(entry["last_modified"], "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertTrue(result["from_cache"])
+
+    def test_without_validators_body_is_downloaded_again(self):
+        with StandInServer() as server:
+            server.set_route("/plain", b"same", validators=False)
+            self.cache.fetch(self.session, server.url("/plain"))
+            result = self.cache.fetch(self.session, server.url("/plain"))
+            self.assertEqual(server.count("/plain", 200), 2)
+
+        self.assertFalse(result["changed"])
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_new_body_replaces_and_evicts_old_blob(self):
+        with StandInServer() as server:
+            server.set_route("/file.png", b"version one", "image/png")
+            first = self.cache.fetch(self.session, server.url("/file.png"))
+            server.set_route("/file.png", b"version two", "image/png", version=2)
+            second = self.cache.fetch(self.session, server.url("/file.png"))
+
+        self.assertTrue(second["changed"])
+        self.assertEqual(second["path"].read_bytes(), b"version two")
+        self.assertFalse(first["path"].exists())
+        self.assertEqual(self.blobs(), [second["content_hash"]])
+
+    def test_shared_blob_is_kept_while_another_url_uses_it(self):
+        with StandInServer() as server:
+            server.set_route("/a", b"shared")
+            server.set_route("/b", b"shared")
+            first = self.cache.fetch(self.session, server.url("/a"))
+            self.cache.fetch(self.session, server.url("/b"))
+            server.set_route("/a", b"changed", version=2)
+            self.cache.fetch(self.session, server.url("/a"))
+
+        self.assertTrue(first["path"].exists())
+        self.assertEqual(len(self.blobs()), 2)
+
+    def test_prune_removes_unreferenced_blobs(self):
+        content_hash, path = self.cache.store_chunks([b"orphan"])
+        self.cache._release(content_hash)
+        self.assertTrue(path.exists())
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertFalse(path.exists())
+
+
+class CheckForUpdatesTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = HTTPCache(self.db_manager.db_path)
+        self.library = self.root / "characters"
+        self.library.mkdir()
+
+    def import_card(self, server, card_id):
+        """Download a card through the cache and register it, as the import dialog does."""
+        target = self.library / f"{card_id.split('/')[-1]}.png"
+        AICCImporter.fetch_card(card_id, target, base_url=server.details_base, cache=self.cache)
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.execute(
+                "INSERT INTO characters (name, main_file, created_date, last_modified_date) VALUES (?, ?, ?, ?)",
+                (card_id.split("/")[-1], str(target), "2024-01-01 00:00:00", "2024-01-01 00:00:00"),
+            )
+        return target
+
+    def check(self, server, replaced):
+        return AICCImporter.check_for_updates(
+            self.cache, base_url=server.details_base, on_card=lambda *args: replaced.append(args)
+        )
+
+    def test_unchanged_cards_are_not_downloaded(self):
+        with StandInServer() as server:
+            card_ids = [server.add_card("author", f"card-{i}") for i in range(3)]
+            for card_id in card_ids:
+                self.import_card(server, card_id)
+
+            replaced = []
+            result = self.check(server, replaced)
+
+            self.assertEqual(server.count("/files/author/card-0.png", 200), 1)
+            self.assertEqual(server.count("/files/author/card-0.png", 304), 1)
+
+        self.assertEqual(result["checked"], 3)
+        self.assertEqual(result["updated"], [])
+        self.assertEqual(result["failed"], {})
+        self.assertEqual(replaced, [])
+
+    def test_changed_card_is_swapped_in(self):
+        with StandInServer() as server:
+            card_id = server.add_card("author", "changing", png=make_card_png("Old Name"))
+            other_id = server.add_card("author", "steady")
+            target = self.import_card(server, card_id)
+            self.import_card(server, other_id)
+            old_blobs = set(path.name for path in self.cache.cache_dir.glob("??/*"))
+
+            new_png = make_card_png("New Name", color=(10, 200, 10))
+            server.add_card("author", "changing", png=new_png, version=2)
+            replaced = []
+            result = self.check(server, replaced)
+
+        self.assertEqual(result["updated"], ["changing"])
+        self.assertEqual(target.read_bytes(), new_png)
+        self.assertEqual(len(replaced), 1)
+        replaced_id, card_details, file_path, metadata = replaced[0]
+        self.assertEqual((replaced_id, file_path), (card_id, str(target)))
+        self.assertEqual(metadata["data"]["name"], "New Name")
+
+        # Only the superseded versions left the cache
+        new_blobs = set(path.name for path in self.cache.cache_dir.glob("??/*"))
+        self.assertEqual(len(new_blobs), len(old_blobs))
+        self.assertNotEqual(new_blobs, old_blobs)
+
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            recorded = connection.execute("SELECT content_hash FROM aicc_cards WHERE card_id = ?", (card_id,)).fetchone()[0]
+        self.assertIn(recorded, new_blobs)
+
+    def test_failed_row_update_is_retried_next_check(self):
+        with StandInServer() as server:
+            card_id = server.add_card("author", "changing")
+            self.import_card(server, card_id)
+            server.add_card("author", "changing", png=make_card_png("New Name"), version=2)
+
+            def failing(*args):
+                raise sqlite3.OperationalError("database is locked")
+
+            result = AICCImporter.check_for_updates(self.cache, base_url=server.details_base, on_card=failing)
+            self.assertEqual(list(result["failed"]), [card_id])
+
+            replaced = []
+            result = self.check(server, replaced)
+
+        self.assertEqual(result["updated"], ["changing"])
+        self.assertEqual(len(replaced), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
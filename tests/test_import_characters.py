@@ -0,0 +1,47 @@
+import json
+import sqlite3
+import unittest
+
+from tests.stand_in_server import make_card_png
+from tests.test_aicc_import import VaultTestCase, _NoTk
+from utils.import_characters import import_cards
+from utils.job_manager import Job, JobManager
+from utils.st_tag_manager_edit_panel import SillyTavernTagManager
+from utils.tag_mirror import TagMirror
+
+
+class BulkImportTagTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job_manager = JobManager(_NoTk(), self.db_manager.db_path)
+        self.sillytavern = self.root / "SillyTavern"
+        self.target_dir = self.sillytavern / "characters"
+        self.target_dir.mkdir(parents=True)
+        (self.sillytavern / "settings.json").write_text(json.dumps({"tags": [], "tag_map": {}}), encoding="utf-8")
+        self.tag_mirror = TagMirror(self.db_manager.db_path)
+
+    def tearDown(self):
+        self.job_manager.shutdown()
+        super().tearDown()
+
+    def test_tags_are_keyed_by_character_name(self):
+        (self.target_dir / "Aria.png").write_bytes(b"existing card")
+        source = self.root / "Aria.png"
+        source.write_bytes(make_card_png("Aria"))
+        cards = [{"path": source, "name": "Aria", "notes": "", "tags": ["elf"]}]
+
+        import_cards(Job("character_bulk_import", None, self.job_manager), cards, self.target_dir,
+                     self.db_manager.db_path, self.sillytavern, self.tag_mirror)
+
+        self.assertEqual(cards[0]["final_path"].name, "Aria_1.png")
+        # Read back the way the edit panel and the tag filters do
+        tag_manager = SillyTavernTagManager(self.sillytavern)
+        self.assertEqual([t["name"] for t in tag_manager.tags if t["id"] in tag_manager.tag_map["Aria.png"]], ["elf"])
+        self.assertEqual(self.tag_mirror.names_with_tags(["elf"]), {"Aria"})
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            self.assertEqual(connection.execute("SELECT name, main_file FROM characters").fetchall(),
+                             [("Aria", str(self.target_dir / "Aria_1.png"))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from tests.stand_in_server import StandInServer
+from tests.test_aicc_import import VaultTestCase, _NoTk
+from utils.aicc_site_functions import AICCImporter
+from utils.file_handler import FileHandler
+from utils.import_pipeline import ImportPipeline
+from utils.job_manager import JobManager
+
+
+def wait_for(job, timeout=10):
+    deadline = time.time() + timeout
+    while not job.is_finished:
+        if time.time() > deadline:
+            raise AssertionError(f"Job '{job.name}' did not finish")
+        time.sleep(0.01)
+    return job
+
+
+class ImportPipelineTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job_manager = JobManager(_NoTk(), self.db_manager.db_path)
+
+    def tearDown(self):
+        self.job_manager.shutdown()
+        super().tearDown()
+
+    def test_runs_get_distinct_job_names(self):
+        first = ImportPipeline(self.job_manager, "add_character_parse")
+        second = ImportPipeline(self.job_manager, "add_character_parse")
+        self.assertNotEqual(first.name, second.name)
+
+        release = threading.Event()
+        first.add_stage("Waiting...", lambda ctx, job: release.wait(5))
+        second.add_stage("Reading...", lambda ctx, job: ctx.update(read=True))
+        first_job = first.start()
+        second_job = second.start()
+        self.assertIsNot(first_job, second_job)
+
+        self.assertTrue(wait_for(second_job).result["read"])
+        release.set()
+        self.assertEqual(wait_for(first_job).status, "completed")
+
+    def test_failed_stage_undoes_completed_stages(self):
+        undone = []
+
+        def fail(ctx, job):
+            raise ValueError("database is locked")
+
+        pipeline = ImportPipeline(self.job_manager, "add_character_save")
+        pipeline.add_stage("Copying...", lambda ctx, job: None, undo=lambda ctx: undone.append("copy"))
+        pipeline.add_stage("Saving...", lambda ctx, job: None, undo=lambda ctx: undone.append("insert"))
+        pipeline.add_stage("Tagging...", fail)
+        job = wait_for(pipeline.start())
+
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(undone, ["insert", "copy"])
+
+    def test_cancel_during_download_leaves_no_file(self):
+        target = self.root / "characters" / "slow.png"
+        target.parent.mkdir()
+        started = threading.Event()
+
+        def chunks():
+            for _ in range(200):
+                started.set()
+                time.sleep(0.01)
+                yield b"x" * 1024
+
+        def fetch(ctx, job):
+            AICCImporter.write_atomically(chunks(), target, job)
+            ctx["file_path"] = target
+
+        pipeline = ImportPipeline(self.job_manager, "add_character_import")
+        pipeline.add_stage("Downloading card...", fetch, undo=lambda ctx: ctx["file_path"].unlink())
+        job = pipeline.start()
+        started.wait(5)
+        job.cancel()
+
+        self.assertEqual(wait_for(job).status, "cancelled")
+        self.assertEqual(list(target.parent.iterdir()), [])
+
+    def test_cancel_after_download_removes_placed_file(self):
+        with StandInServer() as server:
+            card_id = server.add_card("author", "placed")
+            target = self.root / "placed.png"
+            release = threading.Event()
+
+            def fetch(ctx, job):
+                ctx["file_path"] = Path(AICCImporter.fetch_card(card_id, target, base_url=server.details_base, job=job)[1])
+
+            pipeline = ImportPipeline(self.job_manager, "add_character_import")
+            pipeline.add_stage("Downloading card...", fetch, undo=lambda ctx: ctx["file_path"].unlink())
+            pipeline.add_stage("Reading card data...", lambda ctx, job: release.wait(5))
+            job = pipeline.start()
+            while not target.exists() and not job.is_finished:
+                time.sleep(0.01)
+            job.cancel()
+            release.set()
+
+            self.assertEqual(wait_for(job).status, "cancelled")
+        self.assertFalse(target.exists())
+
+
+class CopyFileTests(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_copies_in_chunks(self):
+        source = self.dir / "source.png"
+        source.write_bytes(bytes(range(256)) * 100)
+        FileHandler.copy_file(source, self.dir / "copy.png", chunk_size=1000)
+        self.assertEqual((self.dir / "copy.png").read_bytes(), source.read_bytes())
+
+    def test_cancel_mid_copy_leaves_no_partial_file(self):
+        source = self.dir / "source.png"
+        source.write_bytes(b"x" * 10000)
+
+        class CancelAfter:
+            def __init__(self, checks):
+                self.checks = checks
+
+            def check(self):
+                self.checks -= 1
+                if self.checks < 0:
+                    raise InterruptedError("canceled")
+
+        with self.assertRaises(InterruptedError):
+            FileHandler.copy_file(source, self.dir / "copy.png", CancelAfter(3), chunk_size=1000)
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["source.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import threading
+import time
+import unittest
+
+from tests.test_aicc_import import VaultTestCase, _NoTk
+from tests.test_import_pipeline import wait_for
+from utils.job_manager import JobManager, format_duration
+
+
+def drain_until(job_manager, condition, timeout=5):
+    """Deliver job events as the Tk main loop does every 100 ms, until condition() holds."""
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Job events were not delivered")
+        job_manager._process_events()
+        time.sleep(0.01)
+
+
+class JobManagerTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job_manager = JobManager(_NoTk(), self.db_manager.db_path)
+
+    def tearDown(self):
+        self.job_manager.shutdown()
+        super().tearDown()
+
+    def test_same_name_returns_the_running_job(self):
+        release = threading.Event()
+        first = self.job_manager.submit("sync", lambda job: release.wait(5))
+        second = self.job_manager.submit("sync", lambda job: "second")
+        self.assertIs(second, first)
+        self.assertIsNot(self.job_manager.submit("other", lambda job: None), first)
+
+        release.set()
+        wait_for(first)
+        third = self.job_manager.submit("sync", lambda job: "third")
+        self.assertIsNot(third, first)
+        self.assertEqual(wait_for(third).result, "third")
+
+    def test_callbacks_run_when_events_are_drained(self):
+        done, failed = [], []
+        ok = self.job_manager.submit("ok", lambda job: 42, on_done=done.append)
+        bad = self.job_manager.submit("bad", lambda job: 1 / 0, on_error=failed.append)
+        wait_for(ok)
+        wait_for(bad)
+        self.assertEqual((done, failed), ([], []))  # Nothing runs on the worker thread
+
+        drain_until(self.job_manager, lambda: done and failed)
+        self.assertEqual(done, [ok])
+        self.assertEqual(failed, [bad])
+        self.assertIsInstance(bad.error, ZeroDivisionError)
+        self.assertFalse(self.job_manager.is_running("ok"))
+        self.assertCountEqual(self.job_manager.recent_jobs(), [bad, ok])
+
+    def test_cancel_stops_at_the_next_check(self):
+        started = threading.Event()
+        cancelled = []
+
+        def run(job):
+            while True:
+                started.set()
+                job.check()
+                time.sleep(0.01)
+
+        job = self.job_manager.submit("loop", run, on_cancel=cancelled.append)
+        started.wait(5)
+        self.job_manager.cancel("loop")
+        self.assertEqual(wait_for(job).status, "cancelled")
+        drain_until(self.job_manager, lambda: cancelled)
+        self.assertEqual(cancelled, [job])
+
+    def test_pause_blocks_check_until_resumed(self):
+        progress = []
+        started = threading.Event()
+
+        def run(job):
+            for i in range(100):
+                job.check()
+                progress.append(i)
+                started.set()
+                time.sleep(0.005)
+            return len(progress)
+
+        job = self.job_manager.submit("paused", run)
+        started.wait(5)
+        job.pause()
+        self.assertEqual(job.status, "paused")
+        time.sleep(0.1)
+        count = len(progress)
+        time.sleep(0.3)
+        self.assertLessEqual(len(progress), count + 1)  # At most the step already past its check
+
+        job.resume()
+        self.assertEqual(wait_for(job).result, 100)
+
+    def test_cancel_wakes_a_paused_job(self):
+        started = threading.Event()
+
+        def run(job):
+            while True:
+                started.set()
+                job.check()
+                time.sleep(0.01)
+
+        job = self.job_manager.submit("paused", run)
+        started.wait(5)
+        job.pause()
+        job.cancel()
+        self.assertEqual(wait_for(job).status, "cancelled")
+
+    def test_checkpoints_are_saved_loaded_and_cleared(self):
+        self.assertIsNone(self.job_manager.load_checkpoint("batch"))
+        self.job_manager.save_checkpoint("batch", {"pending": ["a", "b"]})
+        self.job_manager.save_checkpoint("batch", {"pending": ["b"]})
+        self.job_manager.save_checkpoint("other", {"position": 3})
+
+        # A new manager (e.g. after a restart) sees the last saved state
+        restarted = JobManager(_NoTk(), self.db_manager.db_path)
+        self.assertEqual(restarted.load_checkpoint("batch"), {"pending": ["b"]})
+
+        job = restarted.submit("batch", lambda job: job.load_checkpoint())
+        self.assertEqual(wait_for(job).result, {"pending": ["b"]})
+        job.clear_checkpoint()
+        self.assertIsNone(restarted.load_checkpoint("batch"))
+        self.assertEqual(restarted.load_checkpoint("other"), {"position": 3})
+        restarted.shutdown()
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(None), "--")
+        self.assertEqual(format_duration(5.7), "5s")
+        self.assertEqual(format_duration(65), "1m 05s")
+        self.assertEqual(format_duration(3 * 3600 + 7 * 60), "3h 07m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import sqlite3
+import unittest
+
+from tests.test_aicc_import import VaultTestCase
+from utils.lorebook_index import LorebookIndex
+
+
+def entry(uid, keys=(), comment="", content=""):
+    return {"uid": str(uid), "keys": list(keys), "secondary_keys": [], "comment": comment, "content": content, "enabled": True}
+
+
+class LorebookIndexTests(VaultTestCase):
+    def index(self, fts):
+        index = LorebookIndex(self.db_manager.db_path)
+        index._fts_available = fts and index.fts_available
+        return index
+
+    def add_lorebooks(self, index, books):
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            cursor = connection.cursor()
+            for lorebook_id, entries in books.items():
+                index.index_lorebook(cursor, lorebook_id, entries)
+
+    def test_matching_ids_are_not_capped_by_entry_count(self):
+        for fts in (True, False):
+            with self.subTest(fts=fts):
+                index = self.index(fts)
+                # The first lorebook alone has more matching entries than a page of search results
+                books = {1: [entry(i, ["dragon"]) for i in range(6000)], 2: [entry(0, ["dragon"])], 3: [entry(0, ["elf"])]}
+                self.add_lorebooks(index, books)
+
+                self.assertEqual(index.matching_lorebook_ids("dragon"), {1, 2})
+                self.assertEqual(len(index.search("dragon")), 200)
+                self.assertEqual(index.matching_lorebook_ids("   "), set())
+
+    def test_like_fallback_searches_content_like_fts(self):
+        for fts in (True, False):
+            with self.subTest(fts=fts):
+                index = self.index(fts)
+                self.add_lorebooks(index, {
+                    10: [entry(1, ["castle"], content="The old keep is haunted.")],
+                    11: [entry(1, ["tavern"], comment="haunted cellar")],
+                    12: [entry(1, ["forest"], content="Nothing here.")],
+                })
+
+                self.assertEqual(index.matching_lorebook_ids("haunted"), {10, 11})
+                self.assertEqual(index.matching_lorebook_ids("keep haunted"), {10})
+                self.assertEqual([e["keys"] for e in index.search("haunted", lorebook_id=10)], [["castle"]])
+
+    def test_like_fallback_escapes_wildcards(self):
+        index = self.index(False)
+        self.add_lorebooks(index, {20: [entry(1, ["100%"])], 21: [entry(1, ["1000"])]})
+        self.assertEqual(index.matching_lorebook_ids("100%"), {20})
+
+
+if __name__ == "__main__":
+    unittest.main()
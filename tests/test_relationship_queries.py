@@ -0,0 +1,62 @@
+import sqlite3
+import unittest
+
+from tests.test_aicc_import import VaultTestCase
+from utils.relationship_queries import RelationshipQueries
+from utils.tag_mirror import TagMirror
+
+
+class _TagManager:
+    """Stands in for the SillyTavern tag manager: holds the tag data and syncs the mirror like load_tags."""
+
+    def __init__(self, tag_mirror, tags, tag_map):
+        self.tag_mirror = tag_mirror
+        self.tags = tags
+        self.tag_map = tag_map
+
+    def reload_tags_if_changed(self):
+        self.tag_mirror.sync(self.tags, self.tag_map)
+
+
+class SharedTagsTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        tags = [{"id": "1", "name": "fantasy"}, {"id": "2", "name": "elf"}, {"id": "3", "name": "sci-fi"}]
+        # Tag map keys are "<character name>.png", whatever the card's file is called
+        tag_map = {"Aria.png": ["1", "2"], "Bren.png": ["1", "2"], "Cass.png": ["1"], "Dax.png": ["3"]}
+        self.tag_manager = _TagManager(TagMirror(self.db_manager.db_path), tags, tag_map)
+        self.queries = RelationshipQueries(self.db_manager.db_path, lambda: self.tag_manager)
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.executemany(
+                "INSERT INTO characters (name, main_file, created_date, last_modified_date) VALUES (?, ?, '', '')",
+                [("Aria", "Aria.png"), ("Bren", "Bren_1.png"), ("Cass", "AICC title.png"), ("Dax", "Dax.png"), ("Eve", "Eve.png")],
+            )
+
+    def test_shared_tags_use_the_character_name_key(self):
+        sharing = self.queries.characters_sharing_tags(1)
+        self.assertEqual(
+            sharing,
+            [
+                {"id": 2, "name": "Bren", "shared_tags": ["elf", "fantasy"]},
+                {"id": 3, "name": "Cass", "shared_tags": ["fantasy"]},
+            ],
+        )
+        self.assertEqual(self.queries.characters_sharing_tags(4), [])
+        self.assertEqual(self.queries.characters_sharing_tags(5), [])
+
+    def test_limit_keeps_the_most_shared(self):
+        self.assertEqual([c["name"] for c in self.queries.characters_sharing_tags(1, limit=1)], ["Bren"])
+
+    def test_summary_counts_tags_from_the_mirror(self):
+        summary = self.queries.dashboard_summary()
+        self.assertEqual(summary["characters"], 5)
+        self.assertEqual(summary["characters_without_tags"], 1)
+        self.assertEqual(summary["top_tags"], [("fantasy", 3), ("elf", 2), ("sci-fi", 1)])
+
+    def test_tag_changes_are_picked_up(self):
+        self.tag_manager.tag_map = {"Aria.png": ["3"], "Dax.png": ["3"]}
+        self.assertEqual([c["name"] for c in self.queries.characters_sharing_tags(1)], ["Dax"])
+
+
+if __name__ == "__main__":
+    unittest.main()
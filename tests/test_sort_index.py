@@ -0,0 +1,84 @@
+import random
+import unittest
+from operator import attrgetter
+
+from utils.character_model import Character
+from utils.sort_index import SORT_OPTIONS, SortIndex
+
+NAMES = ["alice", "Alice", "bob", "Émile", "zoe", "Zoë", "straße", "STRASSE", "1st", ""]
+
+
+def random_date(rng):
+    return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00"
+
+
+def expected(characters, sort_option):
+    """What the baseline produced: a full sort of the list (ties by id), reversed for descending options."""
+    attribute, descending = SORT_OPTIONS[sort_option]
+    ordered = sorted(characters, key=attrgetter(attribute, "id"))
+    return ordered[::-1] if descending else ordered
+
+
+class SortIndexTests(unittest.TestCase):
+    def assert_orders(self, index, characters):
+        for sort_option in SORT_OPTIONS:
+            self.assertEqual(
+                [c.id for c in index.ordered(sort_option)], [c.id for c in expected(characters, sort_option)], sort_option
+            )
+
+    def test_random_edits_match_a_full_sort(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                characters = {
+                    i: Character(i, rng.choice(NAMES), f"{i}.png", random_date(rng), random_date(rng)) for i in range(30)
+                }
+                index = SortIndex(characters.values())
+                next_id = len(characters)
+
+                for step in range(200):
+                    action = rng.random()
+                    if action < 0.3:
+                        character = Character(next_id, rng.choice(NAMES), f"{next_id}.png", random_date(rng), random_date(rng))
+                        characters[next_id] = character
+                        index.add(character)
+                        next_id += 1
+                    elif action < 0.5 and characters:
+                        character_id = rng.choice(list(characters))
+                        del characters[character_id]
+                        index.remove(character_id)
+                    elif characters:
+                        character = characters[rng.choice(list(characters))]
+                        character.update(rng.choice(NAMES), random_date(rng))
+                        index.update(character)
+
+                    # Orders are sorted lazily; read one now and then so edits hit both built and unbuilt orders
+                    if rng.random() < 0.1:
+                        index.ordered(rng.choice(list(SORT_OPTIONS)))
+
+                self.assertEqual(len(index), len(characters))
+                self.assert_orders(index, list(characters.values()))
+
+    def test_members_keep_the_sort_order(self):
+        rng = random.Random(7)
+        characters = [Character(i, rng.choice(NAMES), f"{i}.png", random_date(rng), random_date(rng)) for i in range(40)]
+        index = SortIndex(characters)
+        members = rng.sample(characters, 15)
+        for sort_option in SORT_OPTIONS:
+            self.assertEqual(
+                [c.id for c in index.ordered(sort_option, members)],
+                [c.id for c in expected(members, sort_option)],
+            )
+
+    def test_removing_unknown_id_and_re_adding_are_harmless(self):
+        characters = [Character(1, "a", "a.png", "2024-01-01 00:00:00", "2024-01-01 00:00:00")]
+        index = SortIndex(characters)
+        index.ordered("A - Z")
+        index.remove(99)
+        index.add(characters[0])
+        self.assertEqual([c.id for c in index.ordered("A - Z")], [1])
+        self.assertEqual(index.ordered("unknown option"), index.ordered("A - Z"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import random
+import sqlite3
+import unittest
+
+from tests.test_aicc_import import VaultTestCase
+from utils.tag_mirror import TagMirror
+
+TAGS = [{"id": str(i), "name": name} for i, name in enumerate(["fantasy", "elf", "sci-fi", "horror", "Fantasy"])]
+
+
+def baseline_filter(names, tags, tag_map, selected_tags, no_tags_only):
+    """The in-memory tag filter the character list used before the mirror (tag map keys are "Name.png")."""
+    tag_names = {tag["id"]: tag["name"] for tag in tags}
+
+    def has_selected_tags(name):
+        character_tags = [tag_names[tag_id] for tag_id in tag_map.get(f"{name}.png", [])]
+        return all(tag in character_tags for tag in selected_tags)
+
+    def has_no_tags(name):
+        return not tag_map.get(f"{name}.png")
+
+    return {
+        name for name in names
+        if (not selected_tags or has_selected_tags(name)) and (not no_tags_only or has_no_tags(name))
+    }
+
+
+class TagMirrorTests(VaultTestCase):
+    def setUp(self):
+        super().setUp()
+        self.mirror = TagMirror(self.db_manager.db_path)
+
+    def rows(self):
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            tags = dict(connection.execute("SELECT id, name FROM tags"))
+            links = set(connection.execute("SELECT character_name, tag_id FROM character_tags"))
+        return tags, links
+
+    def test_unchanged_tag_data_is_skipped(self):
+        tag_map = {"Aria.png": ["0", "1"]}
+        self.assertTrue(self.mirror.sync(TAGS, tag_map))
+        self.assertFalse(self.mirror.sync(TAGS, {"Aria.png": ["0", "1"]}))
+        # Also for a new mirror, e.g. after a restart
+        self.assertFalse(TagMirror(self.db_manager.db_path).sync(TAGS, tag_map))
+
+    def test_rename_and_delete_tags(self):
+        self.mirror.sync(TAGS, {"Aria.png": ["0", "1"], "Bren.png": ["1"]})
+
+        renamed = [dict(tag, name="high fantasy") if tag["id"] == "0" else tag for tag in TAGS if tag["id"] != "1"]
+        self.mirror.sync(renamed, {"Aria.png": ["0"]})
+
+        tags, links = self.rows()
+        self.assertEqual(tags["0"], "high fantasy")
+        self.assertNotIn("1", tags)
+        self.assertEqual(links, {("Aria", "0")})
+        self.assertEqual(self.mirror.names_with_tags(["high fantasy"]), {"Aria"})
+        self.assertEqual(self.mirror.names_with_tags(["fantasy"]), set())
+        self.assertEqual(self.mirror.names_with_tags(["elf"]), set())
+        self.assertEqual(self.mirror.tag_counts(), [("Fantasy", 0), ("high fantasy", 1), ("horror", 0), ("sci-fi", 0)])
+
+    def test_keys_for_the_same_name_are_merged(self):
+        self.mirror.sync(TAGS, {"Aria.png": ["0"], "Aria": ["1"], "Bren": ["2"], "Cass.png": []})
+        _, links = self.rows()
+        self.assertEqual(links, {("Aria", "0"), ("Aria", "1"), ("Bren", "2")})
+        self.assertEqual(self.mirror.tagged_names(), {"Aria", "Bren"})
+
+        # Dropping one of the keys keeps the other one's tags
+        self.mirror.sync(TAGS, {"Aria": ["1"], "Bren": ["2"]})
+        self.assertEqual(self.rows()[1], {("Aria", "1"), ("Bren", "2")})
+
+    def test_incremental_sync_matches_a_fresh_sync(self):
+        rng = random.Random(3)
+        names = [f"Character {i}" for i in range(40)]
+        for _ in range(15):
+            tag_map = {f"{name}.png": rng.sample([tag["id"] for tag in TAGS], rng.randint(0, 3)) for name in rng.sample(names, 25)}
+            self.mirror.sync(TAGS, tag_map)
+            incremental = self.rows()
+
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                connection.execute("DELETE FROM character_tags")
+                connection.execute("DELETE FROM settings WHERE key = 'tag_mirror_checksum'")
+            TagMirror(self.db_manager.db_path).sync(TAGS, tag_map)
+            self.assertEqual(self.rows(), incremental)
+
+    def test_filters_match_the_in_memory_filter(self):
+        rng = random.Random(11)
+        names = [f"Character {i}" for i in range(60)] + ["Zoë"]
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            connection.executemany(
+                "INSERT INTO characters (name, main_file, created_date, last_modified_date) VALUES (?, ?, '', '')",
+                [(name, f"{name}.png") for name in names],
+            )
+
+        for _ in range(10):
+            tag_map = {
+                f"{name}.png": rng.sample([tag["id"] for tag in TAGS], rng.randint(0, 3))
+                for name in rng.sample(names, 45)
+            }
+            self.mirror.sync(TAGS, tag_map)
+            for selected in (["fantasy"], ["Fantasy"], ["elf", "horror"], ["fantasy", "fantasy"], ["missing"]):
+                expected = baseline_filter(names, TAGS, tag_map, selected, False)
+                self.assertEqual(self.mirror.names_with_tags(selected) & set(names), expected, selected)
+                self.assertEqual(self.query(self.mirror.tag_filter_clause(selected)), expected, selected)
+
+            expected = baseline_filter(names, TAGS, tag_map, [], True)
+            self.assertEqual(set(names) - self.mirror.tagged_names(), expected)
+            self.assertEqual(self.query((self.mirror.untagged_clause(), [])), expected)
+
+    def query(self, clause):
+        condition, params = clause
+        with sqlite3.connect(self.db_manager.db_path) as connection:
+            return {row[0] for row in connection.execute(f"SELECT name FROM characters WHERE {condition}", params)}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,65 +1,131 @@
 from pathlib import Path
+from datetime import datetime
+import os
+import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
 import platform
 import locale
+import threading
+import hashlib
+import tempfile
+from utils.job_manager import JobCancelled
+from utils.card_metadata import PNGChunkScanner
 
 class AICCImporter:
     BASE_URL = "https://aicharactercards.com/wp-json/pngapi/v1/details"
+    TIMEOUT = (5, 30)  # (connect, read) seconds
+    POOL_SIZE = 8
 
-    @staticmethod
-    def fetch_card(card_id, target_file_path):
-        """Fetch a card PNG file from the API and save it to the specified file path."""
-        try:
-            # Validate and parse the card ID
-            parts = card_id.split("/")
-            if len(parts) != 3 or parts[0] != "AICC":
-                raise ValueError("Invalid card ID format. Expected 'AICC/author/title'.")
+    _session = None
+    _session_lock = threading.Lock()
+    _headers = None
 
-            # Encode URL components
-            author = quote(parts[1])
-            title = quote(parts[2])
-            url = f"{AICCImporter.BASE_URL}/{author}/{title}"
+    @staticmethod
+    def parse_card_id(card_id):
+        """Validate an 'AICC/author/title' ID and return (author, title)."""
+        parts = card_id.strip().split("/")
+        if len(parts) != 3 or parts[0] != "AICC" or not parts[1] or not parts[2]:
+            raise ValueError("Invalid card ID format. Expected 'AICC/author/title'.")
+        return parts[1], parts[2]
 
-            # Generate headers
+    @classmethod
+    def get_headers(cls):
+        """Build the request headers once; the platform details do not change while running."""
+        if cls._headers is None:
             referer = (
                 f"OS: {platform.system()} {platform.release()} ({platform.architecture()[0]}), "
                 f"Processor: {platform.processor()}, Locale: {locale.getdefaultlocale()[0]}"
             )
-            headers = {
+            cls._headers = {
                 "User-Agent": "AICardVault/1.0",
                 "Referer": referer,
                 "Accept": "application/json",  # Explicitly request JSON
             }
+        return cls._headers
 
-            # Add an API key if required (check if your API requires it)
-            # headers["Authorization"] = "Bearer <YOUR_API_KEY>"
+    @classmethod
+    def get_session(cls):
+        """Return the shared keep-alive session with connection pooling and retry/backoff."""
+        with cls._session_lock:
+            if cls._session is None:
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(["GET"]),
+                    respect_retry_after_header=True,
+                )
+                adapter = HTTPAdapter(pool_connections=cls.POOL_SIZE, pool_maxsize=cls.POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(cls.get_headers())
+                cls._session = session
+            return cls._session
 
-            # Send GET request to the API for card details
-            response = requests.get(url, headers=headers)
-            if response.status_code != 200:
-                print(f"Response: {response.text[:500]}")  # Debugging: Log response
-                raise ValueError(f"API returned an error: {response.status_code} - {response.reason}")
+    @staticmethod
+    def details_url(card_id, base_url=None):
+        """Build the card details API URL for an 'AICC/author/title' ID."""
+        author, title = AICCImporter.parse_card_id(card_id)
+        return f"{base_url or AICCImporter.BASE_URL}/{quote(author)}/{quote(title)}"
+
+    @staticmethod
+    def fetch_card(card_id, target_file_path, session=None, base_url=None, cache=None, job=None):
+        """
+        Fetch a card PNG file from the API and save it to the specified file path.
+        With an HTTPCache, both requests are conditional and unchanged files are copied from the cache.
+        With a job, the download checks it between chunks and stops without leaving a file if canceled.
+        Returns (card_details, file_path, metadata); metadata is None if the PNG had no readable card data.
+        """
+        try:
+            # Validate and parse the card ID, then encode URL components
+            url = AICCImporter.details_url(card_id, base_url)
 
-            # Parse JSON response
-            card_details = response.json()
+            session = session or AICCImporter.get_session()
+
+            if cache:
+                card_details = cache.read_json(cache.fetch(session, url, timeout=AICCImporter.TIMEOUT))
+            else:
+                # Send GET request to the API for card details
+                response = session.get(url, timeout=AICCImporter.TIMEOUT)
+                if response.status_code != 200:
+                    print(f"Response: {response.text[:500]}")  # Debugging: Log response
+                    raise ValueError(f"API returned an error: {response.status_code} - {response.reason}")
+
+                # Parse JSON response
+                card_details = response.json()
 
             # Download the associated PNG file
             file_url = card_details.get("file")
             if not file_url:
                 raise ValueError("No file URL provided in the API response.")
 
-            # Send GET request for the file with the same headers
-            image_response = requests.get(file_url, headers=headers, stream=True)
-            if image_response.status_code != 200:
-                raise ValueError(f"Failed to download file: {image_response.status_code} - {image_response.reason}")
+            if cache:
+                file_result = cache.fetch(session, file_url, timeout=AICCImporter.TIMEOUT, job=job)
+                _, metadata = AICCImporter.write_atomically(
+                    AICCImporter.read_chunks(file_result["path"]), target_file_path, job
+                )
+                AICCImporter.record_source(cache.db_path, card_id, file_url, file_result["content_hash"], target_file_path)
+                return card_details, str(target_file_path), metadata
+
+            # Send GET request for the file over the same pooled connection
+            image_response = session.get(file_url, stream=True, timeout=AICCImporter.TIMEOUT)
+            try:
+                if image_response.status_code != 200:
+                    raise ValueError(f"Failed to download file: {image_response.status_code} - {image_response.reason}")
 
-            # Save the PNG file
-            with target_file_path.open("wb") as f:
-                for chunk in image_response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                # Save the PNG file
+                _, metadata = AICCImporter.write_atomically(
+                    image_response.iter_content(chunk_size=65536), target_file_path, job
+                )
+            finally:
+                image_response.close()
 
-            return card_details, str(target_file_path)
+            return card_details, str(target_file_path), metadata
 
         except requests.exceptions.RequestException as e:
             print(f"HTTP Error: {e}")
@@ -67,3 +133,249 @@ class AICCImporter:
         except Exception as e:
             print(f"Error fetching card: {e}")
             raise
+
+    @staticmethod
+    def read_chunks(file_path, chunk_size=65536):
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def write_atomically(chunks, target_file_path, job=None):
+        """
+        Stream chunks into a temp file beside the target while hashing them and scanning for the
+        card's tEXt chunk, then os.replace it into place so a partial card never lands in the library.
+        A job is checked before each chunk. Returns (content_hash, metadata).
+        """
+        target_file_path = Path(target_file_path)
+        hasher = hashlib.sha256()
+        scanner = PNGChunkScanner()
+        fd, temp_path = tempfile.mkstemp(dir=target_file_path.parent, prefix=f".{target_file_path.stem}.", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if job:
+                        job.check()
+                    if chunk:
+                        hasher.update(chunk)
+                        scanner.feed(chunk)
+                        f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, target_file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        try:
+            metadata = scanner.metadata()
+        except ValueError as e:
+            print(f"Error reading metadata: {e}")
+            metadata = None
+        return hasher.hexdigest(), metadata
+
+    @staticmethod
+    def record_source(db_path, card_id, file_url, content_hash, main_file):
+        """Remember which AICC card a library file came from so it can be checked for updates."""
+        with sqlite3.connect(db_path) as connection:
+            connection.execute("""
+                INSERT INTO aicc_cards (card_id, file_url, content_hash, main_file, last_checked_date)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(card_id) DO UPDATE SET
+                    file_url = excluded.file_url,
+                    content_hash = excluded.content_hash,
+                    main_file = excluded.main_file,
+                    last_checked_date = excluded.last_checked_date
+            """, (card_id, file_url, content_hash, str(main_file), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+    @staticmethod
+    def check_for_updates(cache, job=None, max_workers=4, session=None, base_url=None, on_card=None):
+        """
+        Revalidate every AICC-sourced card still in the library in one pooled pass.
+        Unchanged cards cost two conditional requests; only changed PNGs are downloaded
+        and swapped into place. on_card(card_id, card_details, file_path, metadata) is called
+        in the job thread for each replaced card. Returns {"checked", "updated", "failed"}.
+        """
+        with sqlite3.connect(cache.db_path) as connection:
+            rows = connection.execute("""
+                SELECT a.card_id, a.content_hash, a.main_file, c.name
+                FROM aicc_cards a
+                JOIN characters c ON c.main_file = a.main_file
+            """).fetchall()
+
+        session = session or AICCImporter.get_session()
+        updated, failed = [], {}
+        if job:
+            job.report(done=0, total=len(rows))
+
+        def check(row):
+            card_id, content_hash, main_file, _ = row
+            card_details = cache.read_json(cache.fetch(session, AICCImporter.details_url(card_id, base_url), timeout=AICCImporter.TIMEOUT))
+            file_url = card_details.get("file")
+            if not file_url:
+                raise ValueError("No file URL provided in the API response.")
+
+            file_result = cache.fetch(session, file_url, timeout=AICCImporter.TIMEOUT)
+            if file_result["content_hash"] == content_hash:
+                AICCImporter.record_source(cache.db_path, card_id, file_url, content_hash, main_file)
+                return None
+            _, metadata = AICCImporter.write_atomically(AICCImporter.read_chunks(file_result["path"]), main_file)
+            return card_details, main_file, metadata, file_url, file_result["content_hash"]
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aicc-check") as executor:
+            futures = {executor.submit(check, row): row for row in rows}
+            try:
+                for future in as_completed(futures):
+                    card_id, _, _, name = futures[future]
+                    try:
+                        replaced = future.result()
+                        if replaced:
+                            card_details, main_file, metadata, file_url, new_hash = replaced
+                            if on_card:
+                                on_card(card_id, card_details, main_file, metadata)
+                            # Recorded last, so a card whose row failed to update is replaced again next time
+                            AICCImporter.record_source(cache.db_path, card_id, file_url, new_hash, main_file)
+                            updated.append(name)
+                    except Exception as e:
+                        failed[card_id] = str(e)
+                    if job:
+                        job.report(advance=1, message=card_id)
+                        job.check()
+            except JobCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        cache.prune()
+        return {"checked": len(rows), "updated": updated, "failed": failed}
+
+
+class AICCBatchImporter:
+    """Download many AICC cards with bounded concurrency over the shared pooled session."""
+
+    def __init__(self, target_dir, max_workers=4, session=None, base_url=None, cache=None):
+        self.target_dir = Path(target_dir)
+        self.max_workers = max_workers
+        self.session = session
+        self.base_url = base_url
+        self.cache = cache
+        self._reserved_paths = set()
+        self._reserve_lock = threading.Lock()
+
+    @staticmethod
+    def parse_card_ids(text):
+        """
+        Split pasted text or file contents into card IDs (one per line, or comma/space separated).
+        Returns (valid_ids, invalid_entries) with duplicates removed and order kept.
+        """
+        valid, invalid, seen = [], [], set()
+        for token in text.replace(",", "\n").split():
+            token = token.strip()
+            if not token or token in seen:
+                continue
+            seen.add(token)
+            try:
+                AICCImporter.parse_card_id(token)
+                valid.append(token)
+            except ValueError:
+                invalid.append(token)
+        return valid, invalid
+
+    @staticmethod
+    def read_card_ids_file(file_path):
+        """Read card IDs from a text file."""
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            return AICCBatchImporter.parse_card_ids(f.read())
+
+    def reserve_target_path(self, card_id):
+        """Pick an unused '<title>.png' (or '<title>_N.png') path, safe across worker threads."""
+        _, title = AICCImporter.parse_card_id(card_id)
+        with self._reserve_lock:
+            target = self.target_dir / f"{title}.png"
+            counter = 1
+            while target.exists() or target in self._reserved_paths:
+                target = self.target_dir / f"{title}_{counter}.png"
+                counter += 1
+            self._reserved_paths.add(target)
+            return target
+
+    def _download(self, card_id):
+        target = self.reserve_target_path(card_id)
+        try:
+            return AICCImporter.fetch_card(
+                card_id, target, session=self.session, base_url=self.base_url, cache=self.cache
+            )
+        except Exception:
+            # Writes are atomic, but a card placed before a later failure would be an orphan
+            if target.exists():
+                target.unlink()
+            raise
+        finally:
+            with self._reserve_lock:
+                self._reserved_paths.discard(target)
+
+    def run(self, card_ids, job=None, on_card=None):
+        """
+        Download all card IDs. The pending queue is checkpointed through `job` after every card,
+        so a crashed or canceled batch resumes with only the cards that were not finished or failed.
+        on_card(card_id, card_details, file_path, metadata) is called in the job thread for each success.
+        """
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        pending = list(card_ids)
+        failed = {}
+        imported = []
+
+        if job:
+            job.report(done=0, total=len(pending))
+
+        def save_queue():
+            if job:
+                # Failed cards stay queued, so a resume retries them even if the batch is canceled
+                job.save_checkpoint({"pending": pending + list(failed), "failed": failed})
+
+        save_queue()
+        queue_iter = iter(list(pending))
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aicc") as executor:
+            def fill():
+                # Keep at most max_workers downloads in flight
+                while len(in_flight) < self.max_workers:
+                    if job and job.is_cancelled:
+                        return
+                    card_id = next(queue_iter, None)
+                    if card_id is None:
+                        return
+                    in_flight[executor.submit(self._download, card_id)] = card_id
+
+            fill()
+            while in_flight:
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    card_id = in_flight.pop(future)
+                    try:
+                        card_details, file_path, metadata = future.result()
+                        if on_card:
+                            on_card(card_id, card_details, file_path, metadata)
+                        imported.append(card_id)
+                    except Exception as e:
+                        failed[card_id] = str(e)
+                    pending.remove(card_id)
+                    save_queue()
+                    if job:
+                        job.report(advance=1, message=card_id)
+
+                if job and not job.is_cancelled:
+                    try:
+                        job.check()  # Blocks here while paused
+                    except JobCancelled:
+                        pass  # Stop queueing; downloads already in flight are still recorded
+                fill()
+
+        if job:
+            job.check()
+        return {"imported": imported, "failed": failed}
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+REFLINK_THRESHOLD = 4 * 1024 * 1024  # Above this, hash first and try a copy-on-write clone
+FICLONE = 0x40049409  # Linux ioctl (btrfs, XFS, ...); fcntl.FICLONE only exists on Python 3.12+
+
+
+class BlobStore:
+    """
+    Content-addressed store for added images: each file is kept once under Blobs/ab/<sha256>,
+    so the same artwork attached to several characters or lorebooks shares one copy.
+    DB rows keep the digest in their content_hash column; files are removed once no row uses them.
+    Hardlinks are deliberately not used, since later edits to the source file would change the blob.
+    A stored blob stays pinned until its row is committed (unpin), so a concurrent release can't delete it.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else Path.cwd() / "Blobs"
+        self._lock = threading.Lock()  # Orders pinning against the reference check and delete in release
+        self._pins = {}  # digest -> stores not yet committed to a row
+
+    def path(self, digest):
+        return self.root / digest[:2] / digest
+
+    def resolve(self, content_hash, legacy_path):
+        """Path of an image row: its blob when it has one, otherwise the pre-blob file location."""
+        return self.path(content_hash) if content_hash else Path(legacy_path)
+
+    def put(self, source_path):
+        """
+        Store a file and return its sha256 digest. Existing blobs are reused, not rewritten.
+        The digest is pinned: call unpin(digest) once the row using it is committed (or failed).
+        """
+        source_path = Path(source_path)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        if source_path.stat().st_size >= REFLINK_THRESHOLD:
+            # Large files: hash in place first so duplicates cost no copy at all
+            digest = self.hash_file(source_path)
+            try:
+                if not self._pin(digest):
+                    self._clone_into(source_path, digest)
+            except BaseException:
+                self.unpin(digest)
+                raise
+            return digest
+
+        # Small files: hash while copying into a temp file, then move it into place
+        sha256 = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, source_path.open("rb") as src:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    out.write(chunk)
+            digest = sha256.hexdigest()
+            if self._pin(digest):
+                os.remove(temp_path)
+            else:
+                target = self.path(digest)
+                try:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(temp_path, target)
+                except BaseException:
+                    self.unpin(digest)
+                    raise
+            return digest
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _clone_into(self, source_path, digest):
+        target = self.path(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            if not self._reflink(source_path, temp_path):
+                shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _reflink(source_path, target_path):
+        """Copy-on-write clone where the filesystem supports it; False means fall back to copying."""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import fcntl
+            with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except (OSError, ImportError):
+            return False
+
+    @staticmethod
+    def hash_file(file_path):
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _pin(self, digest):
+        """Pin a digest being stored; returns whether its blob already exists."""
+        with self._lock:
+            self._pins[digest] = self._pins.get(digest, 0) + 1
+            return self.path(digest).exists()
+
+    def unpin(self, digest):
+        with self._lock:
+            count = self._pins.pop(digest, 0) - 1
+            if count > 0:
+                self._pins[digest] = count
+
+    def release(self, db_path, digests):
+        """
+        Delete the blobs no image row refers to any more. Call after the rows were deleted and committed:
+        references are checked again here, so a rollback or a concurrent add of the same image keeps its blob.
+        """
+        digests = {digest for digest in digests if digest}
+        if not digests:
+            return
+        with sqlite3.connect(db_path) as connection:
+            cursor = connection.cursor()
+            for digest in digests:
+                with self._lock:
+                    if digest in self._pins:
+                        continue  # Being added again; its row isn't committed yet
+                    cursor.execute("""
+                        SELECT EXISTS(SELECT 1 FROM character_images WHERE content_hash = ?)
+                            OR EXISTS(SELECT 1 FROM lorebook_images WHERE content_hash = ?)
+                    """, (digest, digest))
+                    if cursor.fetchone()[0]:
+                        continue
+                    blob_path = self.path(digest)
+                    # Derived files (e.g. "<digest>.thumb.png") go with the blob
+                    for path in [blob_path, *blob_path.parent.glob(digest + ".*")]:
+                        try:
+                            path.unlink()
+                        except FileNotFoundError:
+                            pass
+                print(f"Deleted unused image blob: {digest}")
+        connection.close()
+
+
+blob_store = BlobStore()
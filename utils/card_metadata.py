@@ -1,21 +1,16 @@
 import base64
 import json
 import struct
+import zlib
+
+READ_SIZE = 64 * 1024
 
 class PNGMetadataReader:
     PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
 
     @staticmethod
     def _calculate_crc32(data):
-        crc = 0xffffffff
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 1:
-                    crc = (crc >> 1) ^ 0xEDB88320
-                else:
-                    crc >>= 1
-        return crc ^ 0xffffffff
+        return zlib.crc32(data) & 0xffffffff
 
     @staticmethod
     def _read_chunks(data):
@@ -50,26 +45,28 @@ class PNGMetadataReader:
 
     @staticmethod
     def extract_text_metadata(file_path):
+        # Stream the file and stop at the first tEXt chunk instead of reading and checking the image data
+        scanner = PNGChunkScanner()
         with open(file_path, "rb") as f:
-            data = f.read()
-
-        chunks = PNGMetadataReader._read_chunks(data)
-
-        for chunk in chunks:
-            if chunk["type"] == "tEXt":
-                # tEXt chunk contains null-separated keyword and text
-                text_data = chunk["data"]
-                _, value = text_data.split(b'\x00', 1)
-                value = value.decode("ascii")
-
-                # Decode Base64 if applicable
-                try:
-                    decoded_json = base64.b64decode(value).decode("utf-8")
-                    return json.loads(decoded_json)
-                except base64.binascii.Error:
-                    raise ValueError("Failed to decode Base64 metadata")
+            while not scanner.done:
+                data = f.read(READ_SIZE)
+                if not data:
+                    break
+                scanner.feed(data)
+        return scanner.metadata()
 
-        raise ValueError("No tEXt metadata found")
+    @staticmethod
+    def decode_text_chunk(text_data):
+        """Decode a card tEXt chunk (null-separated keyword and Base64 JSON)."""
+        _, value = text_data.split(b'\x00', 1)
+        value = value.decode("ascii")
+
+        # Decode Base64 if applicable
+        try:
+            decoded_json = base64.b64decode(value).decode("utf-8")
+            return json.loads(decoded_json)
+        except base64.binascii.Error:
+            raise ValueError("Failed to decode Base64 metadata")
 
     @staticmethod
     def get_highest_spec_fields(metadata):
@@ -102,6 +99,82 @@ class PNGMetadataReader:
         return PNGMetadataReader.get_highest_spec_fields(metadata)
 
 
+class PNGChunkScanner:
+    """
+    Incremental PNG parser for data arriving in pieces (e.g. a download). Only the first
+    tEXt chunk is buffered; image data is skipped as it streams past.
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._signature_checked = False
+        self._skip = 0
+        self.text_chunk = None
+        self.error = None
+        self.done = False
+
+    def feed(self, data):
+        if self.done:
+            return
+        self._buffer += data
+        try:
+            self._scan()
+        except ValueError as e:
+            self.error = e
+            self.done = True
+
+    def _scan(self):
+        if not self._signature_checked:
+            signature = PNGMetadataReader.PNG_SIGNATURE
+            if len(self._buffer) < len(signature):
+                return
+            if not self._buffer.startswith(signature):
+                raise ValueError("Invalid PNG header")
+            self._buffer = self._buffer[len(signature):]
+            self._signature_checked = True
+
+        while True:
+            if self._skip:
+                # Drop the rest of a chunk we do not care about without keeping it in memory
+                skipped = min(self._skip, len(self._buffer))
+                self._buffer = self._buffer[skipped:]
+                self._skip -= skipped
+                if self._skip:
+                    return
+
+            if len(self._buffer) < 8:
+                return
+            length = struct.unpack(">I", self._buffer[:4])[0]
+            chunk_type = self._buffer[4:8]
+
+            if chunk_type == b"IEND":
+                self.done = True
+                return
+            if chunk_type != b"tEXt":
+                self._buffer = self._buffer[8:]
+                self._skip = length + 4  # Chunk data plus CRC
+                continue
+
+            if len(self._buffer) < 12 + length:
+                return
+            chunk_data = self._buffer[8:8 + length]
+            crc = struct.unpack(">I", self._buffer[8 + length:12 + length])[0]
+            if crc != zlib.crc32(chunk_type + chunk_data) & 0xffffffff:
+                raise ValueError("CRC mismatch for chunk type tEXt")
+            self.text_chunk = chunk_data
+            self._buffer = b""
+            self.done = True
+            return
+
+    def metadata(self):
+        """Return the decoded card metadata, or raise ValueError like extract_text_metadata."""
+        if self.error:
+            raise self.error
+        if self.text_chunk is None:
+            raise ValueError("No tEXt metadata found")
+        return PNGMetadataReader.decode_text_chunk(self.text_chunk)
+
+
 # Usage example
 # Assuming the PNG file contains the Base64-encoded JSON metadata:
 # png_reader = PNGMetadataReader()
@@ -0,0 +1,91 @@
+import json
+import customtkinter as ctk
+
+FIELD_PREVIEW_CHARS = 2000  # Text shown per field before a "show all" link
+INLINE_LIST_ITEMS = 50  # Lists of short strings (tags, greetings) up to this size are shown directly
+
+
+def format_size(length):
+    return f"{length / 1024:.1f} KB" if length >= 1024 else f"{length} chars"
+
+
+class CardDataViewer:
+    """
+    Read-only view of a card's fields in one reused textbox. Nested values (extensions, character_book, ...)
+    start collapsed and are only serialized when expanded, and long text is cut at FIELD_PREVIEW_CHARS,
+    so selecting a card with a large embedded lorebook doesn't push megabytes of text into Tk.
+    """
+
+    def __init__(self, master):
+        self.textbox = ctk.CTkTextbox(master, wrap="word", state="disabled")
+        self.textbox.pack(fill="both", expand=True, padx=0, pady=0)
+        self.textbox.tag_config("key", foreground="#d8bfd8", spacing1=8)
+        self.textbox.tag_config("summary", foreground="gray")
+        self.textbox.tag_config("link", foreground="#6fa8dc", underline=True)
+        self.textbox.tag_bind("link", "<Enter>", lambda event: self.textbox.configure(cursor="hand2"))
+        self.textbox.tag_bind("link", "<Leave>", lambda event: self.textbox.configure(cursor=""))
+        self.links = {}  # link tag -> function writing the collapsed content
+
+    def show(self, card_data):
+        """Replace the displayed card."""
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        if self.links:
+            self.textbox.tag_delete(*self.links)
+            self.links = {}
+
+        for key, value in card_data.items():
+            self.textbox.insert("end", f"{key}:\n", "key")
+            self._insert_value("end", value)
+            self.textbox.insert("end", "\n")
+
+        self.textbox.configure(state="disabled")
+        self.textbox.yview_moveto(0)
+
+    ########## Rendering ##########
+
+    def _insert_value(self, index, value):
+        if isinstance(value, list) and len(value) <= INLINE_LIST_ITEMS and all(isinstance(item, str) for item in value):
+            # Tags and greetings read better as plain text than as JSON
+            self._insert_text(index, "\n\n".join(value) if value else "[]")
+        elif isinstance(value, (dict, list)) and value:
+            summary = f"{{{len(value)} keys}} " if isinstance(value, dict) else f"[{len(value)} items] "
+            self.textbox.insert(index, summary, "summary")
+            self._insert_link(index, "show", lambda at: self._insert_text(at, json.dumps(value, indent=2, ensure_ascii=False)))
+        elif isinstance(value, (dict, list)):
+            self.textbox.insert(index, json.dumps(value))
+        else:
+            self._insert_text(index, str(value))
+
+    def _insert_text(self, index, text):
+        if len(text) <= FIELD_PREVIEW_CHARS:
+            self.textbox.insert(index, text)
+            return
+        self.textbox.insert(index, text[:FIELD_PREVIEW_CHARS])
+        rest = text[FIELD_PREVIEW_CHARS:]
+        self._insert_link(index, f" ... show all ({format_size(len(text))})", lambda at: self._insert_text(at, rest))
+
+    def _insert_link(self, index, label, expand):
+        tag = f"link{len(self.links)}"
+        while tag in self.links:
+            tag += "_"
+        self.links[tag] = expand
+        self.textbox.insert(index, label, ("link", tag))
+        self.textbox.tag_bind(tag, "<Button-1>", lambda event: self._expand(tag))
+
+    def _expand(self, tag):
+        """Replace a link with the content it stands for."""
+        ranges = self.textbox.tag_ranges(tag)
+        expand = self.links.pop(tag, None)
+        if not ranges or not expand:
+            return
+        self.textbox.configure(state="normal")
+        self.textbox.delete(ranges[0], ranges[1])
+        self.textbox.tag_delete(tag)
+        # A right-gravity mark keeps successive inserts in order at the link's old position
+        self.textbox.mark_set("expand_at", ranges[0])
+        self.textbox.mark_gravity("expand_at", "right")
+        expand("expand_at")
+        self.textbox.mark_unset("expand_at")
+        self.textbox.configure(state="disabled")
+        self.textbox.configure(cursor="")
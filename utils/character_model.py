@@ -0,0 +1,44 @@
+import sqlite3
+
+
+def date_key(text):
+    """A 'YYYY-MM-DD HH:MM:SS' date as an int that sorts the same way (0 if missing or malformed)."""
+    try:
+        return int(text[0:4] + text[5:7] + text[8:10] + text[11:13] + text[14:16] + text[17:19])
+    except (TypeError, ValueError):
+        return 0
+
+
+class Character:
+    """
+    One entry of the in-memory character list. Slotted to keep 50k+ entries small, with the search
+    and sort keys (casefolded name, integer dates) computed once instead of on every filter or sort.
+    """
+
+    __slots__ = ("id", "name", "main_file", "created_date", "last_modified_date", "name_key", "created_key", "modified_key")
+
+    def __init__(self, id, name, main_file, created_date, last_modified_date):
+        self.id = id
+        self.main_file = main_file
+        self.created_date = created_date
+        self.created_key = date_key(created_date)
+        self.update(name, last_modified_date)
+
+    def update(self, name, last_modified_date):
+        """Apply an edit, keeping the derived keys in step."""
+        self.name = name
+        self.name_key = name.casefold()
+        self.last_modified_date = last_modified_date
+        self.modified_key = date_key(last_modified_date)
+
+    def __repr__(self):
+        return f"Character({self.id!r}, {self.name!r})"
+
+
+def load_characters(db_path):
+    """Every character in the database, as Character entries."""
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute(
+            "SELECT id, name, main_file, created_date, last_modified_date FROM characters"
+        ).fetchall()
+    return [Character(*row) for row in rows]
@@ -0,0 +1,181 @@
+import sqlite3
+from collections import OrderedDict
+from utils.character_model import Character
+
+LIST_QUERY_THRESHOLD = 20000  # Libraries larger than this are listed from SQL instead of held in memory
+
+# Sort option -> (indexed sort expression, descending); ties are broken by id in the same direction
+SORT_EXPRESSIONS = {
+    "A - Z": ("name COLLATE NOCASE", False),
+    "Z - A": ("name COLLATE NOCASE", True),
+    "Newest": ("created_date", True),
+    "Oldest": ("created_date", False),
+    "Most Recently Edited": ("last_modified_date", True),
+}
+COLUMNS = "id, name, main_file, created_date, last_modified_date"
+CACHED_WINDOWS = 4  # Recently fetched row ranges kept to serve and seek from
+
+# Name search matching the in-memory list (query in name.casefold()). SQLite's LIKE only folds ASCII
+# case, which is exact for ASCII names (text length equals byte length); other names go through casefold.
+SEARCH_CLAUSE = (
+    "CASE WHEN length(name) = length(CAST(name AS BLOB)) THEN name LIKE ? ESCAPE '\\' "
+    "ELSE instr(casefold(name), ?) > 0 END"
+)
+
+
+def _casefold(text):
+    return text.casefold() if isinstance(text, str) else text
+
+
+def count_characters(db_path):
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+
+
+class CharacterQuery:
+    """
+    The filtered, sorted character list as a window onto the database, for large libraries. It reads
+    like the in-memory list where the app needs it (len(), [index], [start:end]) but only fetches the
+    rows asked for: search, tag filter and sort run as indexed queries, and moving to the next or
+    previous page seeks from the last row shown (keyset pagination) instead of counting an OFFSET.
+    """
+
+    def __init__(self, db_path, sort_option, search="", tag_mirror=None, tag_names=(), untagged=False):
+        self.db_path = db_path
+        self.sort_option = sort_option if sort_option in SORT_EXPRESSIONS else "A - Z"
+        self.search = search
+        self.tag_mirror = tag_mirror  # Tag filters join its tags / character_tags tables
+        self.tag_names = tuple(tag_names)
+        self.untagged = untagged
+        self._connection = None
+        self._count = None
+        self._windows = OrderedDict()  # (start, stop) -> rows, most recent last
+
+    def sorted(self, sort_option):
+        """The same filter in another order."""
+        self.close()
+        return CharacterQuery(self.db_path, sort_option, self.search, self.tag_mirror, self.tag_names, self.untagged)
+
+    def refresh(self):
+        """Forget cached rows and counts after characters were added, edited or removed."""
+        self._count = None
+        self._windows.clear()
+
+    def close(self):
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    ########## Queries ##########
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.db_path)
+            self._connection.create_function("casefold", 1, _casefold, deterministic=True)
+        return self._connection
+
+    def _filters(self):
+        clauses, params = [], []
+        if self.search:
+            search = self.search.casefold()
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append(SEARCH_CLAUSE)
+            params += [f"%{escaped}%", search]
+        if self.tag_names:
+            clause, tag_params = self.tag_mirror.tag_filter_clause(self.tag_names)
+            clauses.append(clause)
+            params += tag_params
+        if self.untagged:
+            clauses.append(self.tag_mirror.untagged_clause())
+        return clauses, params
+
+    def _key_clause(self, expression, after):
+        """Rows strictly after (or before) a (key, id) position, written so SQLite can seek the sort index."""
+        if after:
+            return f"{expression} >= ? AND ({expression} > ? OR id > ?)"
+        return f"{expression} <= ? AND ({expression} < ? OR id < ?)"
+
+    def _select(self, limit, offset=0, seek=None, backwards=False):
+        """
+        Rows in list order. seek=(key, id) starts after that row (before it when backwards; the rows are
+        still returned in list order).
+        """
+        expression, descending = SORT_EXPRESSIONS[self.sort_option]
+        reverse = descending != backwards
+        clauses, params = self._filters()
+        if seek is not None:
+            clauses.append(self._key_clause(expression, after=not reverse))
+            params += [seek[0], seek[0], seek[1]]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "DESC" if reverse else "ASC"
+        rows = self._connect().execute(
+            f"SELECT {COLUMNS} FROM characters {where} ORDER BY {expression} {direction}, id {direction} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        if backwards:
+            rows.reverse()
+        return [Character(*row) for row in rows]
+
+    def _sort_key(self, character):
+        column = "name" if self.sort_option in ("A - Z", "Z - A") else SORT_EXPRESSIONS[self.sort_option][0]
+        return getattr(character, column), character.id
+
+    def __len__(self):
+        if self._count is None:
+            clauses, params = self._filters()
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            self._count = self._connect().execute(f"SELECT COUNT(*) FROM characters {where}", params).fetchone()[0]
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            return self.rows(start, stop)
+        if index < 0:
+            index += len(self)
+        rows = self.rows(index, index + 1)
+        if not rows:
+            raise IndexError("character list index out of range")
+        return rows[0]
+
+    def rows(self, start, stop):
+        """
+        Rows [start, stop) of the list. Ranges inside a recently fetched window are served from it, and
+        ranges just after or before one are found by seeking from its last or first row.
+        """
+        if stop <= start:
+            return []
+        windows = list(reversed(self._windows.items()))
+        for (window_start, window_stop), window_rows in windows:
+            if window_start <= start and stop - window_start <= len(window_rows):
+                return window_rows[start - window_start:stop - window_start]
+        for (window_start, window_stop), window_rows in windows:
+            if window_rows and start == window_stop and len(window_rows) == window_stop - window_start:
+                rows = self._select(stop - start, seek=self._sort_key(window_rows[-1]))
+                break
+            if window_rows and stop == window_start:
+                rows = self._select(stop - start, seek=self._sort_key(window_rows[0]), backwards=True)
+                break
+        else:
+            rows = self._select(stop - start, offset=start)
+        self._windows[(start, stop)] = rows
+        while len(self._windows) > CACHED_WINDOWS:
+            self._windows.popitem(last=False)
+        return rows
+
+    def position(self, character_id):
+        """Index of a character in the list, or None if the filter excludes it."""
+        expression, descending = SORT_EXPRESSIONS[self.sort_option]
+        clauses, params = self._filters()
+        connection = self._connect()
+        row = connection.execute(
+            f"SELECT {expression}, id FROM characters WHERE {' AND '.join(clauses + ['id = ?'])}",
+            params + [character_id],
+        ).fetchone()
+        if row is None:
+            return None
+        # Count the rows ahead of it, walking the sort index
+        clauses.append(self._key_clause(expression, after=descending))
+        return connection.execute(
+            f"SELECT COUNT(*) FROM characters WHERE {' AND '.join(clauses)}", params + [row[0], row[0], row[1]]
+        ).fetchone()[0]
@@ -105,12 +105,201 @@ class DatabaseManager:
                 )
                 """)
 
+                # One row per direction per link: clean up older databases once, then enforce it
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_relationships_pair'")
+                if cursor.fetchone() is None:
+                    self._normalize_relationships(cursor)
+                    cursor.execute("""
+                    CREATE UNIQUE INDEX idx_relationships_pair
+                    ON character_relationships (character_id, related_character_id)
+                    """)
+
+                # Background Job Checkpoints Table
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_checkpoints (
+                    name TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    last_modified_date TEXT NOT NULL
+                )
+                """)
+
+                # HTTP Cache Table (bodies live in cache/http, one file per content hash)
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT NOT NULL,
+                    content_type TEXT,
+                    fetched_date TEXT NOT NULL
+                )
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_content_hash ON http_cache (content_hash)")
+
+                # AICC Sourced Cards Table
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS aicc_cards (
+                    card_id TEXT PRIMARY KEY,
+                    file_url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    main_file TEXT NOT NULL,
+                    last_checked_date TEXT NOT NULL
+                )
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_aicc_cards_main_file ON aicc_cards (main_file)")
+
+                # Lorebook Entries Table (parsed from worlds/*.json during sync)
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS lorebook_entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    lorebook_id INTEGER NOT NULL,
+                    uid TEXT,
+                    keys TEXT NOT NULL,
+                    secondary_keys TEXT NOT NULL,
+                    comment TEXT,
+                    content_length INTEGER NOT NULL DEFAULT 0,
+                    enabled INTEGER NOT NULL DEFAULT 1,
+                    FOREIGN KEY (lorebook_id) REFERENCES lorebooks (id) ON DELETE CASCADE
+                )
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_lorebook_entries_lorebook ON lorebook_entries (lorebook_id)")
+
+                # Lorebook File Manifest (stat + hash of each world file at the last sync)
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS lorebook_files (
+                    lorebook_id INTEGER PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    removed_date TEXT,
+                    FOREIGN KEY (lorebook_id) REFERENCES lorebooks (id) ON DELETE CASCADE
+                )
+                """)
+
+                # Full-text index over entry keys, comments and content (skipped if SQLite lacks FTS5)
+                try:
+                    cursor.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS lorebook_entries_fts USING fts5(
+                        keys, secondary_keys, comment, content
+                    )
+                    """)
+                except sqlite3.OperationalError as e:
+                    print(f"Full-text search unavailable, lorebook entry search will use LIKE: {e}")
+                # Entry content for the LIKE search (NULL when the FTS table holds it)
+                if self._add_column_if_missing(cursor, "lorebook_entries", "content", "TEXT"):
+                    fts = cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lorebook_entries_fts'"
+                    ).fetchone()
+                    if not fts:
+                        # Entries indexed before the column existed have no content: re-index them on the next sync
+                        cursor.execute("UPDATE lorebook_files SET mtime_ns = -1, content_hash = '' WHERE removed_date IS NULL")
+
+                # Content-addressed image files (see utils/blob_store.py); NULL for images stored before blobs
+                self._add_column_if_missing(cursor, "character_images", "content_hash", "TEXT")
+                self._add_column_if_missing(cursor, "lorebook_images", "content_hash", "TEXT")
+                # Detected format and stored size, written by utils/image_ingest.py when an image is added
+                for table in ("character_images", "lorebook_images"):
+                    self._add_column_if_missing(cursor, table, "image_format", "TEXT")
+                    self._add_column_if_missing(cursor, table, "width", "INTEGER")
+                    self._add_column_if_missing(cursor, table, "height", "INTEGER")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_character_images_hash ON character_images (content_hash)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_lorebook_images_hash ON lorebook_images (content_hash)")
+
+                # Link lookups from either side (used by the cross-reference queries)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_lorebook_links_character ON lorebook_character_links (character_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_lorebook_links_pair ON lorebook_character_links (lorebook_id, character_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_name_nocase ON characters (name COLLATE NOCASE)")
+
+                # Duplicate detection (see utils/duplicates.py): card JSON hash and perceptual image hash,
+                # each with the file mtime it was computed for so replaced cards get rehashed
+                self._add_column_if_missing(cursor, "characters", "card_hash", "TEXT")
+                self._add_column_if_missing(cursor, "characters", "card_hash_mtime", "INTEGER")
+                self._add_column_if_missing(cursor, "characters", "image_hash", "INTEGER")
+                self._add_column_if_missing(cursor, "characters", "image_hash_mtime", "INTEGER")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_card_hash ON characters (card_hash)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_image_hash ON characters (image_hash)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_main_file ON characters (main_file)")
+
+                # Sort orders of the query-backed character list (see utils/character_query.py)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_created_date ON characters (created_date)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_last_modified_date ON characters (last_modified_date)")
+
+                # Mirror of SillyTavern's tags and tag map (see utils/tag_mirror.py)
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tags (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL
+                )
+                """)
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS character_tags (
+                    character_name TEXT NOT NULL,
+                    tag_id TEXT NOT NULL,
+                    PRIMARY KEY (character_name, tag_id)
+                ) WITHOUT ROWID
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_name ON tags (name)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_character_tags_tag ON character_tags (tag_id, character_name)")
+                # Tag lookups join character_tags to characters by exact name
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_characters_name ON characters (name)")
+
+                # Cross-reference views
+                cursor.execute("""
+                CREATE VIEW IF NOT EXISTS lorebook_link_counts AS
+                SELECT l.id AS lorebook_id, l.filename, COUNT(lcl.character_id) AS character_count,
+                       f.removed_date IS NOT NULL AS removed
+                FROM lorebooks l
+                LEFT JOIN lorebook_character_links lcl ON lcl.lorebook_id = l.id
+                LEFT JOIN lorebook_files f ON f.lorebook_id = l.id
+                GROUP BY l.id
+                """)
+                cursor.execute("""
+                CREATE VIEW IF NOT EXISTS character_link_counts AS
+                SELECT c.id AS character_id, c.name,
+                       (SELECT COUNT(*) FROM lorebook_character_links lcl WHERE lcl.character_id = c.id) AS lorebook_count,
+                       (SELECT COUNT(*) FROM character_relationships r WHERE r.character_id = c.id) AS related_count
+                FROM characters c
+                """)
+
                 connection.commit()
                 print("Database initialized successfully.")
         except sqlite3.Error as e:
             print(f"Error initializing the database: {e}")
             raise
 
+    def _add_column_if_missing(self, cursor, table, column, definition):
+        """Add a column to an existing table (older databases predate it). Returns True if it was added."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            return True
+        return False
+
+    def _normalize_relationships(self, cursor):
+        """Remove self, orphaned and duplicate relationship rows and add missing reverse rows."""
+        cursor.execute("""
+            DELETE FROM character_relationships
+            WHERE character_id = related_character_id
+               OR character_id NOT IN (SELECT id FROM characters)
+               OR related_character_id NOT IN (SELECT id FROM characters)
+               OR id NOT IN (
+                   SELECT MIN(id) FROM character_relationships
+                   GROUP BY character_id, related_character_id
+               )
+        """)
+        removed = cursor.rowcount
+        cursor.execute("""
+            INSERT INTO character_relationships (character_id, related_character_id)
+            SELECT r.related_character_id, r.character_id
+            FROM character_relationships r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM character_relationships x
+                WHERE x.character_id = r.related_character_id AND x.related_character_id = r.character_id
+            )
+        """)
+        if removed or cursor.rowcount:
+            print(f"Character relationships cleaned up: {removed} removed, {cursor.rowcount} reverse links added.")
+
     def get_setting(self, key, default=None):
         """Retrieve a setting from the database."""
         try:
@@ -123,6 +312,27 @@ class DatabaseManager:
             print(f"Error retrieving setting '{key}': {e}")
             return default
 
+    def get_all_settings(self):
+        """Retrieve every setting in one query, as a dict."""
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                return dict(connection.execute("SELECT key, value FROM settings"))
+        except sqlite3.Error as e:
+            print(f"Error retrieving settings: {e}")
+            return {}
+
+    def ensure_settings(self, defaults):
+        """Store defaults for any settings that are not set yet, in one transaction."""
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                connection.executemany("""
+                    INSERT INTO settings (key, value) VALUES (?, ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                    WHERE settings.value IS NULL OR settings.value = ''
+                """, list(defaults.items()))
+        except sqlite3.Error as e:
+            print(f"Error storing default settings: {e}")
+
     def set_setting(self, key, value):
         """Set or update a setting in the database."""
         try:
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from utils.card_metadata import PNGMetadataReader
+
+HASH_BITS = 64
+BANDS = 4  # Hashes within MAX_DISTANCE bits share at least one 16-bit band (pigeonhole), so only bucket mates are compared
+MAX_DISTANCE = BANDS - 1
+FLUSH_SIZE = 50
+
+
+def card_hash(metadata):
+    """Exact hash of a card's JSON payload, independent of key order and whitespace."""
+    payload = json.dumps(metadata, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def image_hash(img):
+    """
+    64-bit difference hash (dHash): compares neighbouring pixels of a 9x8 grayscale copy, so
+    re-encoded, resized or slightly edited copies of the same art hash to nearby values.
+    Returned as a signed integer to fit an SQLite INTEGER column.
+    """
+    small = img.convert("L").resize((9, 8), Image.Resampling.BOX)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def hash_distance(a, b):
+    return ((a ^ b) & ((1 << HASH_BITS) - 1)).bit_count()
+
+
+class DuplicateIndex:
+    """
+    Keeps characters.card_hash and characters.image_hash up to date and groups duplicate cards.
+    Image hashes are recorded as a side effect of thumbnail generation (note_image); update_hashes()
+    fills in whatever is still missing or stale.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._pending = []
+        self._lock = threading.Lock()
+
+    ########## Hashing ##########
+
+    def note_image(self, path, mtime_ns, img):
+        """Record the image hash of a card file that was just decoded (e.g. for its thumbnail)."""
+        try:
+            value = image_hash(img)
+        except Exception as e:
+            print(f"Error hashing image {path}: {e}")
+            return
+        with self._lock:
+            self._pending.append((value, mtime_ns, str(path)))
+            if len(self._pending) < FLUSH_SIZE:
+                return
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                connection.executemany(
+                    "UPDATE characters SET image_hash = ?, image_hash_mtime = ? WHERE main_file = ?", pending
+                )
+        except sqlite3.Error as e:
+            print(f"Error saving image hashes: {e}")
+
+    def update_hashes(self, job=None, max_workers=4):
+        """Hash every card whose file changed since it was last hashed. Returns the number of cards updated."""
+        self.flush()
+        with sqlite3.connect(self.db_path) as connection:
+            rows = connection.execute(
+                "SELECT id, main_file, card_hash_mtime, image_hash_mtime FROM characters WHERE main_file IS NOT NULL"
+            ).fetchall()
+
+        stale = []
+        for character_id, main_file, card_mtime, image_mtime in rows:
+            try:
+                mtime_ns = os.stat(main_file).st_mtime_ns
+            except OSError:
+                continue
+            if card_mtime != mtime_ns or image_mtime != mtime_ns:
+                stale.append((character_id, main_file, mtime_ns, card_mtime != mtime_ns, image_mtime != mtime_ns))
+
+        if job:
+            job.report(done=0, total=len(stale), message="Hashing cards...")
+        updates = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="card_hash") as executor:
+            for result in executor.map(self._hash_card, stale):
+                updates.append(result)
+                if job:
+                    job.check()
+                    job.report(advance=1)
+
+        with sqlite3.connect(self.db_path) as connection:
+            connection.executemany("""
+                UPDATE characters
+                SET card_hash = COALESCE(?, card_hash), card_hash_mtime = COALESCE(?, card_hash_mtime),
+                    image_hash = COALESCE(?, image_hash), image_hash_mtime = COALESCE(?, image_hash_mtime)
+                WHERE id = ?
+            """, updates)
+        return len(updates)
+
+    @staticmethod
+    def _hash_card(item):
+        character_id, main_file, mtime_ns, need_card, need_image = item
+        card_value = image_value = None
+        if need_card:
+            try:
+                card_value = card_hash(PNGMetadataReader.extract_text_metadata(main_file))
+            except Exception:
+                card_value = ""  # Not a card; recorded so the file isn't parsed again until it changes
+        if need_image:
+            try:
+                with Image.open(main_file) as img:
+                    image_value = image_hash(img)
+            except Exception as e:
+                print(f"Error hashing image {main_file}: {e}")
+        return (
+            card_value, mtime_ns if card_value is not None else None,
+            image_value, mtime_ns if image_value is not None else None,
+            character_id,
+        )
+
+    ########## Grouping ##########
+
+    def find_duplicates(self, max_distance=MAX_DISTANCE):
+        """
+        Group characters that share a card payload or whose images are within max_distance bits.
+        Returns a list of groups (largest first); each group is a list of
+        {"id", "name", "main_file", "reason"} dicts.
+        """
+        max_distance = min(max_distance, MAX_DISTANCE)
+        with sqlite3.connect(self.db_path) as connection:
+            rows = connection.execute(
+                "SELECT id, name, main_file, card_hash, image_hash FROM characters"
+            ).fetchall()
+
+        parent = {}
+        reasons = {}
+
+        def find(node):
+            root = node
+            while parent.get(root, root) != root:
+                root = parent[root]
+            parent[node] = root
+            return root
+
+        def union(members, reason):
+            root = find(members[0])
+            for member in members:
+                reasons.setdefault(member, set()).add(reason)
+                other = find(member)
+                if other != root:
+                    parent[other] = root
+
+        # Identical card payloads and identical images: one bucket per hash
+        by_card = {}
+        by_image = {}
+        for character_id, _, _, card_value, image_value in rows:
+            if card_value:
+                by_card.setdefault(card_value, []).append(character_id)
+            if image_value is not None:
+                by_image.setdefault(image_value, []).append(character_id)
+        for members in by_card.values():
+            if len(members) > 1:
+                union(members, "same card data")
+        for members in by_image.values():
+            if len(members) > 1:
+                union(members, "same image")
+
+        # Similar images: bucket the distinct hashes by each 16-bit band and compare only within buckets
+        band_bits = HASH_BITS // BANDS
+        mask = (1 << band_bits) - 1
+        buckets = {}
+        for value in by_image:
+            for band in range(BANDS):
+                buckets.setdefault((band, (value >> (band * band_bits)) & mask), []).append(value)
+        for values in buckets.values():
+            for i, value_a in enumerate(values):
+                for value_b in values[i + 1:]:
+                    if hash_distance(value_a, value_b) <= max_distance:
+                        union(by_image[value_a] + by_image[value_b], "similar image")
+
+        groups = {}
+        details = {character_id: (name, main_file) for character_id, name, main_file, _, _ in rows}
+        for character_id in reasons:
+            groups.setdefault(find(character_id), []).append(character_id)
+
+        result = []
+        for members in groups.values():
+            members.sort()
+            result.append([
+                {
+                    "id": member,
+                    "name": details[member][0],
+                    "main_file": details[member][1],
+                    "reason": ", ".join(sorted(reasons[member])),
+                }
+                for member in members
+            ])
+        result.sort(key=lambda group: (-len(group), group[0]["name"].lower()))
+        return result
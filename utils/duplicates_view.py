@@ -0,0 +1,140 @@
+import os
+import weakref
+import customtkinter as ctk
+
+GROUPS_PER_PAGE = 20
+
+
+class DuplicatesView:
+    """
+    Lists groups of duplicate cards (same card data or near-identical images). Opening it hashes any
+    new or changed cards in the background, then groups the whole library from the indexed hash columns.
+    """
+
+    def __init__(self, parent, job_manager, duplicate_index, on_select):
+        self.parent = parent
+        self.job_manager = job_manager
+        self.duplicate_index = duplicate_index
+        self.on_select = on_select
+        self.modal = None
+        self.groups = []
+        self.page = 0
+
+    def open(self):
+        if not (self.modal and self.modal.winfo_exists()):
+            self._build()
+        else:
+            self.modal.focus_set()
+        self.scan()
+
+    def _build(self):
+        self.modal = ctk.CTkToplevel(self.parent)
+        self.modal.title("Find Duplicates")
+        self.modal.geometry("760x680")
+        self.modal.transient(self.parent)
+
+        top_frame = ctk.CTkFrame(self.modal, fg_color="transparent")
+        top_frame.pack(fill="x", padx=10, pady=(10, 0))
+        self.status_label = ctk.CTkLabel(top_frame, text="", anchor="w")
+        self.status_label.pack(side="left", fill="x", expand=True)
+        self.rescan_button = ctk.CTkButton(top_frame, text="Rescan", width=90, command=self.scan)
+        self.rescan_button.pack(side="right")
+
+        self.progress_bar = ctk.CTkProgressBar(self.modal)
+        self.progress_bar.pack(fill="x", padx=10, pady=5)
+        self.progress_bar.set(0)
+
+        self.list_frame = ctk.CTkScrollableFrame(self.modal)
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Pagination controls
+        nav_frame = ctk.CTkFrame(self.modal, fg_color="transparent")
+        nav_frame.pack(fill="x", padx=10, pady=(0, 10))
+        self.prev_button = ctk.CTkButton(nav_frame, text="Previous", width=90, command=lambda: self.show_page(self.page - 1))
+        self.prev_button.pack(side="left")
+        self.page_label = ctk.CTkLabel(nav_frame, text="")
+        self.page_label.pack(side="left", expand=True)
+        self.next_button = ctk.CTkButton(nav_frame, text="Next", width=90, command=lambda: self.show_page(self.page + 1))
+        self.next_button.pack(side="right")
+
+    def scan(self):
+        """Hash new or changed cards, then group duplicates, as one background job."""
+        self.status_label.configure(text="Checking cards...")
+        self.rescan_button.configure(state="disabled")
+
+        def run(job):
+            self.duplicate_index.update_hashes(job)
+            job.report(message="Grouping duplicates...")
+            return self.duplicate_index.find_duplicates()
+
+        def on_progress(progress):
+            if self.modal and self.modal.winfo_exists() and progress["total"]:
+                self.progress_bar.set(progress["done"] / progress["total"])
+                self.status_label.configure(text=f"Hashing cards {progress['done']}/{progress['total']}...")
+
+        def on_done(job):
+            if not (self.modal and self.modal.winfo_exists()):
+                return
+            self.rescan_button.configure(state="normal")
+            self.progress_bar.set(1)
+            self.groups = job.result
+            duplicates = sum(len(group) - 1 for group in self.groups)
+            self.status_label.configure(
+                text=f"{len(self.groups)} groups, {duplicates} possible duplicates." if self.groups else "No duplicates found."
+            )
+            self.show_page(0)
+
+        def on_stopped(job):
+            if self.modal and self.modal.winfo_exists():
+                self.rescan_button.configure(state="normal")
+                self.status_label.configure(
+                    text=f"Error finding duplicates: {job.error}" if job.status == "failed" else "Scan canceled."
+                )
+
+        self.job_manager.submit(
+            "duplicate_scan", run, on_progress=on_progress, on_done=on_done, on_error=on_stopped, on_cancel=on_stopped
+        )
+
+    def show_page(self, page):
+        total_pages = max(1, (len(self.groups) + GROUPS_PER_PAGE - 1) // GROUPS_PER_PAGE)
+        self.page = max(0, min(page, total_pages - 1))
+        self.page_label.configure(text=f"Page {self.page + 1} of {total_pages}")
+        self.prev_button.configure(state="normal" if self.page > 0 else "disabled")
+        self.next_button.configure(state="normal" if self.page < total_pages - 1 else "disabled")
+
+        for widget in self.list_frame.winfo_children():
+            widget.destroy()
+
+        start = self.page * GROUPS_PER_PAGE
+        for number, group in enumerate(self.groups[start:start + GROUPS_PER_PAGE], start=start + 1):
+            group_frame = ctk.CTkFrame(self.list_frame)
+            group_frame.pack(fill="x", padx=5, pady=5)
+            ctk.CTkLabel(
+                group_frame, text=f"Group {number} ({len(group)} cards)", font=ctk.CTkFont(size=13, weight="bold")
+            ).pack(anchor="w", padx=8, pady=(5, 0))
+            for member in group:
+                self._add_member_row(group_frame, member)
+
+        self.list_frame._parent_canvas.yview_moveto(0)
+
+    def _add_member_row(self, master, member):
+        row = ctk.CTkFrame(master, fg_color="transparent")
+        row.pack(fill="x", padx=5, pady=2)
+
+        # Thumbnails load in the background behind a placeholder
+        thumbnail_label = ctk.CTkLabel(row, text="", image=self.parent.placeholder_thumbnail((50, 75)))
+        thumbnail_label.pack(side="left", padx=5)
+        if member["main_file"]:
+            self.parent.create_thumbnail(
+                member["main_file"],
+                callback=lambda label, thumbnail: label.configure(image=thumbnail),
+                widget_ref=weakref.ref(thumbnail_label),
+            )
+
+        file_name = os.path.basename(member["main_file"] or "")
+        ctk.CTkLabel(
+            row, text=f"{member['name']}\n{file_name} - {member['reason']}", anchor="w", justify="left"
+        ).pack(side="left", fill="x", expand=True, padx=5)
+        ctk.CTkButton(
+            row, text="Open", width=70, command=lambda character_id=member["id"]: self.on_select(character_id)
+        ).pack(side="right", padx=5)
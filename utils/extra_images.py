@@ -2,9 +2,12 @@
 from pathlib import Path
 import sqlite3
 import shutil
+import weakref
 from datetime import datetime
 import customtkinter as ctk
 from PIL import Image
+from utils.blob_store import blob_store
+from utils.image_ingest import ingested_image, thumbnail_source
 
 
 class ExtraImagesManager:
@@ -24,11 +27,17 @@ class ExtraImagesManager:
         for widget in extra_images_frame.winfo_children():
             widget.destroy()
 
-        # Fetch images from the database
+        # Fetch the images together with the character's name (for its folder) in one query
         connection = sqlite3.connect(self.db_path)
         cursor = connection.cursor()
         cursor.execute(
-            "SELECT id, image_name, image_note, created_date, last_modified_date FROM character_images WHERE character_id = ?",
+            """
+            SELECT c.name, ci.id, ci.image_name, ci.image_note, ci.created_date, ci.last_modified_date, ci.content_hash
+            FROM character_images ci
+            JOIN characters c ON c.id = ci.character_id
+            WHERE ci.character_id = ?
+            ORDER BY ci.id
+            """,
             (selected_character_id,)
         )
         images = cursor.fetchall()
@@ -38,21 +47,23 @@ class ExtraImagesManager:
             # print("No extra images found for the selected character.")
             return
 
-        for img_id, image_name, image_note, created_date, last_modified_date in images:
+        character_folder = Path("CharacterCards") / images[0][0] / "ExtraImages"
+        placeholder_thumbnail = self.master.placeholder_thumbnail((50, 75))
+
+        for _, img_id, image_name, image_note, created_date, last_modified_date, content_hash in images:
             frame = ctk.CTkFrame(extra_images_frame)
             frame.pack(fill="x", padx=5, pady=5)
             frame.grid_columnconfigure(0, weight=0)  # Image column
             frame.grid_columnconfigure(1, weight=1)  # Text and buttons column
-            # Create thumbnail
-
-            character_folder = Path("CharacterCards") / self.get_character_name() / "ExtraImages"
-            image_path = character_folder / f"{image_name}.png"
-            thumbnail = create_thumbnail(image_path)
 
-            # Thumbnail Label
-            thumbnail_label = ctk.CTkLabel(frame, image=thumbnail, text="")
-            thumbnail_label.image = thumbnail  # Prevent garbage collection
+            # Thumbnail Label (placeholder until the cached or decoded thumbnail arrives)
+            thumbnail_label = ctk.CTkLabel(frame, image=placeholder_thumbnail, text="")
             thumbnail_label.grid(row=0, column=0, rowspan=3, padx=5, pady=(5, 0), sticky="n")
+            create_thumbnail(
+                thumbnail_source(content_hash, character_folder / f"{image_name}.png"),
+                callback=lambda widget, thumbnail: widget.configure(image=thumbnail),
+                widget_ref=weakref.ref(thumbnail_label),
+            )
 
             # Image Name
             name_label = ctk.CTkLabel(frame, text=image_name, anchor="w", font=ctk.CTkFont(size=12, weight="bold"))
@@ -107,8 +118,8 @@ class ExtraImagesManager:
 
 
     def save_image(self, selected_character_id, image_path_entry, image_name_entry, image_notes_textbox, extra_images_frame, create_thumbnail, modal_window):
-        """Save the image to the character folder and database."""
-        file_path = Path(image_path_entry.get())
+        """Validate the form, then ingest the image and save it to the database in the background."""
+        file_path = image_path_entry.get().strip()
         image_name = image_name_entry.get().strip()
         image_note = image_notes_textbox.get("1.0", "end").strip()
 
@@ -137,48 +148,56 @@ class ExtraImagesManager:
                 connection.close()
                 return
 
-            # Get the character's folder
+            # Make sure the character still exists
             cursor.execute("SELECT name FROM characters WHERE id = ?", (selected_character_id,))
             result = cursor.fetchone()
             connection.close()
 
             if not result:
-                self.show_message("Character folder not found.", "error")
+                self.show_message("Character not found.", "error")
                 return
+        except Exception as e:
+            self.show_message(f"Failed to add image: {str(e)}", "error")
+            return
 
-            character_name = result[0]
-            character_folder = Path("CharacterCards") / character_name / "ExtraImages"
-            character_folder.mkdir(parents=True, exist_ok=True)
-
-            # Copy the image to the folder
-            image_path = character_folder / f"{image_name}.png"  # Assuming PNG format for simplicity
-            shutil.copy(file_path, image_path)
-
-            # Save metadata to the database
-            created_date = last_modified_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            connection = sqlite3.connect(self.db_path)
-            cursor = connection.cursor()
-            cursor.execute(
-                """
-                INSERT INTO character_images (image_name, image_note, created_date, last_modified_date, character_id)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (image_name, image_note, created_date, last_modified_date, selected_character_id)
-            )
-            connection.commit()
-            connection.close()
-
-            # Immediately update the extra images UI
-            self.load_extra_images(selected_character_id, extra_images_frame, create_thumbnail)
-
-            # Show success message
+        def run(job):
+            # Detect the format, cap the size, store the blob and pre-render its thumbnail
+            job.report(message="Processing image")
+            with ingested_image(file_path, self.db_path) as image:
+                created_date = last_modified_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                with sqlite3.connect(self.db_path) as connection:
+                    connection.execute(
+                        """
+                        INSERT INTO character_images (
+                            image_name, image_note, created_date, last_modified_date, character_id,
+                            content_hash, image_format, width, height
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            image_name, image_note, created_date, last_modified_date, selected_character_id,
+                            image["content_hash"], image["format"], image["width"], image["height"],
+                        )
+                    )
+
+        def on_done(job):
+            # Immediately update the extra images UI if the character is still shown
+            if getattr(self.master, "selected_character_id", None) == selected_character_id:
+                self.load_extra_images(selected_character_id, extra_images_frame, create_thumbnail)
             self.show_message("Image added successfully.", "success")
+            if modal_window.winfo_exists():
+                modal_window.destroy()
 
-            # Close the modal window
-            modal_window.destroy()
+        def on_error(job):
+            self.show_message(f"Failed to add image: {job.error}", "error")
 
-        except Exception as e:
-            self.show_message(f"Failed to add image: {str(e)}", "error")
+        # One job per character and image name (the name is unique per character), so adds never replace each other
+        job_name = f"extra_image_add:{selected_character_id}:{image_name}"
+        job = self.master.job_manager.submit(job_name, run, on_done=on_done, on_error=on_error)
+        if job.on_done is not on_done:
+            self.show_message(f"Image '{image_name}' is already being added.", "error")
+            return
+        self.show_message("Adding image...", "success")
 
 
     def _truncate_notes(self, image_note):
@@ -199,7 +218,7 @@ class ExtraImagesManager:
         cursor = connection.cursor()
         cursor.execute(
             """
-            SELECT image_name, image_note, created_date, last_modified_date
+            SELECT image_name, image_note, created_date, last_modified_date, content_hash
             FROM character_images WHERE id = ?
             """,
             (image_id,),
@@ -211,11 +230,11 @@ class ExtraImagesManager:
             self.show_message("Image not found.", "error")
             return
 
-        image_name, image_note, created_date, last_modified_date = result
+        image_name, image_note, created_date, last_modified_date, content_hash = result
 
         # Determine the image path
         character_folder = Path("CharacterCards") / self.get_character_name() / "ExtraImages"
-        image_path = character_folder / f"{image_name}.png"
+        image_path = blob_store.resolve(content_hash, character_folder / f"{image_name}.png")
         
         # Create a modal window
         self.edit_image_window = ctk.CTkToplevel(self.master)
@@ -294,7 +313,7 @@ class ExtraImagesManager:
             connection = sqlite3.connect(self.db_path)
             cursor = connection.cursor()
             cursor.execute(
-                "SELECT image_name, character_id FROM character_images WHERE id = ?",
+                "SELECT image_name, character_id, content_hash FROM character_images WHERE id = ?",
                 (image_id,)
             )
             result = cursor.fetchone()
@@ -304,7 +323,7 @@ class ExtraImagesManager:
                 connection.close()
                 return
 
-            original_image_name, character_id = result
+            original_image_name, character_id, content_hash = result
 
             # Fetch the character name
             cursor.execute("SELECT name FROM characters WHERE id = ?", (character_id,))
@@ -320,8 +339,8 @@ class ExtraImagesManager:
             original_file_path = character_folder / f"{original_image_name}.png"
             updated_file_path = character_folder / f"{updated_image_name}.png"
 
-            # Rename the file if the name has changed
-            if original_image_name != updated_image_name:
+            # Rename the file if the name has changed (blob files are named by content, not by image name)
+            if original_image_name != updated_image_name and not content_hash:
                 if original_file_path.exists():
                     original_file_path.rename(updated_file_path)
                     print(f"Renamed file: {original_file_path} -> {updated_file_path}")
@@ -376,7 +395,7 @@ class ExtraImagesManager:
             connection = sqlite3.connect(self.db_path)
             cursor = connection.cursor()
 
-            cursor.execute("SELECT image_name, character_id FROM character_images WHERE id = ?", (image_id,))
+            cursor.execute("SELECT image_name, character_id, content_hash FROM character_images WHERE id = ?", (image_id,))
             result = cursor.fetchone()
 
             if not result:
@@ -384,7 +403,7 @@ class ExtraImagesManager:
                 connection.close()
                 return
 
-            image_name, character_id = result
+            image_name, character_id, content_hash = result
 
             # Fetch the character name
             cursor.execute("SELECT name FROM characters WHERE id = ?", (character_id,))
@@ -399,17 +418,19 @@ class ExtraImagesManager:
             character_folder = Path("CharacterCards") / character_name / "ExtraImages"
             image_path = character_folder / f"{image_name}.png"
 
-            # Delete the image file
-            if image_path.exists():
-                image_path.unlink()
-                print(f"Deleted file: {image_path}")
-            else:
-                print(f"File not found: {image_path}")
+            # Delete the image file (blobs are released below, once no other image uses them)
+            if not content_hash:
+                if image_path.exists():
+                    image_path.unlink()
+                    print(f"Deleted file: {image_path}")
+                else:
+                    print(f"File not found: {image_path}")
 
             # Delete the database record
             cursor.execute("DELETE FROM character_images WHERE id = ?", (image_id,))
             connection.commit()
             connection.close()
+            blob_store.release(self.db_path, [content_hash])
 
             # Reload the extra images list
             self.load_extra_images(selected_character_id, extra_images_frame, create_thumbnail)
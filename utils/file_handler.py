@@ -1,5 +1,7 @@
 from pathlib import Path
+import os
 import shutil
+import tempfile
 
 class FileHandler:
     def __init__(self):
@@ -17,3 +19,27 @@ class FileHandler:
         # Copy file to character directory
         shutil.copy(file_path, character_dir / file_name)
         return f"Uploaded {file_name} to {character_dir}"
+
+    @staticmethod
+    def copy_file(source, target, job=None, chunk_size=1024 * 1024):
+        """
+        Copy source to target through a temp file beside it, checking job between chunks so a
+        canceled copy stops early. The target only appears once the copy is complete.
+        """
+        target = Path(target)
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.stem}.", suffix=".part")
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                while True:
+                    if job:
+                        job.check()
+                    chunk = src.read(chunk_size)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+            shutil.copymode(source, temp_path)
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
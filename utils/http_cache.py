@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class HTTPCache:
+    """
+    Local cache for downloaded responses. Entries are revalidated with conditional GETs
+    (ETag / Last-Modified) and bodies are stored once per SHA-256 content hash. Only the current
+    body of each URL is kept: a blob is deleted once no URL's entry refers to it any more.
+    """
+
+    def __init__(self, db_path, cache_dir=None):
+        self.db_path = db_path
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / "cache" / "http"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._storing = {}  # content hash -> fetches that stored it but have not saved their entry yet
+
+    def blob_path(self, content_hash):
+        return self.cache_dir / content_hash[:2] / content_hash
+
+    def get_entry(self, url):
+        """Return the cached entry for a URL, or None."""
+        with sqlite3.connect(self.db_path) as connection:
+            row = connection.execute(
+                "SELECT etag, last_modified, content_hash, content_type, fetched_date FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "content_hash": row[2],
+            "content_type": row[3],
+            "fetched_date": row[4],
+        }
+
+    def fetch(self, session, url, timeout=None, job=None):
+        """
+        GET a URL through the cache. Returns a dict with the body's content_hash and blob path,
+        whether the body changed since the last fetch, and whether it was served from cache (304).
+        A job is checked between chunks of the body.
+        """
+        entry = self.get_entry(url)
+        headers = {}
+        if entry and self.blob_path(entry["content_hash"]).exists():
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=headers, stream=True, timeout=timeout)
+        try:
+            if response.status_code == 304 and headers:
+                self._touch(url)
+                return {
+                    "url": url,
+                    "changed": False,
+                    "from_cache": True,
+                    "content_hash": entry["content_hash"],
+                    "path": self.blob_path(entry["content_hash"]),
+                }
+            if response.status_code != 200:
+                raise ValueError(f"Request failed: {response.status_code} - {response.reason}")
+
+            content_hash, path = self.store_chunks(response.iter_content(chunk_size=65536), job)
+        finally:
+            response.close()
+
+        try:
+            self._save_entry(
+                url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                content_hash,
+                response.headers.get("Content-Type"),
+            )
+        finally:
+            with self._lock:
+                self._release(content_hash)
+                if entry and entry["content_hash"] != content_hash:
+                    # The URL's previous body was superseded
+                    self._discard_blob(entry["content_hash"])
+        return {
+            "url": url,
+            "changed": not entry or entry["content_hash"] != content_hash,
+            "from_cache": False,
+            "content_hash": content_hash,
+            "path": path,
+        }
+
+    def store_chunks(self, chunks, job=None):
+        """Write chunks to a temp file while hashing, then keep one blob per content hash."""
+        hasher = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if job:
+                        job.check()
+                    if chunk:
+                        hasher.update(chunk)
+                        f.write(chunk)
+
+            content_hash = hasher.hexdigest()
+            path = self.blob_path(content_hash)
+            with self._lock:
+                # Held until fetch() saves the entry, so a concurrent eviction cannot delete it meanwhile
+                self._storing[content_hash] = self._storing.get(content_hash, 0) + 1
+                if path.exists():
+                    os.remove(temp_path)  # Same bytes already cached
+                else:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(temp_path, path)
+            return content_hash, path
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def prune(self):
+        """Delete cached bodies that no entry refers to (left over from earlier versions). Returns the count."""
+        removed = 0
+        with self._lock:
+            with sqlite3.connect(self.db_path) as connection:
+                in_use = {row[0] for row in connection.execute("SELECT DISTINCT content_hash FROM http_cache")}
+            for path in self.cache_dir.glob("??/*"):
+                if path.name not in in_use and path.name not in self._storing:
+                    try:
+                        path.unlink()
+                        removed += 1
+                    except OSError as e:
+                        print(f"Error removing cached response {path.name}: {e}")
+        return removed
+
+    @staticmethod
+    def read_json(result):
+        with open(result["path"], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_entry(self, url, etag, last_modified, content_hash, content_type):
+        with sqlite3.connect(self.db_path) as connection:
+            connection.execute("""
+                INSERT INTO http_cache (url, etag, last_modified, content_hash, content_type, fetched_date)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    content_type = excluded.content_type,
+                    fetched_date = excluded.fetched_date
+            """, (url, etag, last_modified, content_hash, content_type, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+    def _release(self, content_hash):
+        count = self._storing.get(content_hash, 0) - 1
+        if count > 0:
+            self._storing[content_hash] = count
+        else:
+            self._storing.pop(content_hash, None)
+
+    def _discard_blob(self, content_hash):
+        """Delete a blob that no entry refers to any more. Called with the lock held."""
+        if content_hash in self._storing:
+            return
+        with sqlite3.connect(self.db_path) as connection:
+            in_use = connection.execute(
+                "SELECT 1 FROM http_cache WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+        if not in_use:
+            try:
+                self.blob_path(content_hash).unlink(missing_ok=True)
+            except OSError as e:
+                print(f"Error removing cached response {content_hash}: {e}")
+
+    def _touch(self, url):
+        with sqlite3.connect(self.db_path) as connection:
+            connection.execute(
+                "UPDATE http_cache SET fetched_date = ? WHERE url = ?",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), url),
+            )
@@ -0,0 +1,131 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from PIL import Image
+from utils.blob_store import blob_store
+
+MAX_DIMENSION = 4096  # Longer side above this is scaled down on add; None keeps originals untouched
+THUMBNAIL_SIZE = (50, 75)
+THUMBNAIL_SUFFIX = ".thumb.png"
+
+# Formats kept as-is when transcoding; everything else is re-encoded as PNG
+KEEP_FORMATS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp"}
+
+
+def crop_thumbnail(img, size=THUMBNAIL_SIZE):
+    """Center-crop an image to the thumbnail aspect ratio and resize it."""
+    target_aspect_ratio = size[0] / size[1]
+    img_width, img_height = img.size
+    img_aspect_ratio = img_width / img_height
+
+    if img_aspect_ratio > target_aspect_ratio:
+        # Image is wider than target aspect ratio
+        new_width = int(img_height * target_aspect_ratio)
+        offset = (img_width - new_width) // 2
+        img = img.crop((offset, 0, offset + new_width, img_height))
+    elif img_aspect_ratio < target_aspect_ratio:
+        # Image is taller than target aspect ratio
+        new_height = int(img_width / target_aspect_ratio)
+        offset = (img_height - new_height) // 2
+        img = img.crop((0, offset, img_width, offset + new_height))
+
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+
+def ingest_image(file_path, max_dimension=MAX_DIMENSION):
+    """
+    Detect the real format of an image, scale it down if its longer side exceeds max_dimension,
+    store it in the blob store and write its thumbnail next to the blob.
+    Returns {"content_hash", "format", "width", "height"}. Raises ValueError for non-images.
+    The blob stays pinned in the blob store; use ingested_image to add a row for it.
+    """
+    try:
+        with Image.open(file_path) as img:
+            img.verify()  # Catch truncated or mislabeled files before storing anything
+        img = Image.open(file_path)
+    except (OSError, SyntaxError) as e:
+        raise ValueError(f"Not a supported image file: {e}")
+
+    with img:
+        image_format = img.format or "PNG"
+        width, height = img.size
+
+        if max_dimension and max(width, height) > max_dimension:
+            content_hash, width, height = _store_scaled(img, image_format, max_dimension)
+            if image_format not in KEEP_FORMATS:
+                image_format = "PNG"
+        else:
+            content_hash = blob_store.put(file_path)
+
+        try:
+            thumbnail_path = thumbnail_file(content_hash)
+            if not thumbnail_path.exists():
+                img.seek(0)  # First frame of animated images
+                _write_thumbnail(img, thumbnail_path)
+        except BaseException:
+            blob_store.unpin(content_hash)
+            raise
+
+    return {"content_hash": content_hash, "format": image_format, "width": width, "height": height}
+
+
+@contextmanager
+def ingested_image(file_path, db_path, max_dimension=MAX_DIMENSION):
+    """
+    ingest_image for adding an image row: commit the row inside the block. The blob stays pinned
+    until the block ends, so a delete of another row with the same image can't remove it meanwhile;
+    if the block fails (e.g. the INSERT), the blob and its thumbnail are released again.
+    """
+    image = ingest_image(file_path, max_dimension)
+    try:
+        yield image
+    except BaseException:
+        blob_store.unpin(image["content_hash"])
+        blob_store.release(db_path, [image["content_hash"]])
+        raise
+    else:
+        blob_store.unpin(image["content_hash"])
+
+
+def _store_scaled(img, image_format, max_dimension):
+    scaled = img.convert("RGBA" if img.mode in ("P", "LA", "RGBA") else "RGB")
+    scaled.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    if image_format == "JPEG":
+        scaled = scaled.convert("RGB")
+
+    suffix = KEEP_FORMATS.get(image_format, ".png")
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        save_options = {"quality": 92} if image_format in ("JPEG", "WEBP") else {"optimize": True}
+        scaled.save(temp_path, format=image_format if image_format in KEEP_FORMATS else "PNG", **save_options)
+        return blob_store.put(temp_path), scaled.width, scaled.height
+    finally:
+        os.remove(temp_path)
+
+
+def _write_thumbnail(img, thumbnail_path):
+    thumbnail = crop_thumbnail(img.convert("RGBA"))
+    # A unique temp name: concurrent adds of the same image write the same thumbnail
+    fd, temp_path = tempfile.mkstemp(dir=thumbnail_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        thumbnail.save(temp_path, format="PNG")
+        os.replace(temp_path, thumbnail_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def thumbnail_file(content_hash):
+    return blob_store.path(content_hash).with_name(content_hash + THUMBNAIL_SUFFIX)
+
+
+def thumbnail_source(content_hash, original_path):
+    """What gallery views should decode: the precomputed thumbnail when there is one, else the original."""
+    if content_hash:
+        thumbnail_path = thumbnail_file(content_hash)
+        if thumbnail_path.exists():
+            return thumbnail_path
+    return blob_store.resolve(content_hash, original_path)
@@ -1,201 +1,499 @@
-from pathlib import Path
+import os
+import queue
 import shutil
-from PIL import Image, ImageTk
-import customtkinter as ctk
-from tkinter import messagebox
+import sqlite3
 import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import customtkinter as ctk
+from tkinter.filedialog import askopenfilenames, askdirectory
+from utils.card_metadata import PNGMetadataReader
+from utils.duplicates import card_hash
+from utils.st_tag_manager_edit_panel import SillyTavernTagManager
+
+VISIBLE_ROWS = 7  # Row widgets are reused while scrolling, so the list costs the same for 20 or 2,000 cards
+PARSE_WORKERS = min(8, (os.cpu_count() or 2) * 2)
+UNWANTED_NOTES = (
+    "This card was uploaded to https://aicharactercards.com, "
+    "please come back and rate the card if you enjoy it to help other users find the card."
+)
+
+
+def card_fields(metadata, fallback_name):
+    """Name, notes and tags for a card, cleaned up the same way the SillyTavern sync does."""
+    fields = PNGMetadataReader.get_highest_spec_fields(metadata)
+    name = (fields.get("name") or "").strip() or fallback_name
+    notes = (fields.get("creator_notes") or "").strip()
+    if UNWANTED_NOTES in notes:
+        notes = notes.replace(UNWANTED_NOTES, "").strip()
+    if not notes:
+        # Fall back to the start of the description, cut at a sentence end
+        words = (fields.get("description") or "").split()
+        notes = " ".join(words[:100])
+        if len(words) > 100 and "." in notes:
+            notes = notes[:notes.rfind(".") + 1]
+    tags = [tag.strip().lower() for tag in fields.get("tags") or [] if isinstance(tag, str) and tag.strip()]
+    return name, notes, tags
 
 
 class ImportModal:
+    """
+    Bulk import of character cards from many files or a whole folder.
+    Card metadata is parsed in a worker pool and fills in a recycled-row list as it arrives;
+    the selected cards are then copied into SillyTavern and added in a single transaction.
+    """
+
     def __init__(self, parent, db_manager, sillytavern_path, refresh_callback):
         self.parent = parent
         self.db_manager = db_manager
         self.sillytavern_path = Path(sillytavern_path)
         self.refresh_callback = refresh_callback
+        self.job_manager = parent.job_manager
         self.modal = None
-        self.checkbuttons = {}
-        self.toggle_state = True
-        self.character_count = 0
-        self.selected_count = 0
+        self.cards = []  # One dict per card file; rows only ever display a window of these
+        self.known_paths = set()
+        self.pending_paths = []
+        self.pending_lock = threading.Lock()
+        self.results = queue.Queue()
+        self.offset = 0
+        self.rows = []
+        self.thumbnail_after_id = None
+
+    def open(self, paths=None):
+        if self.modal and self.modal.winfo_exists():
+            self.modal.focus_set()
+            if paths:
+                self.add_paths(paths)
+            return
 
+        self.cards = []
+        self.known_paths = set()
+        self.results = queue.Queue()
+        self.offset = 0
 
-    def open(self):
         # Create the modal window
         self.modal = ctk.CTkToplevel(self.parent)
-        self.modal.title("Import Characters")
-        self.modal.geometry("700x700")  # Adjusted for layout changes
-
-        # Ensure the modal stays on top of the main window
+        self.modal.title("Bulk Import Characters")
+        self.modal.geometry("720x760")
         self.modal.transient(self.parent)
         self.modal.grab_set()
-
-        # Loading label
-        self.loading_label = ctk.CTkLabel(
-            self.modal,
-            text="Loading Characters, please wait...\nIf you have a lot of character cards, this may take a second.",
-            font=ctk.CTkFont(size=14, weight="bold"),
-            anchor="center",
-        )
-        self.loading_label.pack(pady=20, padx=10)
-
-        # Create a scrollable frame for character list
-        self.scrollable_frame = ctk.CTkScrollableFrame(self.modal, width=680, height=580)
-        self.scrollable_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        self.modal.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Source buttons
+        source_frame = ctk.CTkFrame(self.modal, fg_color="transparent")
+        source_frame.pack(pady=(10, 0), padx=10, fill="x")
+        ctk.CTkButton(source_frame, text="Add Files...", command=self.browse_files, width=120).pack(side="left", padx=5)
+        ctk.CTkButton(source_frame, text="Add Folder...", command=self.browse_folder, width=120).pack(side="left", padx=5)
+        self.status_label = ctk.CTkLabel(source_frame, text="Add card PNGs or a folder of cards.", anchor="w")
+        self.status_label.pack(side="left", padx=10, fill="x", expand=True)
+
+        # Recycled rows with a scrollbar that pages through self.cards
+        list_frame = ctk.CTkFrame(self.modal)
+        list_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(list_frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        rows_frame = ctk.CTkFrame(list_frame, fg_color="transparent")
+        rows_frame.pack(side="left", fill="both", expand=True)
+        self.rows = [self.create_row(rows_frame) for _ in range(VISIBLE_ROWS)]
+
+        for widget in (self.modal, rows_frame):
+            widget.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1))
+            widget.bind("<Button-4>", lambda event: self.scroll_by(-1))
+            widget.bind("<Button-5>", lambda event: self.scroll_by(1))
+
+        self.progress_bar = ctk.CTkProgressBar(self.modal)
+        self.progress_bar.pack(fill="x", padx=10)
+        self.progress_bar.set(0)
 
         # Button frame for Check All/Uncheck All, Import, and Cancel
         button_frame = ctk.CTkFrame(self.modal)
         button_frame.pack(pady=10, padx=10, fill="x")
 
-        # Check All/Uncheck All Button
-        self.toggle_button = ctk.CTkButton(
-            button_frame,
-            text="Uncheck All",
-            command=self.toggle_checkboxes,
-            width=100,
-        )
+        self.toggle_state = True
+        self.toggle_button = ctk.CTkButton(button_frame, text="Uncheck All", command=self.toggle_checkboxes, width=100)
         self.toggle_button.pack(side="left", padx=5, pady=5)
 
-        # Character Count Label
-        self.count_label = ctk.CTkLabel(
-            button_frame,
-            text="0/0",
-            font=ctk.CTkFont(size=12, weight="bold"),
-        )
+        self.count_label = ctk.CTkLabel(button_frame, text="0/0", font=ctk.CTkFont(size=12, weight="bold"))
         self.count_label.pack(side="left", padx=5)
 
-        # Import Button
-        import_button = ctk.CTkButton(
-            button_frame,
-            text="Import",
-            command=self.import_characters,
-            width=100,
-        )
-        import_button.pack(side="right", padx=5, pady=5)
-
-        # Cancel Button
-        cancel_button = ctk.CTkButton(
-            button_frame,
-            text="Cancel",
-            command=self.modal.destroy,
-            width=100,
-        )
-        cancel_button.pack(side="right", padx=5, pady=5)
-
-        # Start loading characters in a separate thread
-        threading.Thread(target=self.load_characters, daemon=True).start()
+        self.import_button = ctk.CTkButton(button_frame, text="Import", command=self.import_characters, width=100)
+        self.import_button.pack(side="right", padx=5, pady=5)
 
-    def load_characters(self):
-        """Load all character thumbnails and widgets, then update the GUI."""
-        characters_path = self.sillytavern_path / "characters"
-        if not characters_path.exists():
-            messagebox.showerror("Error", f"Path not found: {characters_path}")
-            self.modal.destroy()
-            return
+        ctk.CTkButton(button_frame, text="Cancel", command=self.close, width=100).pack(side="right", padx=5, pady=5)
 
-        png_files = list(characters_path.glob("*.png"))
-        self.character_count = len(png_files)
-        self.selected_count = self.character_count
+        self.render_rows()
+        self.poll_results()
+        if paths:
+            self.add_paths(paths)
 
-        if not png_files:
-            messagebox.showinfo("No Characters", "No PNG files found in the specified folder.")
+    def close(self):
+        self.job_manager.cancel("character_bulk_parse")
+        self.job_manager.cancel("character_bulk_import")
+        if self.modal and self.modal.winfo_exists():
             self.modal.destroy()
-            return
-
-        widgets = [self.create_character_widget(png_file) for png_file in png_files]
-        self.modal.after(0, lambda: self.add_widgets_to_frame(widgets))
 
-        # Add all widgets to the GUI at once
-        self.modal.after(0, lambda: self.add_widgets_to_frame(widgets))
-
-    def create_character_widget(self, png_file):
-            frame = ctk.CTkFrame(self.scrollable_frame)
-
-            checkbox_var = ctk.BooleanVar(value=True)
-            checkbox = ctk.CTkCheckBox(
-                frame, text="", variable=checkbox_var, width=20, command=lambda: self.update_count(checkbox_var.get())
-            )
-            checkbox.grid(row=0, column=0, padx=5, pady=5, sticky="w")
-            self.checkbuttons[png_file] = {"checked": checkbox_var}
-
-            character_name = png_file.stem
-            entry = ctk.CTkEntry(frame, placeholder_text="Enter character name", width=350)
-            entry.insert(0, character_name)
-            entry.grid(row=0, column=1, padx=5, pady=5, sticky="we")
-            self.checkbuttons[png_file]["entry"] = entry
+    ########## Sources ##########
+
+    def browse_files(self):
+        paths = askopenfilenames(parent=self.modal, filetypes=[("Character Cards", "*.png")])
+        if paths:
+            self.add_paths(paths)
+
+    def browse_folder(self):
+        folder = askdirectory(parent=self.modal)
+        if folder:
+            self.add_paths([folder])
+
+    def add_paths(self, paths):
+        """Queue card files (folders are searched recursively) and start parsing them in the background."""
+        new_cards = []
+        for path in self.expand_paths(paths):
+            key = os.path.normcase(str(path))
+            if key in self.known_paths:
+                continue
+            self.known_paths.add(key)
+            new_cards.append({
+                "path": path,
+                "name": path.stem,
+                "notes": "",
+                "tags": [],
+                "checked": True,
+                "status": "Reading...",
+                "name_edited": False,
+            })
+        if not new_cards:
+            self.status_label.configure(text="No new PNG files found.")
+            return
 
-            thumbnail = self.create_thumbnail(png_file)
-            thumbnail_label = ctk.CTkLabel(frame, image=thumbnail, text="")
-            thumbnail_label.image = thumbnail
-            thumbnail_label.grid(row=0, column=2, padx=5, pady=5, sticky="e")
+        first_index = len(self.cards)
+        self.cards.extend(new_cards)
+        with self.pending_lock:
+            self.pending_paths.extend((first_index + i, card["path"]) for i, card in enumerate(new_cards))
+        self.start_parse_job()
+        self.render_rows()
+
+    @staticmethod
+    def expand_paths(paths):
+        files = []
+        for path in map(Path, paths):
+            if path.is_dir():
+                for root, _, names in os.walk(path):
+                    files.extend(Path(root) / name for name in sorted(names) if name.lower().endswith(".png"))
+            elif path.suffix.lower() == ".png" and path.is_file():
+                files.append(path)
+        return [file.resolve() for file in files]
+
+    ########## Parsing ##########
+
+    def start_parse_job(self):
+        def run(job):
+            with sqlite3.connect(self.db_manager.db_path) as connection:
+                existing_files = set()
+                seen_hashes = {}
+                for main_file, existing_hash in connection.execute("SELECT main_file, card_hash FROM characters"):
+                    if main_file:
+                        existing_files.add(os.path.normcase(os.path.abspath(main_file)))
+                    if existing_hash:
+                        seen_hashes[existing_hash] = "Same card is already in vault"
+
+            # Keep going until no more files were queued while this batch was parsing
+            while True:
+                with self.pending_lock:
+                    batch, self.pending_paths = self.pending_paths, []
+                if not batch:
+                    return
+                job.report(total=job.total + len(batch))
+                with ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="card_parse") as executor:
+                    futures = {executor.submit(self.parse_card, path): (index, path) for index, path in batch}
+                    for future in as_completed(futures):
+                        if job.is_cancelled:
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            job.check()
+                        index, source = futures[future]
+                        fields = future.result()
+                        # Cards already in the vault (or earlier in this import) are listed but not selected
+                        if os.path.normcase(str(source)) in existing_files:
+                            fields["status"] = "Already in vault"
+                            fields["checked"] = False
+                        elif fields.get("card_hash") in seen_hashes:
+                            fields["status"] = seen_hashes[fields["card_hash"]]
+                            fields["checked"] = False
+                        elif fields.get("card_hash"):
+                            seen_hashes[fields["card_hash"]] = f"Same card as {source.name}"
+                        self.results.put((index, source, fields))
+                        job.report(advance=1, message=source.name)
+
+        def on_done(job):
+            # Files added just as the previous job was finishing
+            if self.pending_paths and self.modal and self.modal.winfo_exists():
+                self.start_parse_job()
+
+        self.job_manager.submit(
+            "character_bulk_parse", run, on_progress=self.on_parse_progress, on_done=on_done,
+            on_error=lambda job: self.show_status(f"Failed to read cards: {job.error}"),
+        )
 
-            frame.grid_columnconfigure(1, weight=1)
+    @staticmethod
+    def parse_card(path):
+        try:
+            metadata = PNGMetadataReader.extract_text_metadata(path)
+            name, notes, tags = card_fields(metadata, path.stem)
+            return {"name": name, "notes": notes, "tags": tags, "card_hash": card_hash(metadata), "status": "Ready"}
+        except Exception as e:
+            # Plain PNGs can still be imported under their file name
+            print(f"Error reading metadata for {path}: {e}")
+            return {"status": "No card data"}
+
+    def on_parse_progress(self, progress):
+        if self.modal and self.modal.winfo_exists() and progress["total"]:
+            self.progress_bar.set(progress["done"] / progress["total"])
+            self.show_status(f"Read {progress['done']}/{progress['total']} cards")
+
+    def poll_results(self):
+        """Apply parsed card data on the UI thread, redrawing only if a visible row changed."""
+        if not (self.modal and self.modal.winfo_exists()):
+            return
+        visible_changed = False
+        try:
+            while True:
+                index, source, fields = self.results.get_nowait()
+                if index >= len(self.cards) or self.cards[index]["path"] != source:
+                    continue  # Left over from a parse started before the modal was reopened
+                card = self.cards[index]
+                if card["name_edited"]:
+                    fields.pop("name", None)
+                card.update(fields)
+                visible_changed |= self.offset <= index < self.offset + VISIBLE_ROWS
+        except queue.Empty:
+            pass
+        if visible_changed:
+            self.render_rows(load_thumbnails=False)
+        self.update_count_label()
+        self.modal.after(100, self.poll_results)
 
-            return frame
+    ########## Rows ##########
 
-    def add_widgets_to_frame(self, widgets):
-        for widget in widgets:
-            widget.pack(fill="x", padx=5, pady=5)
-        self.update_count_label()
-        self.loading_label.destroy()
+    def create_row(self, master):
+        frame = ctk.CTkFrame(master, height=85)
+        frame.pack(fill="x", padx=5, pady=3)
+        frame.pack_propagate(False)
+        row = {"frame": frame, "index": None, "thumbnail_path": None}
 
-    def update_count(self, is_checked):
-        self.selected_count += 1 if is_checked else -1
-        self.update_count_label()
+        row["checked"] = ctk.BooleanVar(value=True)
+        row["checkbox"] = ctk.CTkCheckBox(
+            frame, text="", variable=row["checked"], width=20, command=lambda: self.on_row_checked(row)
+        )
+        row["checkbox"].pack(side="left", padx=5)
+
+        row["thumbnail"] = ctk.CTkLabel(frame, text="", image=self.parent.placeholder_thumbnail((50, 75)))
+        row["thumbnail"].pack(side="left", padx=5)
+
+        text_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        text_frame.pack(side="left", fill="both", expand=True, padx=5)
+        row["entry"] = ctk.CTkEntry(text_frame, placeholder_text="Enter character name")
+        row["entry"].pack(fill="x", pady=(12, 2))
+        row["entry"].bind("<KeyRelease>", lambda event: self.on_row_renamed(row))
+        row["status"] = ctk.CTkLabel(text_frame, text="", anchor="w", text_color="gray")
+        row["status"].pack(fill="x")
+        return row
+
+    def render_rows(self, load_thumbnails=True):
+        """Point the row widgets at the cards in the current window."""
+        for slot, row in enumerate(self.rows):
+            index = self.offset + slot
+            if index >= len(self.cards):
+                row["index"] = None
+                row["frame"].pack_forget()
+                continue
+            card = self.cards[index]
+            row["index"] = index
+            if not row["frame"].winfo_ismapped():
+                row["frame"].pack(fill="x", padx=5, pady=3)
+            row["checked"].set(card["checked"])
+            row["entry"].delete(0, "end")
+            row["entry"].insert(0, card["name"])
+            row["status"].configure(text=f"{card['path'].name} - {card['status']}")
+            if row["thumbnail_path"] != card["path"]:
+                row["thumbnail_path"] = None
+                row["thumbnail"].configure(image=self.parent.placeholder_thumbnail((50, 75)))
+
+        total = len(self.cards)
+        if total > VISIBLE_ROWS:
+            self.scrollbar.set(self.offset / total, (self.offset + VISIBLE_ROWS) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        if load_thumbnails:
+            # Wait until scrolling settles so fast scrolling doesn't decode every card it passes
+            if self.thumbnail_after_id:
+                self.modal.after_cancel(self.thumbnail_after_id)
+            self.thumbnail_after_id = self.modal.after(150, self.load_visible_thumbnails)
+
+    def load_visible_thumbnails(self):
+        self.thumbnail_after_id = None
+        for row in self.rows:
+            if row["index"] is None or row["thumbnail_path"] is not None:
+                continue
+            path = self.cards[row["index"]]["path"]
+            row["thumbnail_path"] = path
+
+            def apply(label, thumbnail, row=row, path=path):
+                # The row may have been recycled for another card while this one loaded
+                if row["thumbnail_path"] == path:
+                    label.configure(image=thumbnail)
+
+            self.parent.create_thumbnail(path, callback=apply, widget_ref=weakref.ref(row["thumbnail"]))
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.cards) - VISIBLE_ROWS))
+        if offset != self.offset:
+            self.offset = offset
+            self.render_rows()
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.cards)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (VISIBLE_ROWS if args[2] == "pages" else 1)
+            self.scroll_by(step)
+
+    def on_row_checked(self, row):
+        if row["index"] is not None:
+            self.cards[row["index"]]["checked"] = row["checked"].get()
+            self.update_count_label()
+
+    def on_row_renamed(self, row):
+        if row["index"] is not None:
+            card = self.cards[row["index"]]
+            card["name"] = row["entry"].get()
+            card["name_edited"] = True
 
     def update_count_label(self):
-        self.count_label.configure(text=f"{self.selected_count}/{self.character_count}")
+        selected = sum(1 for card in self.cards if card["checked"])
+        self.count_label.configure(text=f"{selected}/{len(self.cards)}")
 
     def toggle_checkboxes(self):
         self.toggle_state = not self.toggle_state
-        for data in self.checkbuttons.values():
-            data["checked"].set(self.toggle_state)
-        self.selected_count = self.character_count if self.toggle_state else 0
+        for card in self.cards:
+            card["checked"] = self.toggle_state
         self.toggle_button.configure(text="Uncheck All" if self.toggle_state else "Check All")
+        self.render_rows(load_thumbnails=False)
         self.update_count_label()
 
-    def import_characters(self):
-        """Import selected characters into the application."""
-        characters_path = self.sillytavern_path / "characters"
-        app_characters_path = Path("CharacterCards")
-        app_characters_path.mkdir(parents=True, exist_ok=True)
+    def show_status(self, text):
+        if self.modal and self.modal.winfo_exists():
+            self.status_label.configure(text=text)
 
-        imported_count = 0
-        for png_file, data in self.checkbuttons.items():
-            if data["checked"].get():
-                character_name = data["entry"].get().strip() or png_file.stem
-                character_folder = app_characters_path / character_name
-                character_folder.mkdir(parents=True, exist_ok=True)
+    ########## Import ##########
 
-                shutil.copy(png_file, character_folder / png_file.name)
-                self.db_manager.add_character_to_db(character_name, png_file.name)
-                imported_count += 1
+    def import_characters(self):
+        """Copy the selected cards into SillyTavern and add them to the database in one transaction."""
+        selected = [dict(card, name=card["name"].strip() or card["path"].stem) for card in self.cards if card["checked"]]
+        if not selected:
+            self.show_status("No cards selected.")
+            return
+        if self.job_manager.is_running("character_bulk_parse"):
+            self.show_status("Still reading cards, please wait a moment.")
+            return
 
-        messagebox.showinfo("Import Complete", f"{imported_count} characters have been imported successfully.")
-        self.modal.destroy()
+        target_dir = self.sillytavern_path.resolve() / "characters"
+        self.import_button.configure(state="disabled")
 
-        if self.refresh_callback:
-            self.refresh_callback()
+        def run(job):
+            return import_cards(
+                job, selected, target_dir, self.db_manager.db_path, self.sillytavern_path, self.parent.tag_mirror
+            )
 
+        def on_done(job):
+            if self.refresh_callback:
+                self.refresh_callback()
+            self.parent.show_message(f"Imported {job.result} characters.", "success")
+            self.close()
+
+        def on_stopped(job):
+            if self.modal and self.modal.winfo_exists():
+                self.import_button.configure(state="normal")
+            if job.status == "failed":
+                self.show_status(f"Import failed, nothing was added: {job.error}")
+            else:
+                self.show_status("Import canceled, nothing was added.")
+
+        self.job_manager.submit(
+            "character_bulk_import", run, on_progress=self.on_import_progress, on_done=on_done,
+            on_error=on_stopped, on_cancel=on_stopped,
+        )
 
-    def create_thumbnail(self, image_path):
+    def on_import_progress(self, progress):
+        if self.modal and self.modal.winfo_exists() and progress["total"]:
+            self.progress_bar.set(progress["done"] / progress["total"])
+            self.show_status(f"Importing {progress['done']}/{progress['total']} {progress['message']}")
+
+
+def import_cards(job, cards, target_dir, db_path, sillytavern_path, tag_mirror=None):
+    """
+    Worker for the bulk import: copy each card into the SillyTavern characters folder (renaming on
+    conflicts), then insert every character and tag in one go. Copies are removed again if the
+    import is canceled or fails, so a bulk import is all or nothing.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    job.report(done=0, total=len(cards) + 1, message="Copying cards...")
+    created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    copied = []
+    rows = []
+    try:
+        for card in cards:
+            job.check()
+            source = card["path"]
+            final_path = target_dir / source.name
+            if source.parent != target_dir:
+                # Increment the filename until an unused one is found
+                counter = 1
+                while final_path.exists():
+                    final_path = target_dir / f"{source.stem}_{counter}{source.suffix}"
+                    counter += 1
+                shutil.copyfile(source, final_path)
+                copied.append(final_path)
+            rows.append((
+                card["name"], str(final_path), card["notes"], created_date, created_date,
+                card.get("card_hash"), final_path.stat().st_mtime_ns if card.get("card_hash") else None,
+            ))
+            card["final_path"] = final_path
+            job.report(advance=1, message=source.name)
+
+        job.check()
+        job.report(message="Saving to database...")
+        with sqlite3.connect(db_path) as connection:
+            connection.executemany(
+                """INSERT INTO characters
+                (name, main_file, notes, created_date, last_modified_date, card_hash, card_hash_mtime)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+    except BaseException:
+        for path in copied:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        raise
+
+    # Tags are written to settings.json once for the whole batch
+    tagged = [card for card in cards if card["tags"]]
+    if tagged:
         try:
-            img = Image.open(image_path)
-
-            target_aspect_ratio = 50 / 75
-            img_width, img_height = img.size
-            img_aspect_ratio = img_width / img_height
-
-            if img_aspect_ratio > target_aspect_ratio:
-                new_width = int(img_height * target_aspect_ratio)
-                offset = (img_width - new_width) // 2
-                img = img.crop((offset, 0, offset + new_width, img_height))
-            elif img_aspect_ratio < target_aspect_ratio:
-                new_height = int(img_width / target_aspect_ratio)
-                offset = (img_height - new_height) // 2
-                img = img.crop((0, offset, img_width, offset + new_height))
-
-            img = img.resize((50, 75), Image.Resampling.LANCZOS)
-            return ctk.CTkImage(img, size=(50, 75))
-        except Exception:
-            default_img = Image.open("assets/default_thumbnail.png")
-            return ctk.CTkImage(default_img, size=(50, 75))
\ No newline at end of file
+            tag_manager = SillyTavernTagManager(sillytavern_path, tag_mirror)
+            for card in tagged:
+                for tag in card["tags"]:
+                    # Keyed by the character name ("Name.png"), like the add dialog; the file may be "Name_1.png"
+                    tag_manager.assign_tag(tag, card["name"])
+            tag_manager.save_tags()
+        except Exception as e:
+            print(f"Error processing tags: {e}")
+
+    job.report(advance=1, message="Done")
+    return len(rows)
@@ -1,8 +1,12 @@
 import os
+import hashlib
 import sqlite3
 from datetime import datetime
 import shutil
 from pathlib import Path
+from utils.lorebook_index import LorebookIndex
+from utils.blob_store import blob_store
+from utils.image_ingest import ingested_image
 
 class LorebookManager:
     def __init__(self, sillytavern_path, db_path):
@@ -10,74 +14,143 @@ class LorebookManager:
         self.lorebooks_path = "Lorebooks"  # Folder in the root directory
         self.db_path = db_path
         self.worlds_path = Path(self.sillytavern_path) / "worlds"
+        self.entry_index = LorebookIndex(db_path)
         Path(self.lorebooks_path).mkdir(parents=True, exist_ok=True)  # Ensure the Lorebooks folder exists
 
-    def sync_lorebooks(self):
-        """Sync lorebooks from SillyTavern to the Lorebooks folder and database."""
+    def sync_lorebooks(self, job=None):
+        """
+        Incrementally sync lorebooks from SillyTavern's worlds folder.
+        Files are compared against the lorebook_files manifest (size, mtime_ns, hash); only new or
+        changed files are re-indexed, and files that disappeared are marked removed. All writes
+        happen in one transaction. Returns {"added", "changed", "removed", "unchanged"} counts.
+        """
+        summary = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
         if not self.worlds_path.exists():
             print("SillyTavern worlds folder not found.")
-            return
+            return summary
 
+        # Stat the folder once
+        world_files = {}
+        with os.scandir(self.worlds_path) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.lower().endswith(".json"):
+                    stat = entry.stat()
+                    world_files[entry.name] = (entry.path, stat.st_size, stat.st_mtime_ns)
+
+        connection = sqlite3.connect(self.db_path)
         try:
-            connection = sqlite3.connect(self.db_path)
             cursor = connection.cursor()
 
-            # Ensure the lorebooks table exists
+            # Preload the known lorebooks with their manifest rows for set lookups
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS lorebooks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filename TEXT UNIQUE NOT NULL,
-                    notes TEXT,
-                    misc_notes TEXT,
-                    created_date TEXT,
-                    last_modified_date TEXT
-                )
+                SELECT l.id, l.filename, f.size, f.mtime_ns, f.content_hash, f.removed_date
+                FROM lorebooks l
+                LEFT JOIN lorebook_files f ON f.lorebook_id = l.id
             """)
-            connection.commit()
-
-            new_lorebooks_added = False
-
-            # Iterate through all JSON files in the worlds folder
-            for json_file in self.worlds_path.glob("*.json"):
-                lorebook_name = json_file.stem  # Extract the name without extension
-                target_folder = Path(self.lorebooks_path) / lorebook_name
-
-                # Create a folder for the lorebook
-                target_folder.mkdir(parents=True, exist_ok=True)
-
-                # Check if the lorebook is already in the database
-                cursor.execute("SELECT COUNT(*) FROM lorebooks WHERE filename = ?", (json_file.name,))
-                exists = cursor.fetchone()[0]
-
-                if not exists:
-                    # Add the lorebook to the database
-                    created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            known = {row[1]: row for row in cursor.fetchall()}
+
+            if job:
+                job.report(done=0, total=len(world_files))
+
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for filename in sorted(world_files):
+                if job:
+                    job.check()
+                path, size, mtime_ns = world_files[filename]
+                row = known.get(filename)
+
+                if row and row[2] == size and row[3] == mtime_ns and row[5] is None:
+                    summary["unchanged"] += 1
+                elif self._sync_world_file(cursor, row, filename, path, size, mtime_ns, now):
+                    summary["added" if not row else "changed"] += 1
+                else:
+                    summary["unchanged"] += 1
+
+                if job:
+                    job.report(advance=1, message=filename)
+
+            # Files that are gone keep their notes, images and links but lose their index
+            for filename, row in known.items():
+                if filename not in world_files and row[5] is None:
+                    self.entry_index.remove_lorebook(cursor, row[0])
                     cursor.execute("""
-                        INSERT INTO lorebooks (filename, notes, misc_notes, created_date, last_modified_date)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (json_file.name, "", "", created_date, created_date))
-                    connection.commit()
-                    new_lorebooks_added = True
-                    print(f"Lorebook added to DB: {json_file.name}")
-
-            if new_lorebooks_added:
-                print("New lorebooks synced successfully.")
-            else:
-                print("No new lorebooks found to sync.")
-
-        except Exception as e:
-            print(f"Error syncing lorebooks: {str(e)}")
+                        INSERT INTO lorebook_files (lorebook_id, size, mtime_ns, content_hash, removed_date)
+                        VALUES (?, 0, 0, '', ?)
+                        ON CONFLICT(lorebook_id) DO UPDATE SET removed_date = excluded.removed_date
+                    """, (row[0], now))
+                    summary["removed"] += 1
+                    print(f"Lorebook removed from SillyTavern: {filename}")
 
+            connection.commit()
+            print(
+                f"Lorebook sync: {summary['added']} added, {summary['changed']} changed, "
+                f"{summary['removed']} removed, {summary['unchanged']} unchanged."
+            )
+            return summary
+        except Exception:
+            connection.rollback()
+            raise
         finally:
             connection.close()
 
+    def _sync_world_file(self, cursor, row, filename, path, size, mtime_ns, now):
+        """
+        Bring one new or touched world file up to date. Returns False when only its stat changed
+        (same content hash), True when it was added or re-indexed.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        if row and row[4] == content_hash and row[5] is None:
+            # Touched but identical: just refresh the stat so the next sync skips it
+            cursor.execute(
+                "UPDATE lorebook_files SET size = ?, mtime_ns = ? WHERE lorebook_id = ?",
+                (size, mtime_ns, row[0]),
+            )
+            return False
+
+        if row:
+            lorebook_id = row[0]
+            cursor.execute("UPDATE lorebooks SET last_modified_date = ? WHERE id = ?", (now, lorebook_id))
+        else:
+            # Add the lorebook to the database with a folder for its images
+            (Path(self.lorebooks_path) / Path(filename).stem).mkdir(parents=True, exist_ok=True)
+            cursor.execute("""
+                INSERT INTO lorebooks (filename, notes, misc_notes, created_date, last_modified_date)
+                VALUES (?, ?, ?, ?, ?)
+            """, (filename, "", "", now, now))
+            lorebook_id = cursor.lastrowid
+            print(f"Lorebook added to DB: {filename}")
+
+        # Index the entries so they can be searched without opening the file
+        try:
+            entries = self.entry_index.parse_world_data(data)
+        except ValueError as e:
+            print(f"Error indexing lorebook {filename}: {e}")
+            entries = []
+        self.entry_index.index_lorebook(cursor, lorebook_id, entries)
 
+        cursor.execute("""
+            INSERT INTO lorebook_files (lorebook_id, size, mtime_ns, content_hash, removed_date)
+            VALUES (?, ?, ?, ?, NULL)
+            ON CONFLICT(lorebook_id) DO UPDATE SET
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                content_hash = excluded.content_hash,
+                removed_date = NULL
+        """, (lorebook_id, size, mtime_ns, content_hash))
+        return True
 
     def get_lorebooks_list(self):
         """Retrieve lorebooks from the database."""
         connection = sqlite3.connect(self.db_path)
         cursor = connection.cursor()
-        cursor.execute("SELECT id, filename, notes, misc_notes, created_date, last_modified_date FROM lorebooks")
+        cursor.execute("""
+            SELECT l.id, l.filename, l.notes, l.misc_notes, l.created_date, l.last_modified_date, f.removed_date
+            FROM lorebooks l
+            LEFT JOIN lorebook_files f ON f.lorebook_id = l.id
+        """)
         rows = cursor.fetchall()
         connection.close()
 
@@ -89,6 +162,7 @@ class LorebookManager:
                 "misc_notes": row[3],
                 "created_date": row[4],
                 "last_modified_date": row[5],
+                "removed": row[6] is not None,
             }
             for row in rows
         ]
@@ -131,6 +205,49 @@ class LorebookManager:
         connection.close()
         return character_ids
     
+    def get_unlinked_characters_page(self, lorebook_id, query="", limit=10, offset=0):
+        """
+        Retrieve one page of characters not yet linked to the lorebook, filtered by name.
+        Returns (characters, total) so the caller can page without loading every character.
+        """
+        pattern = "%" + query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        where = """
+            WHERE c.name LIKE ? ESCAPE '\\'
+              AND NOT EXISTS (
+                  SELECT 1 FROM lorebook_character_links lcl
+                  WHERE lcl.lorebook_id = ? AND lcl.character_id = c.id
+              )
+        """
+        with sqlite3.connect(self.db_path) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM characters c {where}", (pattern, lorebook_id))
+            total = cursor.fetchone()[0]
+            cursor.execute(f"""
+                SELECT c.id, c.name, c.main_file
+                FROM characters c
+                {where}
+                ORDER BY c.name COLLATE NOCASE, c.id
+                LIMIT ? OFFSET ?
+            """, (pattern, lorebook_id, limit, offset))
+            rows = cursor.fetchall()
+        return [{"id": row[0], "name": row[1], "image_path": row[2]} for row in rows], total
+
+    def get_linked_lorebooks(self, character_id):
+        """Retrieve the lorebooks linked to a character whose world files are still present."""
+        connection = sqlite3.connect(self.db_path)
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT l.id, l.filename
+            FROM lorebooks l
+            JOIN lorebook_character_links lcl ON l.id = lcl.lorebook_id
+            LEFT JOIN lorebook_files f ON f.lorebook_id = l.id
+            WHERE lcl.character_id = ? AND f.removed_date IS NULL
+            ORDER BY l.filename
+        """, (character_id,))
+        lorebooks = cursor.fetchall()
+        connection.close()
+        return [{"id": row[0], "filename": row[1]} for row in lorebooks]
+
     def get_linked_characters(self, lorebook_id):
         """Retrieve characters linked to a specific lorebook."""
         connection = sqlite3.connect(self.db_path)
@@ -151,7 +268,7 @@ class LorebookManager:
         connection = sqlite3.connect(self.db_path)
         cursor = connection.cursor()
         cursor.execute(
-            "SELECT id, image_name, image_note, created_date, last_modified_date FROM lorebook_images WHERE lorebook_id = ?",
+            "SELECT id, image_name, image_note, created_date, last_modified_date, content_hash FROM lorebook_images WHERE lorebook_id = ?",
             (lorebook_id,)
         )
         images = cursor.fetchall()
@@ -161,36 +278,27 @@ class LorebookManager:
     def save_image(self, lorebook_id, image_name, image_note, file_path, modal=None, refresh_callback=None):
         """Save a new image to the lorebook."""
         try:
-            # Save image metadata to the database
-            created_date = last_modified_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            connection = sqlite3.connect(self.db_path)
-            cursor = connection.cursor()
-            cursor.execute(
-                """
-                INSERT INTO lorebook_images (lorebook_id, image_name, image_note, created_date, last_modified_date)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (lorebook_id, image_name, image_note, created_date, last_modified_date)
-            )
-            connection.commit()
-
-            # Retrieve the lorebook folder name
-            cursor.execute("SELECT filename FROM lorebooks WHERE id = ?", (lorebook_id,))
-            lorebook_row = cursor.fetchone()
-            connection.close()
-
-            if not lorebook_row:
-                raise Exception("Lorebook folder not found for the given ID.")
-            
-            # Strip extension and determine paths
-            lorebook_name = Path(lorebook_row[0]).stem  # Strip extension
-            lorebook_folder = Path("Lorebooks") / lorebook_name / "images"  # Path to images folder
-
-            # Create the images folder if it doesn't exist
-            lorebook_folder.mkdir(parents=True, exist_ok=True)
-
-            # Copy the file to the images folder
-            shutil.copy(file_path, lorebook_folder / f"{image_name}.png")
+            # Detect the format, cap the size, store the blob and pre-render its thumbnail
+            with ingested_image(file_path, self.db_path) as image:
+                # Save image metadata to the database
+                created_date = last_modified_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                connection = sqlite3.connect(self.db_path)
+                cursor = connection.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO lorebook_images (
+                        lorebook_id, image_name, image_note, created_date, last_modified_date,
+                        content_hash, image_format, width, height
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        lorebook_id, image_name, image_note, created_date, last_modified_date,
+                        image["content_hash"], image["format"], image["width"], image["height"],
+                    )
+                )
+                connection.commit()
+                connection.close()
 
             # Invoke the refresh callback and close the modal if provided
             if refresh_callback:
@@ -209,12 +317,12 @@ class LorebookManager:
         try:
             connection = sqlite3.connect(self.db_path)
             cursor = connection.cursor()
-            cursor.execute("SELECT image_name FROM lorebook_images WHERE id = ?", (image_id,))
+            cursor.execute("SELECT image_name, content_hash FROM lorebook_images WHERE id = ?", (image_id,))
             result = cursor.fetchone()
             if not result:
                 raise Exception("Image not found in database.")
 
-            image_name = result[0]
+            image_name, content_hash = result
 
             # Get the lorebook folder
             cursor.execute("SELECT filename FROM lorebooks WHERE id = ?", (lorebook_id,))
@@ -226,17 +334,19 @@ class LorebookManager:
             lorebook_name = Path(lorebook_row[0]).stem  # Strip extension
             image_path = Path("Lorebooks") / lorebook_name / "images" / f"{image_name}.png"
 
-            # Delete the image file if it exists
-            if image_path.exists():
-                image_path.unlink()
-                print(f"Deleted image: {image_path}")
-            else:
-                print(f"Image not found: {image_path}")
+            # Delete the image file if it exists (blobs are released below, once no other image uses them)
+            if not content_hash:
+                if image_path.exists():
+                    image_path.unlink()
+                    print(f"Deleted image: {image_path}")
+                else:
+                    print(f"Image not found: {image_path}")
 
             # Delete the image entry in the database
             cursor.execute("DELETE FROM lorebook_images WHERE id = ?", (image_id,))
             connection.commit()
             connection.close()
+            blob_store.release(self.db_path, [content_hash])
 
             print(f"Image {image_name} deleted successfully.")
             return True
@@ -251,7 +361,7 @@ class LorebookManager:
             cursor = connection.cursor()
             cursor.execute(
                 """
-                SELECT image_name, image_note, created_date, last_modified_date
+                SELECT image_name, image_note, created_date, last_modified_date, content_hash
                 FROM lorebook_images
                 WHERE id = ?
                 """,
@@ -0,0 +1,57 @@
+import itertools
+
+from utils.job_manager import JobCancelled
+
+_run_numbers = itertools.count(1)
+
+
+class ImportPipeline:
+    """
+    A named sequence of stages (e.g. fetch -> parse -> copy -> insert -> tag) run as one background job.
+    Each stage is func(context, job) and runs on a worker thread; results are passed along in the context
+    dict, and long stages call job.check() between chunks so a cancel stops them mid-way. A stage may
+    have an undo(context), run in reverse order for the completed stages if a later one fails or the
+    pipeline is canceled (e.g. deleting a downloaded file). Progress events carry the stage label so a
+    dialog can show which step is running.
+    """
+
+    def __init__(self, job_manager, name):
+        self.job_manager = job_manager
+        # Numbered, so a new run is never mistaken for an earlier one that is still winding down
+        self.name = f"{name} #{next(_run_numbers)}"
+        self.stages = []
+
+    def add_stage(self, label, func, undo=None):
+        self.stages.append((label, func, undo))
+        return self
+
+    def start(self, context=None, on_progress=None, on_done=None, on_error=None, on_cancel=None):
+        """Submit the pipeline. on_done(job) runs on the main thread with job.result set to the context."""
+        stages = list(self.stages)
+
+        def run(job):
+            ctx = dict(context or {})
+            completed = []
+            try:
+                for index, (label, func, undo) in enumerate(stages):
+                    job.check()  # Stop between stages if the dialog was closed
+                    job.report(done=index, total=len(stages), message=label)
+                    func(ctx, job)
+                    completed.append(undo)
+                job.check()
+            except BaseException as e:
+                for undo in reversed(completed):
+                    if undo:
+                        try:
+                            undo(ctx)
+                        except Exception as undo_error:
+                            print(f"Error undoing a stage of '{self.name}': {undo_error}")
+                if not isinstance(e, JobCancelled):
+                    print(f"Pipeline '{self.name}' failed; completed stages were undone.")
+                raise
+            job.report(done=len(stages), total=len(stages), message="Done")
+            return ctx
+
+        return self.job_manager.submit(
+            self.name, run, on_progress=on_progress, on_done=on_done, on_error=on_error, on_cancel=on_cancel
+        )
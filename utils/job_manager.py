@@ -0,0 +1,326 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested."""
+
+
+class Job:
+    """A named unit of background work with cooperative cancel/pause and progress reporting."""
+
+    def __init__(self, name, func, manager, on_progress=None, on_done=None, on_error=None, on_cancel=None):
+        self.name = name
+        self.func = func
+        self.manager = manager
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+
+        self.status = "queued"
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.result = None
+        self.error = None
+
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self._cancel_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()  # Not paused
+        self._paused_since = None
+        self._paused_total = 0.0
+        self._done_at_start = 0
+        self._last_report = 0.0
+
+    ########## Control (any thread) ##########
+
+    def cancel(self):
+        """Request cooperative cancellation; the job stops at its next check()."""
+        self._cancel_event.set()
+        self._resume_event.set()  # Wake a paused job so it can exit
+
+    def pause(self):
+        """Pause the job at its next check()."""
+        if self.status == "running" and self._resume_event.is_set():
+            self._resume_event.clear()
+            self._paused_since = time.time()
+            self.status = "paused"
+            self.manager._post(self, "status")
+
+    def resume(self):
+        """Resume a paused job."""
+        if self.status == "paused":
+            self._paused_total += time.time() - (self._paused_since or time.time())
+            self._paused_since = None
+            self.status = "running"
+            self._resume_event.set()
+            self.manager._post(self, "status")
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def is_finished(self):
+        return self.status in ("completed", "failed", "cancelled")
+
+    ########## Job side (worker thread) ##########
+
+    def check(self):
+        """Block while paused and raise JobCancelled if cancellation was requested."""
+        while not self._resume_event.wait(0.25):
+            if self._cancel_event.is_set():
+                break
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    def report(self, done=None, total=None, message=None, advance=0):
+        """Update progress counters and emit a progress event (throttled to ~10/s)."""
+        if total is not None:
+            self.total = total
+        if done is not None:
+            self.done = done
+        self.done += advance
+        if message is not None:
+            self.message = message
+
+        now = time.time()
+        if now - self._last_report >= 0.1 or (self.total and self.done >= self.total):
+            self._last_report = now
+            self.manager._post(self, "progress")
+
+    def save_checkpoint(self, state):
+        """Persist resumable state for this job name."""
+        self.manager.save_checkpoint(self.name, state)
+
+    def load_checkpoint(self):
+        """Return the last saved state for this job name, or None."""
+        return self.manager.load_checkpoint(self.name)
+
+    def clear_checkpoint(self):
+        """Remove the saved state once the job has completed."""
+        self.manager.clear_checkpoint(self.name)
+
+    ########## Progress ##########
+
+    @property
+    def elapsed(self):
+        """Seconds spent running, excluding time spent paused."""
+        if not self.started_at:
+            return 0.0
+        end = self.finished_at or time.time()
+        paused = self._paused_total
+        if self._paused_since:
+            paused += end - self._paused_since
+        return max(end - self.started_at - paused, 0.0)
+
+    def progress(self):
+        """Return a structured snapshot: done/total, rate (items/s), ETA (s), elapsed (s)."""
+        elapsed = self.elapsed
+        processed = self.done - self._done_at_start
+        rate = processed / elapsed if elapsed > 0 and processed > 0 else 0.0
+        remaining = max(self.total - self.done, 0)
+        eta = remaining / rate if rate > 0 and self.total else None
+        return {
+            "name": self.name,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "rate": rate,
+            "eta": eta,
+            "elapsed": elapsed,
+            "message": self.message,
+        }
+
+    def _run(self):
+        """Executor entry point."""
+        if self._cancel_event.is_set():
+            self.status = "cancelled"
+            self.finished_at = time.time()
+            self.manager._post(self, "finished")
+            return
+
+        self.status = "running"
+        self.started_at = time.time()
+        self.manager._post(self, "status")
+        try:
+            self.result = self.func(self)
+            self.status = "cancelled" if self._cancel_event.is_set() else "completed"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            print(f"Error in job '{self.name}': {e}")
+            self.error = e
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+            self.manager._post(self, "finished")
+
+    def mark_resumed_from(self, done):
+        """Tell the rate/ETA calculation that `done` items were completed by an earlier run."""
+        self.done = done
+        self._done_at_start = done
+
+
+class JobManager:
+    """Runs named jobs on a shared executor and delivers their events on the Tk main thread."""
+
+    def __init__(self, master, db_path, max_workers=4, history_size=50):
+        self.master = master
+        self.db_path = db_path
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.jobs = {}                                # Active jobs by name
+        self.history = deque(maxlen=history_size)     # Finished jobs, newest last
+        self.listeners = []                           # Called with (job, kind) for every event
+        self.event_queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._process_events()
+
+    def submit(self, name, func, on_progress=None, on_done=None, on_error=None, on_cancel=None):
+        """
+        Run func(job) in the background under a unique name.
+        If a job with the same name is still active, that job is returned instead.
+        """
+        with self._lock:
+            existing = self.jobs.get(name)
+            if existing and not existing.is_finished:
+                print(f"Job '{name}' is already running.")
+                return existing
+
+            job = Job(name, func, self, on_progress, on_done, on_error, on_cancel)
+            self.jobs[name] = job
+
+        self.executor.submit(job._run)
+        self._post(job, "status")
+        return job
+
+    def get_job(self, name):
+        return self.jobs.get(name)
+
+    def is_running(self, name):
+        job = self.jobs.get(name)
+        return bool(job and not job.is_finished)
+
+    def running_jobs(self):
+        return [job for job in self.jobs.values() if not job.is_finished]
+
+    def recent_jobs(self):
+        return list(reversed(self.history))
+
+    def cancel(self, name):
+        job = self.jobs.get(name)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def shutdown(self):
+        """Cancel everything and stop accepting work (used when the app closes)."""
+        self._closed = True
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    ########## Event delivery ##########
+
+    def _post(self, job, kind):
+        self.event_queue.put((job, kind))
+
+    def _process_events(self):
+        """Drain job events on the main thread and dispatch callbacks."""
+        try:
+            while True:
+                job, kind = self.event_queue.get_nowait()
+                self._dispatch(job, kind)
+        except queue.Empty:
+            pass
+        if not self._closed:
+            self.master.after(100, self._process_events)
+
+    def _dispatch(self, job, kind):
+        try:
+            if kind == "progress" and job.on_progress:
+                job.on_progress(job.progress())
+            elif kind == "finished":
+                with self._lock:
+                    if self.jobs.get(job.name) is job:
+                        del self.jobs[job.name]
+                self.history.append(job)
+
+                if job.status == "completed" and job.on_done:
+                    job.on_done(job)
+                elif job.status == "failed" and job.on_error:
+                    job.on_error(job)
+                elif job.status == "cancelled" and job.on_cancel:
+                    job.on_cancel(job)
+        except Exception as e:
+            print(f"Error in job callback for '{job.name}': {e}")
+
+        for listener in list(self.listeners):
+            try:
+                listener(job, kind)
+            except Exception as e:
+                print(f"Error in job listener: {e}")
+
+    ########## Checkpoints ##########
+
+    def save_checkpoint(self, name, state):
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                connection.execute("""
+                    INSERT INTO job_checkpoints (name, state, last_modified_date)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET state = excluded.state, last_modified_date = excluded.last_modified_date
+                """, (name, json.dumps(state), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        except sqlite3.Error as e:
+            print(f"Error saving checkpoint for job '{name}': {e}")
+
+    def load_checkpoint(self, name):
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                row = connection.execute("SELECT state FROM job_checkpoints WHERE name = ?", (name,)).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error loading checkpoint for job '{name}': {e}")
+            return None
+
+    def clear_checkpoint(self, name):
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                connection.execute("DELETE FROM job_checkpoints WHERE name = ?", (name,))
+        except sqlite3.Error as e:
+            print(f"Error clearing checkpoint for job '{name}': {e}")
+
+
+def format_duration(seconds):
+    """Format seconds as a short human-readable duration (e.g. '1m 05s')."""
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
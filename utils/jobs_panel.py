@@ -0,0 +1,139 @@
+import time
+import customtkinter as ctk
+from utils.job_manager import format_duration
+
+
+class JobsPanel:
+    def __init__(self, parent, job_manager):
+        self.parent = parent
+        self.job_manager = job_manager
+        self.modal = None
+        self.refresh_timer = None
+
+    def open(self):
+        """Open the jobs panel listing running and recent jobs."""
+        if self.modal and self.modal.winfo_exists():
+            self.modal.focus_set()
+            return
+
+        self.modal = ctk.CTkToplevel(self.parent)
+        self.modal.title("Background Jobs")
+        self.modal.geometry("620x420")
+        self.modal.transient(self.parent)
+        self.modal.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Running Jobs
+        running_label = ctk.CTkLabel(self.modal, text="Running", font=ctk.CTkFont(size=14, weight="bold"))
+        running_label.pack(pady=(10, 0), padx=10, anchor="w")
+
+        self.running_frame = ctk.CTkScrollableFrame(self.modal, height=150)
+        self.running_frame.pack(fill="x", padx=10, pady=5)
+
+        # Recent Jobs
+        recent_label = ctk.CTkLabel(self.modal, text="Recent", font=ctk.CTkFont(size=14, weight="bold"))
+        recent_label.pack(pady=(10, 0), padx=10, anchor="w")
+
+        self.recent_frame = ctk.CTkScrollableFrame(self.modal)
+        self.recent_frame.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+
+        self.job_manager.add_listener(self.on_job_event)
+        self.refresh()
+
+    def close(self):
+        self.job_manager.remove_listener(self.on_job_event)
+        if self.refresh_timer:
+            self.modal.after_cancel(self.refresh_timer)
+            self.refresh_timer = None
+        self.modal.destroy()
+
+    def on_job_event(self, job, kind):
+        # Progress events are picked up by the periodic refresh; status changes redraw immediately
+        if kind != "progress" and self.modal and self.modal.winfo_exists():
+            self.refresh()
+
+    def refresh(self):
+        """Rebuild both lists and schedule the next refresh for live timings."""
+        if not (self.modal and self.modal.winfo_exists()):
+            return
+
+        if self.refresh_timer:
+            self.modal.after_cancel(self.refresh_timer)
+
+        for frame in (self.running_frame, self.recent_frame):
+            for widget in frame.winfo_children():
+                widget.destroy()
+
+        running = self.job_manager.running_jobs()
+        if not running:
+            ctk.CTkLabel(self.running_frame, text="No jobs running.", text_color="gray").pack(anchor="w", padx=5)
+        for job in running:
+            self._add_running_row(job)
+
+        recent = self.job_manager.recent_jobs()
+        if not recent:
+            ctk.CTkLabel(self.recent_frame, text="No recent jobs.", text_color="gray").pack(anchor="w", padx=5)
+        for job in recent:
+            self._add_recent_row(job)
+
+        self.refresh_timer = self.modal.after(1000, self.refresh)
+
+    def _add_running_row(self, job):
+        progress = job.progress()
+        row = ctk.CTkFrame(self.running_frame)
+        row.pack(fill="x", padx=5, pady=2)
+
+        name_label = ctk.CTkLabel(row, text=f"{job.name} ({job.status})", font=ctk.CTkFont(size=12, weight="bold"))
+        name_label.grid(row=0, column=0, sticky="w", padx=5)
+
+        if progress["total"]:
+            counts = f"{progress['done']}/{progress['total']}"
+        else:
+            counts = f"{progress['done']}"
+        details = (
+            f"{counts} | {progress['rate']:.1f}/s | ETA {format_duration(progress['eta'])} "
+            f"| Elapsed {format_duration(progress['elapsed'])}"
+        )
+        details_label = ctk.CTkLabel(row, text=details, font=ctk.CTkFont(size=11))
+        details_label.grid(row=1, column=0, sticky="w", padx=5)
+
+        if progress["message"]:
+            message_label = ctk.CTkLabel(row, text=progress["message"], font=ctk.CTkFont(size=10), text_color="gray")
+            message_label.grid(row=2, column=0, sticky="w", padx=5)
+
+        row.grid_columnconfigure(0, weight=1)
+
+        pause_text = "Resume" if job.status == "paused" else "Pause"
+        pause_button = ctk.CTkButton(
+            row,
+            text=pause_text,
+            width=70,
+            command=lambda job=job: (job.resume() if job.status == "paused" else job.pause()),
+        )
+        pause_button.grid(row=0, column=1, rowspan=2, padx=5)
+
+        cancel_button = ctk.CTkButton(
+            row,
+            text="Cancel",
+            width=70,
+            fg_color="red",
+            hover_color="darkred",
+            command=job.cancel,
+        )
+        cancel_button.grid(row=0, column=2, rowspan=2, padx=5)
+
+    def _add_recent_row(self, job):
+        row = ctk.CTkFrame(self.recent_frame)
+        row.pack(fill="x", padx=5, pady=2)
+
+        finished = time.strftime("%I:%M:%S %p", time.localtime(job.finished_at)) if job.finished_at else "--"
+        text = (
+            f"{job.name} | {job.status} | {job.done}"
+            + (f"/{job.total}" if job.total else "")
+            + f" items | took {format_duration(job.elapsed)} | finished {finished}"
+        )
+        label = ctk.CTkLabel(row, text=text, font=ctk.CTkFont(size=11), anchor="w")
+        label.pack(side="left", padx=5)
+
+        if job.error:
+            error_label = ctk.CTkLabel(row, text=str(job.error), font=ctk.CTkFont(size=10), text_color="red")
+            error_label.pack(side="left", padx=5)
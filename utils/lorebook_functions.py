@@ -6,6 +6,11 @@ from tkinter.filedialog import askopenfilename
 from PIL import Image
 from datetime import datetime
 import shutil
+import time
+import weakref
+from utils.lorebook_matcher import matcher_cache
+from utils.blob_store import blob_store
+from utils.image_ingest import ingested_image, thumbnail_source
 
 DB_DIR = Path.cwd() / "db"
 db_path = DB_DIR / "database.db"
@@ -20,7 +25,6 @@ def open_lorebooks_modal(
     open_link_character_modal_func,
     handle_lorebook_save_func,
     create_thumbnail_func,
-    get_character_list_func,
     get_linked_characters_func,
     handle_unlink_character_func,
     align_modal_top_left_func,
@@ -48,6 +52,16 @@ def open_lorebooks_modal(
     )
     search_entry.pack(pady=(10, 5), padx=10)
 
+    # Search lorebook names, or the keys/comments/content of their indexed entries
+    search_mode_var = ctk.StringVar(value="Names")
+    search_mode_toggle = ctk.CTkSegmentedButton(
+        list_frame,
+        values=["Names", "Entries"],
+        variable=search_mode_var,
+        command=lambda mode: filter_lorebooks(search_var.get()),
+    )
+    search_mode_toggle.pack(pady=(0, 5), padx=10)
+
     sort_var = ctk.StringVar(value="A - Z")
     sort_dropdown = ctk.CTkOptionMenu(
         list_frame,
@@ -123,8 +137,7 @@ def open_lorebooks_modal(
             parent=parent,
             lorebook_id=getattr(parent, "selected_lorebook_id", None),
             create_thumbnail=create_thumbnail_func,
-            get_character_list=get_character_list_func,
-            linked_character_ids_func=lorebook_manager.get_linked_character_ids,
+            get_unlinked_characters_page=lorebook_manager.get_unlinked_characters_page,
             handle_link_character_func=parent.handle_link_character,
             align_modal_top_left=align_modal_top_left_func,
         ),
@@ -138,6 +151,32 @@ def open_lorebooks_modal(
     parent.linked_characters_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         
+    # Entries Tab (from the index built during sync)
+    entries_tab = tabview.add("Entries")
+    entries_summary_label = ctk.CTkLabel(entries_tab, text="", anchor="w")
+    entries_summary_label.pack(pady=(5, 0), padx=10, anchor="w")
+    entries_frame = ctk.CTkScrollableFrame(entries_tab)
+    entries_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+    # Test Text Tab (which entries would a chat excerpt activate?)
+    test_tab = tabview.add("Test Text")
+    test_scope_var = ctk.StringVar(value="Selected Lorebook")
+    test_scope_toggle = ctk.CTkSegmentedButton(
+        test_tab, values=["Selected Lorebook", "Character's Lorebooks"], variable=test_scope_var
+    )
+    test_scope_toggle.pack(pady=(5, 0), padx=10, anchor="w")
+
+    test_textbox = ctk.CTkTextbox(test_tab, height=120)
+    test_textbox.pack(fill="x", padx=10, pady=5)
+
+    test_button = ctk.CTkButton(test_tab, text="Test", command=lambda: run_text_test())
+    test_button.pack(pady=(0, 5), padx=10, anchor="w")
+
+    test_summary_label = ctk.CTkLabel(test_tab, text="", anchor="w")
+    test_summary_label.pack(padx=10, anchor="w")
+    test_results_frame = ctk.CTkScrollableFrame(test_tab)
+    test_results_frame.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+
         # Metadata Tab
     metadata_tab = tabview.add("Metadata")
 
@@ -173,13 +212,13 @@ def open_lorebooks_modal(
     )
     save_button.pack(pady=10, padx=10, fill="x")
 
-    # Load Lorebooks
-    lorebooks = lorebook_manager.get_lorebooks_list()
-    # Auto-select the first lorebook if available
-    if lorebooks:
-        first_lorebook = lorebooks[0]
+    current = {"lorebook": None}
+
+    def select_lorebook(lorebook):
+        """Load a lorebook's details and its indexed entries."""
+        current["lorebook"] = lorebook
         load_lorebook_details_func(
-            lorebook=first_lorebook,
+            lorebook=lorebook,
             notes_textbox=notes_textbox,
             misc_notes_textbox=misc_notes_textbox,
             filename_label=filename_label,
@@ -196,55 +235,115 @@ def open_lorebooks_modal(
             display_linked_characters_func=display_linked_characters,
             handle_unlink_character_func=handle_unlink_character_func,
         )
+        show_entries(lorebook)
+
+    def show_entries(lorebook):
+        """List the lorebook's entries, narrowed to matches while searching entries."""
+        query = search_var.get().strip()
+        if search_mode_var.get() == "Entries" and query:
+            entries = lorebook_manager.entry_index.search(query, lorebook_id=lorebook["id"])
+            summary = f"{len(entries)} entries match \"{query}\""
+        else:
+            entries = lorebook_manager.entry_index.get_entries(lorebook["id"])
+            summary = f"{len(entries)} entries"
+        display_lorebook_entries(entries_frame, entries)
+        entries_summary_label.configure(text=summary)
+
+    def run_text_test():
+        """Match the excerpt against the chosen lorebooks in the background and list activated entries."""
+        text = test_textbox.get("1.0", "end").strip()
+        if not text:
+            parent.show_message("Paste some text to test.", "error")
+            return
 
+        if test_scope_var.get() == "Selected Lorebook":
+            lorebook = current["lorebook"]
+            targets = [lorebook] if lorebook and not lorebook.get("removed") else []
+            if not targets:
+                parent.show_message("Select a lorebook first.", "error")
+                return
+        else:
+            character_id = getattr(parent, "selected_character_id", None)
+            if not character_id:
+                parent.show_message("Select a character in the main window first.", "error")
+                return
+            targets = lorebook_manager.get_linked_lorebooks(character_id)
+            if not targets:
+                parent.show_message("The selected character has no linked lorebooks.", "error")
+                return
+
+        def run(job):
+            start = time.perf_counter()
+            results = []
+            for lorebook in targets:
+                job.check()
+                world_file = lorebook_manager.worlds_path / lorebook["filename"]
+                try:
+                    matches = matcher_cache.get(world_file).match(text)
+                except (OSError, ValueError) as e:
+                    print(f"Error testing lorebook {lorebook['filename']}: {e}")
+                    continue
+                results.append((lorebook, matches))
+            return results, time.perf_counter() - start
+
+        def on_done(job):
+            if not test_results_frame.winfo_exists():
+                return
+            results, seconds = job.result
+            total = sum(len(matches) for _, matches in results)
+            test_summary_label.configure(
+                text=f"{total} entries activated across {len(results)} lorebook(s) in {seconds * 1000:.0f} ms"
+            )
+            display_activated_entries(test_results_frame, results)
 
-        display_lorebooks_func(
-            scrollable_lorebooks,
-            lorebooks,
-            on_select=lambda lorebook: load_lorebook_details_func(
-                lorebook=lorebook,
-                notes_textbox=notes_textbox,
-                misc_notes_textbox=misc_notes_textbox,
-                filename_label=filename_label,
-                created_label=created_label,
-                last_modified_label=last_modified_label,
-                lorebook_name_label=lorebook_name_label,
-                images_frame=images_frame,
-                linked_characters_frame=getattr(parent, "linked_characters_frame", None),
-                selected_lorebook_id=getattr(parent, "selected_lorebook_id", None),
-                set_selected_lorebook_id=lambda lorebook_id: setattr(parent, "selected_lorebook_id", lorebook_id),
-                load_images_func=lorebook_manager.load_images,
-                display_images_func=parent.display_images,
-                get_linked_characters_func=lambda lorebook_id: get_linked_characters(db_path, lorebook_id),  # Pass db_path here
-                display_linked_characters_func=display_linked_characters,
-                handle_unlink_character_func=handle_unlink_character_func,
-            ),
+        parent.job_manager.submit(
+            "lorebook_test_text",
+            run,
+            on_done=on_done,
+            on_error=lambda job: parent.show_message(f"Text test failed: {job.error}", "error"),
         )
 
+    # Load Lorebooks
+    lorebooks = lorebook_manager.get_lorebooks_list()
+    # Auto-select the first lorebook if available
+    if lorebooks:
+        select_lorebook(lorebooks[0])
+        display_lorebooks_func(scrollable_lorebooks, lorebooks, on_select=select_lorebook)
+
     # Search and filter lorebooks
     def filter_lorebooks(query):
-        """Filter lorebooks based on the search query."""
-        filtered_lorebooks = [
-            lorebook
-            for lorebook in lorebooks
-            if query.lower() in Path(lorebook["filename"]).stem.lower()
-        ]
-        display_lorebooks_func(
-            scrollable_lorebooks,
-            filtered_lorebooks,
-            on_select=lambda lorebook: load_lorebook_details_func(
-                lorebook,
-                notes_textbox,
-                misc_notes_textbox,
-                filename_label,
-                created_label,
-                last_modified_label,
-                lorebook_name_label,
-                images_frame,
-            ),
-        )
+        """Filter lorebooks by name, or by the content of their entries."""
+        query = query.strip()
+        if search_mode_var.get() == "Entries" and query:
+            matching_ids = lorebook_manager.entry_index.matching_lorebook_ids(query)
+            filtered_lorebooks = [lorebook for lorebook in lorebooks if lorebook["id"] in matching_ids]
+        else:
+            filtered_lorebooks = [
+                lorebook
+                for lorebook in lorebooks
+                if query.lower() in Path(lorebook["filename"]).stem.lower()
+            ]
+        display_lorebooks_func(scrollable_lorebooks, filtered_lorebooks, on_select=select_lorebook)
+
+        # Keep the Entries tab in step with the search for the open lorebook
+        if current["lorebook"]:
+            show_entries(current["lorebook"])
+
+    search_timer = [None]
+
+    def on_search_changed(*args):
+        """Filter once typing pauses: an entry search scans the index, too slow to run on every keystroke."""
+        if search_timer[0]:
+            lorebooks_modal.after_cancel(search_timer[0])
+
+        def run_search():
+            search_timer[0] = None
+            if lorebooks_modal.winfo_exists():
+                filter_lorebooks(search_var.get())
 
-    search_var.trace_add("write", lambda *args: filter_lorebooks(search_var.get()))
+        search_timer[0] = lorebooks_modal.after(300, run_search)
+
+    search_var.trace_add("write", on_search_changed)
 
     # Sort Lorebooks
     def sort_lorebooks(order):
@@ -258,20 +357,79 @@ def open_lorebooks_modal(
             sorted_lorebooks = sorted(lorebooks, key=lambda x: x["created_date"], reverse=True)
         elif order == "Oldest":
             sorted_lorebooks = sorted(lorebooks, key=lambda x: x["created_date"])
-        display_lorebooks_func(
-            scrollable_lorebooks,
-            sorted_lorebooks,
-            on_select=lambda lorebook: load_lorebook_details_func(
-                lorebook,
-                notes_textbox,
-                misc_notes_textbox,
-                filename_label,
-                created_label,
-                last_modified_label,
-                lorebook_name_label,
-                images_frame,
-            ),
+        display_lorebooks_func(scrollable_lorebooks, sorted_lorebooks, on_select=select_lorebook)
+
+
+def display_activated_entries(frame, results, max_rows=200):
+    """Show the entries each lorebook would activate, with the keys that triggered them."""
+    for widget in frame.winfo_children():
+        widget.destroy()
+
+    shown = 0
+    for lorebook, matches in results:
+        header = ctk.CTkLabel(
+            frame, text=f"{Path(lorebook['filename']).stem} ({len(matches)})", font=("Arial", 13, "bold"), anchor="w"
+        )
+        header.pack(fill="x", padx=5, pady=(8, 2))
+        if not matches:
+            ctk.CTkLabel(frame, text="No entries activated.", text_color="gray", anchor="w").pack(fill="x", padx=15)
+
+        for match in matches:
+            if shown >= max_rows:
+                break
+            shown += 1
+            row = ctk.CTkFrame(frame)
+            row.pack(fill="x", padx=15, pady=2)
+
+            title = match["comment"] or f"Entry {match['uid']}"
+            ctk.CTkLabel(row, text=title, font=("Arial", 12, "bold"), anchor="w").pack(fill="x", padx=5)
+
+            if match["constant"] and not match["primary_matches"]:
+                reason = "Always active (constant)"
+            else:
+                reason = "Matched: " + ", ".join(match["primary_matches"])
+                if match["secondary_matches"]:
+                    reason += " | Secondary: " + ", ".join(match["secondary_matches"])
+            ctk.CTkLabel(row, text=reason, anchor="w", justify="left", wraplength=600).pack(fill="x", padx=5)
+
+    if shown >= max_rows:
+        ctk.CTkLabel(frame, text=f"Showing the first {max_rows} entries.", text_color="gray").pack(anchor="w", padx=5)
+
+
+def display_lorebook_entries(frame, entries, max_rows=200):
+    """Show indexed lorebook entries (comment, keys, size, enabled) in a scrollable frame."""
+    for widget in frame.winfo_children():
+        widget.destroy()
+
+    if not entries:
+        ctk.CTkLabel(frame, text="No entries found.", text_color="gray").pack(anchor="w", padx=5)
+        return
+
+    # Cap the widget count; very large world files are better narrowed with a search
+    for entry in entries[:max_rows]:
+        row = ctk.CTkFrame(frame)
+        row.pack(fill="x", padx=5, pady=2)
+
+        title = entry["comment"] or f"Entry {entry['uid']}"
+        if not entry["enabled"]:
+            title += " (disabled)"
+        title_label = ctk.CTkLabel(row, text=title, font=("Arial", 12, "bold"), anchor="w")
+        title_label.pack(fill="x", padx=5)
+
+        keys_text = "Keys: " + (", ".join(entry["keys"]) or "-")
+        if entry["secondary_keys"]:
+            keys_text += " | Secondary: " + ", ".join(entry["secondary_keys"])
+        keys_label = ctk.CTkLabel(row, text=keys_text, anchor="w", justify="left", wraplength=600)
+        keys_label.pack(fill="x", padx=5)
+
+        size_label = ctk.CTkLabel(row, text=f"{entry['content_length']} characters", text_color="gray", anchor="w")
+        size_label.pack(fill="x", padx=5)
+
+    if len(entries) > max_rows:
+        more_label = ctk.CTkLabel(
+            frame, text=f"... and {len(entries) - max_rows} more. Search to narrow the list.", text_color="gray"
         )
+        more_label.pack(anchor="w", padx=5, pady=5)
 
 
 ####### Lorebook Management Functions ###############
@@ -348,6 +506,8 @@ def display_lorebooks(frame, lorebooks, on_select, fg_color_default="#4b3e72", f
     def create_lorebook_button(lorebook):
         """Helper function to create a button for a lorebook."""
         display_name = Path(lorebook["filename"]).stem  # Strip extension
+        if lorebook.get("removed"):
+            display_name += " (removed)"  # World file no longer in SillyTavern
         button = ctk.CTkButton(
             frame,
             text=display_name,
@@ -440,6 +600,7 @@ def display_images(
     create_thumbnail_func,
     edit_image_func,
     delete_image_func,
+    placeholder_thumbnail_func,
 ):
     """Display images with thumbnails, name, notes, and buttons in the scrollable frame."""
     for widget in frame.winfo_children():
@@ -448,26 +609,25 @@ def display_images(
     # Extract the lorebook name and folder path
     lorebook_name = Path(lorebook["filename"]).stem  # Remove the extension
     lorebook_folder = Path("Lorebooks") / lorebook_name / "images"
+    placeholder_thumbnail = placeholder_thumbnail_func((50, 75))  # Shared with the app, decoded once
 
     for image in images:
-        image_id, image_name, image_note, created_date, last_modified_date = image
+        image_id, image_name, image_note, created_date, last_modified_date, content_hash = image
         image_frame = ctk.CTkFrame(frame)
         image_frame.pack(fill="x", padx=5, pady=5)
 
-        # Construct the path to the image
-        image_path = lorebook_folder / f"{image_name}.png"
-
-        # Generate the thumbnail
-        thumbnail = create_thumbnail_func(image_path)
-
         # Thumbnail and Text Container
         content_frame = ctk.CTkFrame(image_frame, fg_color="transparent")
         content_frame.pack(side="left", fill="both", expand=True)
 
-        # Thumbnail Display
-        thumbnail_label = ctk.CTkLabel(content_frame, image=thumbnail, text="")
-        thumbnail_label.image = thumbnail  # Keep reference to prevent garbage collection
+        # Thumbnail Display (the pre-rendered thumbnail when the image has one, loaded in the background)
+        thumbnail_label = ctk.CTkLabel(content_frame, image=placeholder_thumbnail, text="")
         thumbnail_label.grid(row=0, column=0, rowspan=2, padx=5, pady=5)
+        create_thumbnail_func(
+            thumbnail_source(content_hash, lorebook_folder / f"{image_name}.png"),
+            callback=lambda widget, thumbnail: widget.configure(image=thumbnail),
+            widget_ref=weakref.ref(thumbnail_label),
+        )
 
         # Image Name
         image_label = ctk.CTkLabel(content_frame, text=image_name, font=("Arial", 14, "bold"))
@@ -553,6 +713,7 @@ def add_image_modal(
             modal,
             lambda: refresh_images_func(images_frame, lorebook_id),  # Refresh images callback
             show_message_func,  # Message display function
+            parent.job_manager,  # Runs the image ingestion off the UI thread
         ),
     )
     save_button.pack(pady=10, padx=10)
@@ -568,21 +729,19 @@ def save_image_func(
     modal,
     refresh_images_callback,
     show_message_func,
+    job_manager,
 ):
-    """Save a new image to the database."""
+    """Validate a new lorebook image, then ingest it and save it to the database in the background."""
     if not lorebook_id or not image_name or not file_path:
         show_message_func("Lorebook ID, image name, and file path are required.", "error")
         return
 
     # Check for duplicate image name
     if not is_image_name_unique(db_path, image_name, lorebook_id):
-        show_message_func("An image with this name already exists in the lorebook.", "error")
+        show_message_func("An image with this name already exists in a lorebook.", "error")
         return
 
-    # Get current timestamp for created_date and last_modified_date
-    current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    # Fetch the lorebook filename to use as the folder name
+    # Make sure the lorebook still exists
     connection = sqlite3.connect(db_path)
     cursor = connection.cursor()
     cursor.execute("SELECT filename FROM lorebooks WHERE id = ?", (lorebook_id,))
@@ -593,36 +752,38 @@ def save_image_func(
         show_message_func("Failed to find the lorebook in the database.", "error")
         return
 
-    lorebook_filename = Path(lorebook_data[0]).stem  # Strip file extension
-
-    # Construct the lorebook folder path
-    lorebook_folder = Path("Lorebooks") / lorebook_filename / "images"
-    lorebook_folder.mkdir(parents=True, exist_ok=True)
-
-    try:
-        # Insert the new image with timestamps
-        connection = sqlite3.connect(db_path)
-        cursor = connection.cursor()
-        cursor.execute("""
-            INSERT INTO lorebook_images (
-                lorebook_id, image_name, image_note, created_date, last_modified_date
-            ) VALUES (?, ?, ?, ?, ?)
-        """, (lorebook_id, image_name, image_note, current_timestamp, current_timestamp))
-        connection.commit()
-
-        # Copy the image file to the lorebook's folder
-        new_file_path = lorebook_folder / f"{image_name}.png"
-        shutil.copy(file_path, new_file_path)
-
+    def run(job):
+        # Detect the format, cap the size, store the blob and pre-render its thumbnail
+        job.report(message="Processing image")
+        with ingested_image(file_path, db_path) as image:
+            # Insert the new image with timestamps
+            current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with sqlite3.connect(db_path) as connection:
+                connection.execute("""
+                    INSERT INTO lorebook_images (
+                        lorebook_id, image_name, image_note, created_date, last_modified_date,
+                        content_hash, image_format, width, height
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    lorebook_id, image_name, image_note, current_timestamp, current_timestamp,
+                    image["content_hash"], image["format"], image["width"], image["height"],
+                ))
+
+    def on_done(job):
         show_message_func("Image added successfully.", "success")
-        modal.destroy()  # Close the modal after saving
+        if modal.winfo_exists():
+            modal.destroy()  # Close the modal after saving
         refresh_images_callback()  # Refresh the images in the UI
-    except sqlite3.Error as e:
-        show_message_func(f"Failed to save the image: {e}", "error")
-    except shutil.Error as e:
-        show_message_func(f"Failed to copy the image: {e}", "error")
-    finally:
-        connection.close()
+
+    def on_error(job):
+        show_message_func(f"Failed to save the image: {job.error}", "error")
+
+    # One job per image name (lorebook_images.image_name is unique across all lorebooks), so adds never replace each other
+    job = job_manager.submit(f"lorebook_image_add:{image_name}", run, on_done=on_done, on_error=on_error)
+    if job.on_done is not on_done:
+        show_message_func(f"Image '{image_name}' is already being added.", "error")
+        return
+    show_message_func("Adding image...", "success")
 
 
 def edit_image(
@@ -646,12 +807,12 @@ def edit_image(
         show_message_func("Failed to retrieve image details.", "error")
         return
 
-    image_name, image_note, created_date, last_modified_date = image_details
+    image_name, image_note, created_date, last_modified_date, content_hash = image_details
 
     # Determine the image path
     lorebook_name = Path(lorebook["filename"]).stem  # Remove .json from the filename
     lorebook_folder = Path("Lorebooks") / lorebook_name / "images"
-    image_path = lorebook_folder / f"{image_name}.png"  # Construct the image path
+    image_path = blob_store.resolve(content_hash, lorebook_folder / f"{image_name}.png")  # Construct the image path
 
     # Create a modal window
     modal = ctk.CTkToplevel(parent)
@@ -758,11 +919,11 @@ def save_image_changes(
         show_message_func("Failed to retrieve image details.", "error")
         return
 
-    old_image_name, _, _, _ = image_details
+    old_image_name, _, _, _, content_hash = image_details
 
     # Check for duplicate image name, excluding the current image being edited
     if new_image_name != old_image_name and not is_image_name_unique(db_path, new_image_name, selected_lorebook_id, exclude_image_id=image_id):
-        show_message_func("An image with this name already exists in the lorebook.", "error")
+        show_message_func("An image with this name already exists in a lorebook.", "error")
         return
 
     # Determine the lorebook folder and file paths
@@ -771,8 +932,8 @@ def save_image_changes(
     old_image_path = lorebook_folder / f"{old_image_name}.png"
     new_image_path = lorebook_folder / f"{new_image_name}.png"
 
-    # Rename the file if the name has changed
-    if old_image_name != new_image_name:
+    # Rename the file if the name has changed (blob files are named by content, not by image name)
+    if old_image_name != new_image_name and not content_hash:
         try:
             if old_image_path.exists():
                 old_image_path.rename(new_image_path)
@@ -837,7 +998,10 @@ def browse_image_file(entry_widget):
         entry_widget.insert(0, file_path)
 
 def is_image_name_unique(db_path, image_name, lorebook_id, exclude_image_id=None):
-    """Check if the image name is unique within the specified lorebook."""
+    """
+    Check if the image name is free. lorebook_images.image_name is UNIQUE across all lorebooks,
+    so names used by other lorebooks count too (lorebook_id is kept for the callers).
+    """
     connection = sqlite3.connect(db_path)
     cursor = connection.cursor()
 
@@ -845,13 +1009,13 @@ def is_image_name_unique(db_path, image_name, lorebook_id, exclude_image_id=None
         # Exclude the current image ID from the uniqueness check
         cursor.execute("""
             SELECT COUNT(*) FROM lorebook_images
-            WHERE image_name = ? AND lorebook_id = ? AND id != ?
-        """, (image_name, lorebook_id, exclude_image_id))
+            WHERE image_name = ? AND id != ?
+        """, (image_name, exclude_image_id))
     else:
         cursor.execute("""
             SELECT COUNT(*) FROM lorebook_images
-            WHERE image_name = ? AND lorebook_id = ?
-        """, (image_name, lorebook_id))
+            WHERE image_name = ?
+        """, (image_name,))
 
     is_unique = cursor.fetchone()[0] == 0
     connection.close()
@@ -864,8 +1028,7 @@ def open_link_character_modal_for_lorebook(
     parent,
     lorebook_id,
     create_thumbnail,
-    get_character_list,
-    linked_character_ids_func,
+    get_unlinked_characters_page,
     handle_link_character_func,
     align_modal_top_left
 ):
@@ -912,23 +1075,22 @@ def open_link_character_modal_for_lorebook(
     page_label = ctk.CTkLabel(nav_frame, text="Page 1")
     page_label.pack(side="left", padx=5)
 
-    # Fetch all characters and setup pagination
-    all_characters = get_character_list()
-    linked_character_ids = linked_character_ids_func(lorebook_id)
-    filtered_characters = [char for char in all_characters if char["id"] not in linked_character_ids]
+    # Only the visible page is queried; linked characters are excluded in SQL
     items_per_page = 10
     current_page = [0]
+    total_characters = [0]
+    search_timer = [None]
+    placeholder_thumbnail = parent.placeholder_thumbnail((50, 75))
 
     def update_modal_display():
-        """Update the modal with the filtered and paginated character list."""
+        """Query the current page of unlinked characters and display it."""
         # Clear existing widgets
         for widget in scrollable_frame.winfo_children():
             widget.destroy()
 
-        # Paginate the filtered characters
-        start_idx = current_page[0] * items_per_page
-        end_idx = min(start_idx + items_per_page, len(filtered_characters))
-        page_characters = filtered_characters[start_idx:end_idx]
+        page_characters, total_characters[0] = get_unlinked_characters_page(
+            lorebook_id, search_var.get(), items_per_page, current_page[0] * items_per_page
+        )
 
         # Display characters
         for char in page_characters:
@@ -938,11 +1100,14 @@ def open_link_character_modal_for_lorebook(
             char_frame.grid_columnconfigure(2, weight=0)  # Link button column
             char_frame.pack(pady=5, padx=5, fill="x")
 
-            # Thumbnail
-            thumbnail = create_thumbnail(char["image_path"])
-            thumbnail_label = ctk.CTkLabel(char_frame, image=thumbnail, text="")
-            thumbnail_label.image = thumbnail  # Prevent garbage collection
+            # Thumbnail (placeholder until the real one loads in the background)
+            thumbnail_label = ctk.CTkLabel(char_frame, image=placeholder_thumbnail, text="")
             thumbnail_label.grid(row=0, column=0, padx=5, sticky="w")
+            create_thumbnail(
+                char["image_path"],
+                callback=lambda widget, thumbnail: widget.configure(image=thumbnail),
+                widget_ref=weakref.ref(thumbnail_label),
+            )
 
             # Character Name
             name_label = ctk.CTkLabel(char_frame, text=char["name"], anchor="w", font=("Arial", 12, "bold"))
@@ -952,31 +1117,45 @@ def open_link_character_modal_for_lorebook(
             link_button = ctk.CTkButton(
                 char_frame,
                 text="Link",
-                command=lambda char_id=char["id"]: handle_link_character_func(char_id, lorebook_id)
+                command=lambda char_id=char["id"]: link_character(char_id)
             )
             link_button.grid(row=0, column=2, padx=5, sticky="e")
 
         # Update page label
-        page_label.configure(text=f"Page {current_page[0] + 1} of {len(filtered_characters) // items_per_page + 1}")
+        total_pages = max(1, (total_characters[0] + items_per_page - 1) // items_per_page)
+        page_label.configure(text=f"Page {current_page[0] + 1} of {total_pages}")
         # Reset scrollbar to top
         scrollable_frame._parent_canvas.yview_moveto(0)
 
+    def link_character(char_id):
+        """Link the character, then redraw so it drops out of the list."""
+        handle_link_character_func(char_id, lorebook_id)
+        if not link_character_window.winfo_exists():
+            return
+        # Step back a page if the last character on this page was just linked
+        if current_page[0] > 0 and current_page[0] * items_per_page >= total_characters[0] - 1:
+            current_page[0] -= 1
+        update_modal_display()
+
     def navigate_page(direction):
         """Navigate between pages."""
-        total_pages = (len(filtered_characters) + items_per_page - 1) // items_per_page
+        total_pages = (total_characters[0] + items_per_page - 1) // items_per_page
         if 0 <= current_page[0] + direction < total_pages:
             current_page[0] += direction
             update_modal_display()
 
     def filter_characters(*args):
-        """Filter characters based on the search query."""
-        query = search_var.get().lower().strip()
-        nonlocal filtered_characters
-        filtered_characters = [
-            char for char in all_characters if char["id"] not in linked_character_ids and query in char["name"].lower()
-        ]
-        current_page[0] = 0  # Reset to the first page
-        update_modal_display()
+        """Re-query from the first page once typing pauses."""
+        if search_timer[0]:
+            link_character_window.after_cancel(search_timer[0])
+
+        def run_search():
+            search_timer[0] = None
+            if link_character_window.winfo_exists():
+                current_page[0] = 0  # Reset to the first page
+                update_modal_display()
+
+        search_timer[0] = link_character_window.after(300, run_search)
 
     # Bind the search bar to the filter function
     search_var.trace_add("write", filter_characters)
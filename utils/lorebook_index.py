@@ -0,0 +1,194 @@
+import json
+import sqlite3
+
+
+class LorebookIndex:
+    """
+    Per-entry index of SillyTavern world files. Entries (keys, secondary keys, comment, enabled flag)
+    are stored in lorebook_entries and mirrored into the lorebook_entries_fts full-text table
+    when SQLite has FTS5; otherwise the entry content is kept in lorebook_entries too and searches
+    fall back to LIKE over the same fields.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._fts_available = None
+
+    @property
+    def fts_available(self):
+        if self._fts_available is None:
+            with sqlite3.connect(self.db_path) as connection:
+                row = connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lorebook_entries_fts'"
+                ).fetchone()
+            self._fts_available = row is not None
+        return self._fts_available
+
+    @staticmethod
+    def parse_world_file(file_path):
+        """Read a world JSON file and return its entries as plain dicts."""
+        with open(file_path, "rb") as f:
+            return LorebookIndex.parse_world_data(f.read())
+
+    @staticmethod
+    def parse_world_data(raw_data):
+        """Parse the bytes of a world JSON file into entry dicts."""
+        entries = []
+        for raw in LorebookIndex.raw_entries(json.loads(raw_data)):
+            keys = raw.get("key", raw.get("keys", [])) or []
+            secondary_keys = raw.get("keysecondary", raw.get("secondary_keys", [])) or []
+            if "disable" in raw:
+                enabled = not raw.get("disable")
+            else:
+                enabled = raw.get("enabled", True)
+            entries.append({
+                "uid": str(raw.get("uid", raw.get("id", ""))),
+                "keys": [str(key) for key in keys],
+                "secondary_keys": [str(key) for key in secondary_keys],
+                "comment": raw.get("comment", "") or "",
+                "content": raw.get("content", "") or "",
+                "enabled": bool(enabled),
+            })
+        return entries
+
+    @staticmethod
+    def raw_entries(data):
+        """Return the entry dicts of parsed world JSON exactly as SillyTavern stores them."""
+        # World files keep entries in a dict keyed by uid; embedded character books use a list
+        raw_entries = data.get("entries", {}) if isinstance(data, dict) else []
+        if isinstance(raw_entries, dict):
+            raw_entries = raw_entries.values()
+        return [raw for raw in raw_entries if isinstance(raw, dict)]
+
+    def index_lorebook(self, cursor, lorebook_id, entries):
+        """Replace the indexed entries of one lorebook using an open cursor. Returns the entry count."""
+        self.remove_lorebook(cursor, lorebook_id)
+
+        for entry in entries:
+            cursor.execute("""
+                INSERT INTO lorebook_entries (lorebook_id, uid, keys, secondary_keys, comment, content_length, enabled, content)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                lorebook_id,
+                entry["uid"],
+                json.dumps(entry["keys"]),
+                json.dumps(entry["secondary_keys"]),
+                entry["comment"],
+                len(entry["content"]),
+                int(entry["enabled"]),
+                None if self.fts_available else entry["content"],  # FTS keeps its own copy
+            ))
+            if self.fts_available:
+                cursor.execute("""
+                    INSERT INTO lorebook_entries_fts (rowid, keys, secondary_keys, comment, content)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    cursor.lastrowid,
+                    "\n".join(entry["keys"]),
+                    "\n".join(entry["secondary_keys"]),
+                    entry["comment"],
+                    entry["content"],
+                ))
+        return len(entries)
+
+    def remove_lorebook(self, cursor, lorebook_id):
+        """Drop all indexed entries of a lorebook using an open cursor."""
+        if self.fts_available:
+            cursor.execute("""
+                DELETE FROM lorebook_entries_fts
+                WHERE rowid IN (SELECT id FROM lorebook_entries WHERE lorebook_id = ?)
+            """, (lorebook_id,))
+        cursor.execute("DELETE FROM lorebook_entries WHERE lorebook_id = ?", (lorebook_id,))
+
+    def get_entries(self, lorebook_id):
+        """Return the indexed entries of a lorebook in file order."""
+        with sqlite3.connect(self.db_path) as connection:
+            rows = connection.execute("""
+                SELECT id, uid, keys, secondary_keys, comment, content_length, enabled
+                FROM lorebook_entries
+                WHERE lorebook_id = ?
+                ORDER BY id
+            """, (lorebook_id,)).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def search(self, query, lorebook_id=None, limit=200):
+        """
+        Find entries whose keys, comment or content match the query.
+        Every word must match; with FTS5 words also match as prefixes ("drag" finds "dragon").
+        """
+        words = query.split()
+        if not words:
+            return []
+
+        source, params = self._matching_entries(words)
+        sql = f"""
+            SELECT e.id, e.uid, e.keys, e.secondary_keys, e.comment, e.content_length, e.enabled, e.lorebook_id
+            {source}
+        """
+        if lorebook_id is not None:
+            sql += " AND e.lorebook_id = ?"
+            params.append(lorebook_id)
+        sql += " ORDER BY e.lorebook_id, e.id LIMIT ?"
+        params.append(limit)
+
+        with sqlite3.connect(self.db_path) as connection:
+            try:
+                rows = connection.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                print(f"Error searching lorebook entries: {e}")
+                return []
+
+        results = []
+        for row in rows:
+            entry = self._row_to_entry(row[:7])
+            entry["lorebook_id"] = row[7]
+            results.append(entry)
+        return results
+
+    def matching_lorebook_ids(self, query):
+        """Return the IDs of lorebooks with at least one entry matching the query (same rules as search)."""
+        words = query.split()
+        if not words:
+            return set()
+
+        source, params = self._matching_entries(words)
+        with sqlite3.connect(self.db_path) as connection:
+            try:
+                return {row[0] for row in connection.execute(f"SELECT DISTINCT e.lorebook_id {source}", params)}
+            except sqlite3.OperationalError as e:
+                print(f"Error searching lorebook entries: {e}")
+                return set()
+
+    def _matching_entries(self, words):
+        """FROM/WHERE clause (and params) selecting entries e whose keys, comment or content match every word."""
+        if self.fts_available:
+            match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+            source = """
+                FROM lorebook_entries_fts f
+                JOIN lorebook_entries e ON e.id = f.rowid
+                WHERE lorebook_entries_fts MATCH ?
+            """
+            return source, [match]
+
+        source = "FROM lorebook_entries e WHERE 1 = 1"
+        params = []
+        for word in words:
+            source += (
+                " AND (e.keys LIKE ? ESCAPE '\\' OR e.secondary_keys LIKE ? ESCAPE '\\'"
+                " OR e.comment LIKE ? ESCAPE '\\' OR e.content LIKE ? ESCAPE '\\')"
+            )
+            escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.extend([f"%{escaped}%"] * 4)
+        return source, params
+
+    @staticmethod
+    def _row_to_entry(row):
+        return {
+            "id": row[0],
+            "uid": row[1],
+            "keys": json.loads(row[2]),
+            "secondary_keys": json.loads(row[3]),
+            "comment": row[4],
+            "content_length": row[5],
+            "enabled": bool(row[6]),
+        }
@@ -0,0 +1,243 @@
+import json
+import os
+import re
+import threading
+from utils.lorebook_index import LorebookIndex
+
+# SillyTavern's selectiveLogic values for secondary keys
+AND_ANY, NOT_ALL, NOT_ANY, AND_ALL = 0, 1, 2, 3
+
+REGEX_KEY = re.compile(r"^/(.+)/([a-z]*)$", re.DOTALL)
+
+
+def _trie_pattern(keys):
+    """
+    Build a regex alternation shaped like a trie ("dra(?:gon|ke)" instead of "dragon|drake")
+    so each text position is tested against shared prefixes once. Longer keys are preferred.
+    """
+    trie = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        # Walk single-child chains as plain literals so recursion depth follows branch points, not key length
+        prefix = []
+        while len(node) == 1 and "" not in node:
+            (ch, node), = node.items()
+            prefix.append(re.escape(ch))
+
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return "".join(prefix)
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = "(?:" + pattern + ")?"  # Greedy, so the longest key wins
+        return "".join(prefix) + pattern
+
+    try:
+        return build(trie)
+    except RecursionError:
+        # Pathological nesting (e.g. "a", "aa", "aaa", ...): fall back to a flat alternation
+        return "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True))
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class _KeyGroup:
+    """All literal keys sharing one case mode, compiled into a single lookahead scan."""
+
+    def __init__(self, case_sensitive):
+        self.case_sensitive = case_sensitive
+        self.owners = {}  # normalized key -> [(entry_index, is_secondary, whole_words, original_key)]
+        self.regex = None
+        self.prefixes = {}
+
+    def normalize(self, key):
+        return key if self.case_sensitive else key.lower()
+
+    def add(self, key, entry_index, is_secondary, whole_words):
+        self.owners.setdefault(self.normalize(key), []).append((entry_index, is_secondary, whole_words, key))
+
+    def compile(self):
+        if not self.owners:
+            return
+        keys = list(self.owners)
+        # The lookahead reports a match at every position, including overlapping ones.
+        # Case-insensitive keys are stored lowercased and scanned against lowercased text,
+        # which is about twice as fast as re.IGNORECASE.
+        try:
+            self.regex = re.compile("(?=(" + _trie_pattern(keys) + "))")
+        except (RecursionError, OverflowError, re.error):
+            self.regex = re.compile("(?=(" + "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True)) + "))")
+        # At one position only the longest key is reported; map it to every key it starts with
+        key_set = set(keys)
+        for key in keys:
+            self.prefixes[key] = [key[:i] for i in range(1, len(key) + 1) if key[:i] in key_set]
+
+    def scan(self, text, on_hit):
+        if not self.regex:
+            return
+        text = self.normalize(text)
+        text_length = len(text)
+        for match in self.regex.finditer(text):
+            start = match.start()
+            for key in self.prefixes[match.group(1)]:
+                end = start + len(key)
+                boundary = (start == 0 or not _is_word_char(text[start - 1])) and (
+                    end >= text_length or not _is_word_char(text[end])
+                )
+                for entry_index, is_secondary, whole_words, original_key in self.owners[key]:
+                    # Like SillyTavern, whole-word matching only applies to single-word keys
+                    if whole_words and not boundary and not any(ch.isspace() for ch in key):
+                        continue
+                    on_hit(entry_index, is_secondary, original_key)
+
+
+class LorebookMatcher:
+    """
+    Compiled keyword-activation check for one world file. Literal keys are combined into one
+    case-insensitive and one case-sensitive scan; "/regex/flags" keys are compiled individually.
+    """
+
+    def __init__(self, raw_entries, case_sensitive=False, whole_words=False):
+        self.entries = []
+        self.groups = {False: _KeyGroup(False), True: _KeyGroup(True)}
+        self.regex_keys = []  # (compiled, entry_index, is_secondary, original_key)
+
+        for raw in raw_entries:
+            entry = self._read_entry(raw, case_sensitive, whole_words)
+            index = len(self.entries)
+            self.entries.append(entry)
+            if not entry["enabled"]:
+                continue
+            for is_secondary, keys in ((False, entry["keys"]), (True, entry["secondary_keys"])):
+                for key in keys:
+                    self._add_key(key, index, is_secondary, entry)
+
+        for group in self.groups.values():
+            group.compile()
+
+    @classmethod
+    def from_file(cls, file_path, case_sensitive=False, whole_words=False):
+        with open(file_path, "rb") as f:
+            data = json.loads(f.read())
+        return cls(LorebookIndex.raw_entries(data), case_sensitive, whole_words)
+
+    @staticmethod
+    def _read_entry(raw, case_sensitive, whole_words):
+        keys = [str(key).strip() for key in (raw.get("key", raw.get("keys", [])) or []) if str(key).strip()]
+        secondary = [
+            str(key).strip()
+            for key in (raw.get("keysecondary", raw.get("secondary_keys", [])) or [])
+            if str(key).strip()
+        ]
+        entry_case = raw.get("caseSensitive", raw.get("case_sensitive"))
+        entry_whole = raw.get("matchWholeWords")
+        return {
+            "uid": str(raw.get("uid", raw.get("id", ""))),
+            "comment": raw.get("comment", "") or "",
+            "keys": keys,
+            "secondary_keys": secondary,
+            "enabled": not raw.get("disable", False) if "disable" in raw else bool(raw.get("enabled", True)),
+            "constant": bool(raw.get("constant", False)),
+            "selective": bool(raw.get("selective", True)),
+            "selective_logic": raw.get("selectiveLogic", AND_ANY) or AND_ANY,
+            "case_sensitive": case_sensitive if entry_case is None else bool(entry_case),
+            "whole_words": whole_words if entry_whole is None else bool(entry_whole),
+        }
+
+    def _add_key(self, key, index, is_secondary, entry):
+        regex_match = REGEX_KEY.match(key)
+        if regex_match:
+            flags = 0
+            if "i" in regex_match.group(2):
+                flags |= re.IGNORECASE
+            if "s" in regex_match.group(2):
+                flags |= re.DOTALL
+            if "m" in regex_match.group(2):
+                flags |= re.MULTILINE
+            try:
+                self.regex_keys.append((re.compile(regex_match.group(1), flags), index, is_secondary, key))
+                return
+            except re.error:
+                pass  # Not a valid regex after all; treat it as literal text
+        self.groups[entry["case_sensitive"]].add(key, index, is_secondary, entry["whole_words"])
+
+    def match(self, text):
+        """
+        Return the entries that would activate for the text, in file order, as dicts with
+        uid, comment, constant, and the primary/secondary keys that matched.
+        """
+        primary_hits = {}
+        secondary_hits = {}
+
+        def on_hit(entry_index, is_secondary, key):
+            (secondary_hits if is_secondary else primary_hits).setdefault(entry_index, set()).add(key)
+
+        for group in self.groups.values():
+            group.scan(text, on_hit)
+        for regex, entry_index, is_secondary, key in self.regex_keys:
+            if regex.search(text):
+                on_hit(entry_index, is_secondary, key)
+
+        results = []
+        for index, entry in enumerate(self.entries):
+            if not entry["enabled"]:
+                continue
+            primary = primary_hits.get(index, set())
+            secondary = secondary_hits.get(index, set())
+            if not entry["constant"]:
+                if not primary:
+                    continue
+                if entry["selective"] and entry["secondary_keys"] and not self._secondary_ok(entry, secondary):
+                    continue
+            results.append({
+                "uid": entry["uid"],
+                "comment": entry["comment"],
+                "constant": entry["constant"],
+                "primary_matches": sorted(primary),
+                "secondary_matches": sorted(secondary),
+            })
+        return results
+
+    @staticmethod
+    def _secondary_ok(entry, matched):
+        total = len(set(entry["secondary_keys"]))
+        logic = entry["selective_logic"]
+        if logic == NOT_ALL:
+            return len(matched) < total
+        if logic == NOT_ANY:
+            return not matched
+        if logic == AND_ALL:
+            return len(matched) >= total
+        return bool(matched)  # AND_ANY
+
+
+class LorebookMatcherCache:
+    """Compiled matchers per world file, rebuilt only when the file's size or mtime changes."""
+
+    def __init__(self):
+        self._matchers = {}
+        self._lock = threading.Lock()
+
+    def get(self, file_path, case_sensitive=False, whole_words=False):
+        stat = os.stat(file_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        key = (str(file_path), case_sensitive, whole_words)
+        with self._lock:
+            cached = self._matchers.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        matcher = LorebookMatcher.from_file(file_path, case_sensitive, whole_words)
+        with self._lock:
+            self._matchers[key] = (signature, matcher)
+        return matcher
+
+
+matcher_cache = LorebookMatcherCache()
@@ -0,0 +1,178 @@
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import customtkinter as ctk
+from PIL import Image
+from utils.card_metadata import PNGMetadataReader
+from utils.image_ingest import thumbnail_source
+
+CACHE_SIZE = 64
+PORTRAIT_WIDTH = 200
+NEIGHBOUR_RADIUS = 3  # Characters warmed on each side of the selection
+
+
+class CharacterPrefetcher:
+    """
+    Warms what selecting a character needs (card metadata, sidebar portrait, list, related and extra
+    image thumbnails) for the characters around the selection and on the neighbouring pages.
+    Work runs on one low-priority thread; each new selection replaces the previous plan, so rapid
+    browsing never queues up stale work.
+    """
+
+    def __init__(self, db_path, create_thumbnail, create_thumbnail_small):
+        self.db_path = db_path
+        self.create_thumbnail = create_thumbnail
+        self.create_thumbnail_small = create_thumbnail_small
+        self._metadata = OrderedDict()  # (path, mtime_ns) -> highest-spec card fields (or the parse error)
+        self._portraits = OrderedDict()  # (path, mtime_ns) -> sidebar CTkImage
+        self._lock = threading.Lock()
+        self._tasks = queue.Queue()
+        self._generation = 0
+        threading.Thread(target=self._worker, name="prefetch", daemon=True).start()
+
+    ########## Cached lookups (used by the selection itself) ##########
+
+    def metadata(self, path):
+        """Highest-spec card fields of a card file. Raises like PNGMetadataReader on unreadable cards."""
+        key = self._key(path)
+        result = self._cached(self._metadata, key)
+        if result is None:
+            try:
+                result = PNGMetadataReader.get_highest_spec_fields(PNGMetadataReader.extract_text_metadata(str(path)))
+            except Exception as e:
+                result = e
+            self._store(self._metadata, key, result)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def portrait(self, path):
+        """The sidebar image of a card, scaled to PORTRAIT_WIDTH. Raises if the image can't be read."""
+        key = self._key(path)
+        image = self._cached(self._portraits, key)
+        if image is None:
+            with Image.open(path) as img:
+                height = int(PORTRAIT_WIDTH / (img.width / img.height))
+                image = ctk.CTkImage(img.resize((PORTRAIT_WIDTH, height), Image.Resampling.LANCZOS),
+                                     size=(PORTRAIT_WIDTH, height))
+            self._store(self._portraits, key, image)
+        return image
+
+    @staticmethod
+    def _key(path):
+        try:
+            return str(Path(path)), os.stat(path).st_mtime_ns
+        except OSError:
+            return str(Path(path)), None
+
+    def _cached(self, cache, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _store(self, cache, key, value):
+        if key[1] is None:
+            return  # Missing files are not cached
+        with self._lock:
+            cache[key] = value
+            while len(cache) > CACHE_SIZE:
+                cache.popitem(last=False)
+
+    ########## Prefetching ##########
+
+    def schedule(self, character_ids, page_character_ids=()):
+        """
+        Replace the pending plan: fully warm character_ids (nearest first), then the list thumbnails
+        of page_character_ids (the next and previous pages).
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        for character_id in character_ids:
+            self._tasks.put((generation, self._warm_character, character_id))
+        for character_id in page_character_ids:
+            self._tasks.put((generation, self._warm_list_thumbnail, character_id))
+
+    def schedule_around(self, ordered_ids, character_id, page_size, radius=NEIGHBOUR_RADIUS):
+        """Plan for a selection in a paged list: its neighbours nearest first, then the adjacent pages."""
+        try:
+            index = ordered_ids.index(character_id)
+        except ValueError:
+            self.cancel()
+            return
+        nearby = []
+        for distance in range(1, radius + 1):
+            for neighbour in (index + distance, index - distance):
+                if 0 <= neighbour < len(ordered_ids):
+                    nearby.append(ordered_ids[neighbour])
+
+        page_start = index - index % page_size
+        pages = ordered_ids[page_start + page_size:page_start + 2 * page_size]
+        pages += ordered_ids[max(page_start - page_size, 0):page_start]
+        skip = set(nearby)
+        self.schedule(nearby, [other for other in pages if other not in skip])
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+
+    def _worker(self):
+        if sys.platform.startswith("linux"):
+            try:
+                # Per-thread niceness on Linux, so prefetching yields to the UI and real jobs
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+            except (AttributeError, OSError):
+                pass
+        while True:
+            generation, task, character_id = self._tasks.get()
+            if generation != self._generation:
+                continue  # Superseded by a newer selection
+            try:
+                task(character_id)
+            except Exception as e:
+                print(f"Prefetch failed for character {character_id}: {e}")
+
+    def _main_file(self, connection, character_id):
+        row = connection.execute("SELECT main_file FROM characters WHERE id = ?", (character_id,)).fetchone()
+        return row[0] if row and row[0] else None
+
+    def _warm_list_thumbnail(self, character_id):
+        with sqlite3.connect(self.db_path) as connection:
+            main_file = self._main_file(connection, character_id)
+        if main_file:
+            self.create_thumbnail(main_file)
+
+    def _warm_character(self, character_id):
+        with sqlite3.connect(self.db_path) as connection:
+            main_file = self._main_file(connection, character_id)
+            related = connection.execute("""
+                SELECT c.name, c.main_file FROM characters c
+                JOIN character_relationships r ON c.id = r.related_character_id
+                WHERE r.character_id = ?
+            """, (character_id,)).fetchall()
+            images = connection.execute("""
+                SELECT c.name, ci.image_name, ci.content_hash
+                FROM character_images ci JOIN characters c ON c.id = ci.character_id
+                WHERE ci.character_id = ?
+            """, (character_id,)).fetchall()
+
+        if main_file and os.path.exists(main_file):
+            self.create_thumbnail(main_file)
+            try:
+                self.metadata(main_file)
+                self.portrait(main_file)
+            except Exception:
+                pass  # The selection shows its own error for unreadable cards
+        for name, related_file in related:
+            if related_file:
+                # Same path as load_related_characters builds, so the thumbnail cache key matches
+                self.create_thumbnail_small(str(Path("CharacterCards") / name / related_file))
+        for name, image_name, content_hash in images:
+            legacy_path = Path("CharacterCards") / name / "ExtraImages" / f"{image_name}.png"
+            self.create_thumbnail(thumbnail_source(content_hash, legacy_path))
@@ -0,0 +1,131 @@
+import time
+import customtkinter as ctk
+
+
+class RelationshipDashboard:
+    """
+    Cross-reference overview: library totals, unlinked and most-linked lorebooks, the most used tags,
+    and (when a character is selected) its lorebooks, related characters and characters sharing its tags.
+    Each section is one read-only textbox, so redrawing stays cheap on large libraries.
+    """
+
+    def __init__(self, parent, job_manager, queries):
+        self.parent = parent
+        self.job_manager = job_manager
+        self.queries = queries
+        self.modal = None
+        self.sections = {}
+
+    def open(self, character_id=None):
+        """Open (or refresh) the dashboard, focused on character_id when given."""
+        if not (self.modal and self.modal.winfo_exists()):
+            self._build()
+        else:
+            self.modal.focus_set()
+        self.refresh(character_id)
+
+    def _build(self):
+        self.modal = ctk.CTkToplevel(self.parent)
+        self.modal.title("Relationship Dashboard")
+        self.modal.geometry("900x640")
+        self.modal.transient(self.parent)
+
+        self.status_label = ctk.CTkLabel(self.modal, text="", anchor="w")
+        self.status_label.pack(fill="x", padx=10, pady=(10, 0))
+
+        grid = ctk.CTkFrame(self.modal, fg_color="transparent")
+        grid.pack(fill="both", expand=True, padx=10, pady=10)
+        for column in range(3):
+            grid.grid_columnconfigure(column, weight=1, uniform="section")
+        for row in range(2):
+            grid.grid_rowconfigure(row, weight=1)
+
+        layout = [
+            ("totals", "Library", 0, 0),
+            ("unlinked", "Lorebooks With No Characters", 0, 1),
+            ("most_linked", "Most Linked Lorebooks", 0, 2),
+            ("character_lorebooks", "Character's Lorebooks & Relations", 1, 0),
+            ("sharing_tags", "Characters Sharing Tags", 1, 1),
+            ("top_tags", "Most Used Tags", 1, 2),
+        ]
+        self.sections = {}
+        for key, title, row, column in layout:
+            frame = ctk.CTkFrame(grid)
+            frame.grid(row=row, column=column, sticky="nsew", padx=5, pady=5)
+            ctk.CTkLabel(frame, text=title, font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=8, pady=(6, 0))
+            textbox = ctk.CTkTextbox(frame, wrap="word")
+            textbox.pack(fill="both", expand=True, padx=6, pady=6)
+            textbox.configure(state="disabled")
+            self.sections[key] = textbox
+
+    def refresh(self, character_id=None):
+        """Run all dashboard queries in the background and fill the sections when done."""
+        self.status_label.configure(text="Loading...")
+
+        def run(job):
+            started = time.perf_counter()
+            result = {"summary": self.queries.dashboard_summary()}
+            if character_id is not None:
+                result["character"] = self.queries.character_overview(character_id)
+            result["elapsed"] = time.perf_counter() - started
+            return result
+
+        def on_done(job):
+            if self.modal and self.modal.winfo_exists():
+                self._render(job.result)
+
+        def on_error(job):
+            if self.modal and self.modal.winfo_exists():
+                self.status_label.configure(text=f"Error loading dashboard: {job.error}")
+
+        self.job_manager.submit("relationship_dashboard", run, on_done=on_done, on_error=on_error)
+
+    def _render(self, result):
+        summary = result["summary"]
+
+        self._set_text("totals", [
+            f"Characters: {summary['characters']}",
+            f"Lorebooks: {summary['lorebooks']}",
+            f"Lorebook links: {summary['lorebook_links']}",
+            f"Character relationships: {summary['relationships']}",
+            "",
+            f"Characters without lorebooks: {summary['characters_without_lorebooks']}",
+            f"Characters without tags: {summary['characters_without_tags']}",
+            f"Lorebooks with no characters: {summary['unlinked_lorebook_count']}",
+        ])
+        self._set_text("unlinked", self._with_more(summary["unlinked_lorebooks"], summary["unlinked_lorebook_count"]))
+        self._set_text("most_linked", [f"{filename}  ({count})" for filename, count in summary["most_linked_lorebooks"]])
+        self._set_text("top_tags", [f"{name}  ({count})" for name, count in summary["top_tags"]])
+
+        character = result.get("character")
+        if character is None:
+            self._set_text("character_lorebooks", ["Select a character to see its links."])
+            self._set_text("sharing_tags", ["Select a character to see characters sharing its tags."])
+        else:
+            self._set_text("character_lorebooks", [
+                character["name"],
+                "",
+                "Lorebooks:",
+                *([f"  {name}" for name in character["lorebooks"]] or ["  (none)"]),
+                "",
+                "Related characters:",
+                *([f"  {name}" for name in character["related"]] or ["  (none)"]),
+            ])
+            self._set_text("sharing_tags", [
+                f"{other['name']}  ({', '.join(other['shared_tags'])})" for other in character["sharing_tags"]
+            ] or ["No other characters share this character's tags."])
+
+        self.status_label.configure(text=f"Loaded in {result['elapsed'] * 1000:.0f} ms")
+
+    @staticmethod
+    def _with_more(lines, total):
+        if total > len(lines):
+            return lines + [f"... and {total - len(lines)} more"]
+        return lines
+
+    def _set_text(self, key, lines):
+        textbox = self.sections[key]
+        textbox.configure(state="normal")
+        textbox.delete("1.0", "end")
+        textbox.insert("1.0", "\n".join(lines) if lines else "(none)")
+        textbox.configure(state="disabled")
@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+from collections import deque
+
+
+class RelationshipGraph:
+    """
+    In-memory adjacency index over character_relationships (stored as two rows per link).
+    Loaded once on first use and kept in step by link(), unlink() and remove_character(),
+    so neighbourhood, component and path queries never go back to the database.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._adjacency = None  # character id -> set of related character ids
+        self._lock = threading.RLock()
+
+    def _graph(self):
+        with self._lock:
+            if self._adjacency is None:
+                adjacency = {}
+                with sqlite3.connect(self.db_path) as connection:
+                    rows = connection.execute(
+                        "SELECT character_id, related_character_id FROM character_relationships"
+                    )
+                    for a, b in rows:
+                        if a != b:
+                            adjacency.setdefault(a, set()).add(b)
+                            adjacency.setdefault(b, set()).add(a)
+                self._adjacency = adjacency
+            return self._adjacency
+
+    def reload(self):
+        """Drop the in-memory index; it is rebuilt on the next query."""
+        with self._lock:
+            self._adjacency = None
+
+    ########## Updates (database + index) ##########
+
+    def are_linked(self, a, b):
+        return b in self._graph().get(a, ())
+
+    def link(self, a, b):
+        """Link two characters in both directions. Returns False if they were already linked."""
+        if a == b:
+            raise ValueError("A character cannot be linked to itself.")
+        with self._lock:
+            if self.are_linked(a, b):
+                return False
+            with sqlite3.connect(self.db_path) as connection:
+                connection.executemany("""
+                    INSERT OR IGNORE INTO character_relationships (character_id, related_character_id)
+                    VALUES (?, ?)
+                """, [(a, b), (b, a)])
+            self._adjacency.setdefault(a, set()).add(b)
+            self._adjacency.setdefault(b, set()).add(a)
+            return True
+
+    def unlink(self, a, b):
+        """Remove the link between two characters in both directions."""
+        with self._lock:
+            with sqlite3.connect(self.db_path) as connection:
+                connection.executemany("""
+                    DELETE FROM character_relationships
+                    WHERE character_id = ? AND related_character_id = ?
+                """, [(a, b), (b, a)])
+            graph = self._graph()
+            graph.get(a, set()).discard(b)
+            graph.get(b, set()).discard(a)
+
+    def remove_character(self, character_id, cursor=None):
+        """Delete every relationship of a character (e.g. when the character is deleted)."""
+        with self._lock:
+            sql = "DELETE FROM character_relationships WHERE character_id = ? OR related_character_id = ?"
+            if cursor is not None:
+                cursor.execute(sql, (character_id, character_id))
+            else:
+                with sqlite3.connect(self.db_path) as connection:
+                    connection.execute(sql, (character_id, character_id))
+            graph = self._graph()
+            for other in graph.pop(character_id, set()):
+                graph.get(other, set()).discard(character_id)
+
+    ########## Queries ##########
+
+    def neighbours(self, character_id):
+        return set(self._graph().get(character_id, ()))
+
+    def neighbourhood(self, character_id, hops=1):
+        """Characters within `hops` links of a character, as {id: distance} (the character itself at 0)."""
+        graph = self._graph()
+        distances = {character_id: 0}
+        frontier = [character_id]
+        for distance in range(1, hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for other in graph.get(node, ()):
+                    if other not in distances:
+                        distances[other] = distance
+                        next_frontier.append(other)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return distances
+
+    def component(self, character_id):
+        """Every character reachable from this one (its "universe"), including itself."""
+        graph = self._graph()
+        seen = {character_id}
+        queue = deque([character_id])
+        while queue:
+            for other in graph.get(queue.popleft(), ()):
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        return seen
+
+    def components(self, min_size=2):
+        """All connected components with at least min_size characters, largest first."""
+        seen = set()
+        result = []
+        for node in self._graph():
+            if node in seen:
+                continue
+            members = self.component(node)
+            seen |= members
+            if len(members) >= min_size:
+                result.append(members)
+        result.sort(key=len, reverse=True)
+        return result
+
+    def shortest_path(self, start, goal):
+        """Shortest chain of character ids from start to goal (inclusive), or None if unconnected."""
+        if start == goal:
+            return [start]
+        graph = self._graph()
+        # Bidirectional BFS: expand the smaller frontier each round
+        parents = {start: None}
+        children = {goal: None}
+        front, back = {start}, {goal}
+        while front and back:
+            if len(front) > len(back):
+                front, back = back, front
+                parents, children = children, parents
+            next_front = set()
+            for node in front:
+                for other in graph.get(node, ()):
+                    if other in parents:
+                        continue
+                    parents[other] = node
+                    if other in children:
+                        return self._join_path(other, parents, children, start)
+                    next_front.add(other)
+            front = next_front
+        return None
+
+    @staticmethod
+    def _join_path(meeting, parents, children, start):
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        node = children[meeting]
+        while node is not None:
+            path.append(node)
+            node = children[node]
+        # The two searches may have been swapped while expanding; orient the path from start
+        return path if path[0] == start else path[::-1]
+
+    def edges(self, nodes=None):
+        """Each link once, as (a, b) with a < b, optionally restricted to links inside `nodes`."""
+        graph = self._graph()
+        sources = graph if nodes is None else nodes
+        result = []
+        for a in sources:
+            for b in graph.get(a, ()):
+                if a < b and (nodes is None or b in nodes):
+                    result.append((a, b))
+        return result
@@ -0,0 +1,273 @@
+import math
+import sqlite3
+import customtkinter as ctk
+
+NODE_RADIUS = 5
+RING_SPACING = 40
+LABEL_LIMIT = 300  # Above this many nodes only the focused character and path get labels
+
+
+class RelationshipGraphView:
+    """
+    Canvas view of the character relationship graph: the selected character's universe (connected
+    component), its N-hop neighbourhood, or every linked character. Nodes and links come from the
+    in-memory RelationshipGraph and names from a single query, so large graphs draw without a
+    database round trip per node.
+    """
+
+    def __init__(self, parent, db_path, graph, on_select):
+        self.parent = parent
+        self.db_path = db_path
+        self.graph = graph
+        self.on_select = on_select
+        self.modal = None
+        self.character_id = None
+        self.names = {}
+        self.positions = {}
+        self.path = []
+
+    def open(self, character_id=None):
+        if not (self.modal and self.modal.winfo_exists()):
+            self._build()
+        else:
+            self.modal.focus_set()
+        self.character_id = character_id
+        self.path = []
+        if character_id is None:
+            self.scope_var.set("All")
+        self.redraw()
+
+    def _build(self):
+        self.modal = ctk.CTkToplevel(self.parent)
+        self.modal.title("Relationship Graph")
+        self.modal.geometry("1000x720")
+        self.modal.transient(self.parent)
+
+        controls = ctk.CTkFrame(self.modal)
+        controls.pack(fill="x", padx=10, pady=(10, 5))
+
+        self.scope_var = ctk.StringVar(value="Universe")
+        ctk.CTkSegmentedButton(
+            controls, values=["Universe", "Neighbourhood", "All"], variable=self.scope_var,
+            command=lambda _: self.redraw()
+        ).pack(side="left", padx=5)
+
+        ctk.CTkLabel(controls, text="Hops:").pack(side="left", padx=(10, 2))
+        self.hops_var = ctk.StringVar(value="2")
+        ctk.CTkOptionMenu(
+            controls, values=[str(hops) for hops in range(1, 7)], variable=self.hops_var, width=60,
+            command=lambda _: self.redraw()
+        ).pack(side="left", padx=2)
+
+        self.path_entry = ctk.CTkEntry(controls, placeholder_text="Path to character...", width=200)
+        self.path_entry.pack(side="left", padx=(15, 2))
+        self.path_entry.bind("<Return>", lambda event: self.find_path())
+        ctk.CTkButton(controls, text="Find Path", width=90, command=self.find_path).pack(side="left", padx=2)
+
+        self.status_label = ctk.CTkLabel(self.modal, text="", anchor="w")
+        self.status_label.pack(fill="x", padx=10)
+
+        self.canvas = ctk.CTkCanvas(self.modal, background="#1e1e1e", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+
+        # Drag to pan, wheel to zoom, click a node to inspect, double-click to select it
+        self.canvas.bind("<ButtonPress-1>", lambda event: self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind("<B1-Motion>", lambda event: self.canvas.scan_dragto(event.x, event.y, gain=1))
+        self.canvas.bind("<MouseWheel>", self._on_zoom)
+        self.canvas.bind("<Button-4>", lambda event: self._zoom(event, 1.1))
+        self.canvas.bind("<Button-5>", lambda event: self._zoom(event, 1 / 1.1))
+        self.canvas.tag_bind("node", "<Button-1>", self._on_node_click)
+        self.canvas.tag_bind("node", "<Double-Button-1>", self._on_node_double_click)
+
+    ########## Data ##########
+
+    def _load_names(self):
+        with sqlite3.connect(self.db_path) as connection:
+            self.names = dict(connection.execute("SELECT id, name FROM characters"))
+
+    def _visible_nodes(self):
+        """Return (nodes, root) for the current scope."""
+        scope = self.scope_var.get()
+        if scope != "All" and self.character_id is not None:
+            if scope == "Neighbourhood":
+                return set(self.graph.neighbourhood(self.character_id, int(self.hops_var.get()))), self.character_id
+            return self.graph.component(self.character_id), self.character_id
+
+        nodes = set()
+        for members in self.graph.components():
+            nodes |= members
+        return nodes, None
+
+    ########## Layout ##########
+
+    def _layout(self, nodes, root):
+        """
+        Radial layout per connected component (rings by hop distance from the component's root),
+        with components packed left to right in rows. Linear in nodes + links.
+        """
+        positions = {}
+        seen = set()
+        components = []
+        for node in nodes:
+            if node in seen:
+                continue
+            members = {member for ring in self._rings(node, nodes) for member in ring}
+            seen |= members
+            # Centre each component on the focused character or its best-connected member
+            start = root if root in members else max(members, key=lambda member: len(self.graph.neighbours(member)))
+            components.append(self._rings(start, members))
+        components.sort(key=lambda rings: sum(len(ring) for ring in rings), reverse=True)
+
+        row_width = max(1200, int(math.sqrt(len(nodes)) * RING_SPACING * 2))
+        x = y = row_height = 0
+        for rings in components:
+            radii = self._ring_radii(rings)
+            size = 2 * radii[-1] + RING_SPACING
+            if x and x + size > row_width:
+                x, y, row_height = 0, y + row_height, 0
+            center_x, center_y = x + size / 2, y + size / 2
+            for ring, radius in zip(rings, radii):
+                for index, node in enumerate(ring):
+                    angle = 2 * math.pi * index / len(ring)
+                    positions[node] = (center_x + radius * math.cos(angle), center_y + radius * math.sin(angle))
+            x += size
+            row_height = max(row_height, size)
+        return positions
+
+    def _rings(self, start, allowed):
+        """BFS from start within allowed nodes, ordered so neighbours sit close to their parent."""
+        rings = [[start]]
+        seen = {start}
+        while True:
+            next_ring = []
+            for node in rings[-1]:
+                for other in sorted(self.graph.neighbours(node)):
+                    if other in allowed and other not in seen:
+                        seen.add(other)
+                        next_ring.append(other)
+            if not next_ring:
+                return rings
+            rings.append(next_ring)
+
+    @staticmethod
+    def _ring_radii(rings):
+        radii = [0]
+        for ring in rings[1:]:
+            # Keep neighbouring nodes on a ring at least RING_SPACING / 2 apart
+            needed = len(ring) * RING_SPACING / 2 / (2 * math.pi)
+            radii.append(max(radii[-1] + RING_SPACING, needed))
+        return radii
+
+    ########## Drawing ##########
+
+    def redraw(self):
+        if not (self.modal and self.modal.winfo_exists()):
+            return
+        self._load_names()
+        nodes, root = self._visible_nodes()
+        self.positions = self._layout(nodes, root)
+        edges = self.graph.edges(nodes)
+
+        canvas = self.canvas
+        canvas.delete("all")
+
+        path_edges = {tuple(sorted(pair)) for pair in zip(self.path, self.path[1:])}
+        for a, b in edges:
+            (x1, y1), (x2, y2) = self.positions[a], self.positions[b]
+            on_path = (a, b) in path_edges
+            canvas.create_line(
+                x1, y1, x2, y2, fill="#ff9f1c" if on_path else "#555555", width=3 if on_path else 1
+            )
+
+        path_nodes = set(self.path)
+        show_all_labels = len(nodes) <= LABEL_LIMIT
+        for node, (x, y) in self.positions.items():
+            if node == self.character_id:
+                color = "#d8bfd8"
+            elif node in path_nodes:
+                color = "#ff9f1c"
+            else:
+                color = "#4b3e72"
+            canvas.create_oval(
+                x - NODE_RADIUS, y - NODE_RADIUS, x + NODE_RADIUS, y + NODE_RADIUS,
+                fill=color, outline="", tags=("node", f"id{node}")
+            )
+            if show_all_labels or node == self.character_id or node in path_nodes:
+                canvas.create_text(
+                    x, y + NODE_RADIUS + 8, text=self.names.get(node, str(node)), fill="#dddddd", font=("Arial", 9)
+                )
+
+        # Start with the focused character (or the top-left of the graph) in view
+        if self.character_id in self.positions:
+            x, y = self.positions[self.character_id]
+        else:
+            x, y = 0, 0
+        canvas.update_idletasks()
+        canvas.xview_moveto(0)
+        canvas.yview_moveto(0)
+        canvas.scan_mark(0, 0)
+        canvas.scan_dragto(int(canvas.winfo_width() / 2 - x), int(canvas.winfo_height() / 2 - y), gain=1)
+
+        focus = self.names.get(self.character_id, "") if self.character_id is not None else ""
+        self.status_label.configure(
+            text=f"{len(nodes)} characters, {len(edges)} links" + (f" - focused on {focus}" if focus else "")
+        )
+
+    def _on_zoom(self, event):
+        self._zoom(event, 1.1 if event.delta > 0 else 1 / 1.1)
+
+    def _zoom(self, event, factor):
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        self.canvas.scale("all", x, y, factor, factor)
+
+    def _node_at_event(self):
+        for tag in self.canvas.gettags("current"):
+            if tag.startswith("id"):
+                return int(tag[2:])
+        return None
+
+    def _on_node_click(self, event):
+        node = self._node_at_event()
+        if node is None:
+            return
+        self.status_label.configure(
+            text=f"{self.names.get(node, node)} - {len(self.graph.neighbours(node))} related (double-click to select)"
+        )
+
+    def _on_node_double_click(self, event):
+        node = self._node_at_event()
+        if node is not None:
+            self.on_select(node)
+            self.character_id = node
+            self.path = []
+            self.redraw()
+
+    ########## Paths ##########
+
+    def find_path(self):
+        query = self.path_entry.get().strip().lower()
+        if self.character_id is None or not query:
+            self.status_label.configure(text="Select a character and enter a name to find a path.")
+            return
+        if not self.names:
+            self._load_names()
+
+        # Prefer an exact name match, then the first name containing the text
+        matches = [node for node, name in self.names.items() if name.lower() == query]
+        matches = matches or [node for node, name in self.names.items() if query in name.lower()]
+        if not matches:
+            self.status_label.configure(text=f"No character named '{self.path_entry.get().strip()}'.")
+            return
+
+        path = self.graph.shortest_path(self.character_id, matches[0])
+        if not path:
+            self.status_label.configure(text=f"{self.names[matches[0]]} is not connected to this character.")
+            return
+
+        self.path = path
+        if self.scope_var.get() == "Neighbourhood" and len(path) - 1 > int(self.hops_var.get()):
+            self.scope_var.set("Universe")
+        self.redraw()
+        self.status_label.configure(
+            text=f"{len(path) - 1} hops: " + " -> ".join(self.names.get(node, str(node)) for node in path)
+        )
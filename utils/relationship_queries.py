@@ -0,0 +1,167 @@
+import sqlite3
+
+
+class RelationshipQueries:
+    """
+    Cross-reference queries over characters, lorebooks, character relationships and SillyTavern tags.
+    Database questions are answered with the lorebook_link_counts / character_link_counts views and
+    joins on one connection per call; the tag side joins the tag mirror's tags / character_tags tables
+    (see utils/tag_mirror.py), keyed by character name like the edit panel and the tag filters.
+    """
+
+    def __init__(self, db_path, get_tag_manager):
+        self.db_path = db_path
+        self.get_tag_manager = get_tag_manager  # Called on use, so the tag manager can be created lazily
+
+    @property
+    def tag_manager(self):
+        return self.get_tag_manager()
+
+    def _sync_tags(self):
+        """Bring the tag mirror up to date if settings.json changed (the tag manager syncs it on load)."""
+        self.tag_manager.reload_tags_if_changed()
+
+    ########## Single-call questions ##########
+
+    def lorebooks_for_character(self, character_id):
+        """Lorebooks linked to a character: [{"id", "filename", "removed"}]."""
+        with sqlite3.connect(self.db_path) as connection:
+            rows = connection.execute("""
+                SELECT v.lorebook_id, v.filename, v.removed
+                FROM lorebook_character_links lcl
+                JOIN lorebook_link_counts v ON v.lorebook_id = lcl.lorebook_id
+                WHERE lcl.character_id = ?
+                ORDER BY v.filename
+            """, (character_id,)).fetchall()
+        return [{"id": row[0], "filename": row[1], "removed": bool(row[2])} for row in rows]
+
+    def characters_for_lorebook(self, lorebook_id):
+        """Characters linked to a lorebook: [{"id", "name"}]."""
+        with sqlite3.connect(self.db_path) as connection:
+            rows = connection.execute("""
+                SELECT c.id, c.name
+                FROM lorebook_character_links lcl
+                JOIN characters c ON c.id = lcl.character_id
+                WHERE lcl.lorebook_id = ?
+                ORDER BY c.name COLLATE NOCASE
+            """, (lorebook_id,)).fetchall()
+        return [{"id": row[0], "name": row[1]} for row in rows]
+
+    def unlinked_lorebooks(self):
+        """Lorebooks (still in SillyTavern) that no character links to."""
+        with sqlite3.connect(self.db_path) as connection:
+            rows = connection.execute("""
+                SELECT lorebook_id, filename FROM lorebook_link_counts
+                WHERE character_count = 0 AND NOT removed
+                ORDER BY filename
+            """).fetchall()
+        return [{"id": row[0], "filename": row[1]} for row in rows]
+
+    def characters_sharing_tags(self, character_id, limit=50):
+        """Characters sharing at least one tag, most shared first: [{"id", "name", "shared_tags"}]."""
+        self._sync_tags()
+        with sqlite3.connect(self.db_path) as connection:
+            top = connection.execute("""
+                SELECT other.id, other.name
+                FROM characters c
+                JOIN character_tags own ON own.character_name = c.name
+                JOIN character_tags theirs ON theirs.tag_id = own.tag_id
+                JOIN characters other ON other.name = theirs.character_name AND other.id != c.id
+                WHERE c.id = ?
+                GROUP BY other.id
+                ORDER BY COUNT(*) DESC, other.name COLLATE NOCASE, other.id
+                LIMIT ?
+            """, (character_id, limit)).fetchall()
+            if not top:
+                return []
+
+            placeholders = ",".join("?" * len(top))
+            shared_tags = {}
+            for other_id, tag_name in connection.execute(f"""
+                SELECT other.id, t.name
+                FROM characters c
+                JOIN character_tags own ON own.character_name = c.name
+                JOIN tags t ON t.id = own.tag_id
+                JOIN character_tags theirs ON theirs.tag_id = own.tag_id
+                JOIN characters other ON other.name = theirs.character_name
+                WHERE c.id = ? AND other.id IN ({placeholders})
+            """, (character_id, *[other_id for other_id, _ in top])):
+                shared_tags.setdefault(other_id, []).append(tag_name)
+
+        return [
+            {"id": other_id, "name": name, "shared_tags": sorted(shared_tags.get(other_id, []))}
+            for other_id, name in top
+        ]
+
+    def character_overview(self, character_id, limit=50):
+        """Everything the dashboard shows for one character, on one connection."""
+        with sqlite3.connect(self.db_path) as connection:
+            name_row = connection.execute("SELECT name FROM characters WHERE id = ?", (character_id,)).fetchone()
+            lorebooks = connection.execute("""
+                SELECT v.filename, v.removed
+                FROM lorebook_character_links lcl
+                JOIN lorebook_link_counts v ON v.lorebook_id = lcl.lorebook_id
+                WHERE lcl.character_id = ?
+                ORDER BY v.filename
+            """, (character_id,)).fetchall()
+            related = connection.execute("""
+                SELECT c.name
+                FROM character_relationships r
+                JOIN characters c ON c.id = r.related_character_id
+                WHERE r.character_id = ?
+                ORDER BY c.name COLLATE NOCASE
+            """, (character_id,)).fetchall()
+
+        return {
+            "name": name_row[0] if name_row else "",
+            "lorebooks": [row[0] + (" (removed)" if row[1] else "") for row in lorebooks],
+            "related": [row[0] for row in related],
+            "sharing_tags": self.characters_sharing_tags(character_id, limit),
+        }
+
+    def dashboard_summary(self, limit=50):
+        """Library-wide counts and top/bottom lists for the dashboard, on one connection."""
+        self._sync_tags()
+        with sqlite3.connect(self.db_path) as connection:
+            totals = connection.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM characters),
+                    (SELECT COUNT(*) FROM lorebooks),
+                    (SELECT COUNT(*) FROM lorebook_character_links),
+                    (SELECT COUNT(*) FROM character_relationships) / 2,
+                    (SELECT COUNT(*) FROM character_link_counts WHERE lorebook_count = 0),
+                    (SELECT COUNT(*) FROM characters WHERE name NOT IN (SELECT character_name FROM character_tags))
+            """).fetchone()
+            unlinked = connection.execute("""
+                SELECT filename FROM lorebook_link_counts
+                WHERE character_count = 0 AND NOT removed
+                ORDER BY filename LIMIT ?
+            """, (limit,)).fetchall()
+            unlinked_count = connection.execute(
+                "SELECT COUNT(*) FROM lorebook_link_counts WHERE character_count = 0 AND NOT removed"
+            ).fetchone()[0]
+            most_linked = connection.execute("""
+                SELECT filename, character_count FROM lorebook_link_counts
+                WHERE character_count > 0
+                ORDER BY character_count DESC, filename LIMIT ?
+            """, (limit,)).fetchall()
+            top_tags = connection.execute("""
+                SELECT t.name, COUNT(c.id) FROM tags t
+                JOIN character_tags ct ON ct.tag_id = t.id
+                JOIN characters c ON c.name = ct.character_name
+                GROUP BY t.id
+                ORDER BY COUNT(c.id) DESC, t.name COLLATE NOCASE LIMIT ?
+            """, (limit,)).fetchall()
+
+        return {
+            "characters": totals[0],
+            "lorebooks": totals[1],
+            "lorebook_links": totals[2],
+            "relationships": totals[3],
+            "characters_without_lorebooks": totals[4],
+            "characters_without_tags": totals[5],
+            "unlinked_lorebook_count": unlinked_count,
+            "unlinked_lorebooks": [row[0] for row in unlinked],
+            "most_linked_lorebooks": most_linked,
+            "top_tags": top_tags,
+        }
@@ -0,0 +1,85 @@
+import bisect
+from operator import attrgetter
+
+# Sort option -> (Character key attribute, descending)
+SORT_OPTIONS = {
+    "A - Z": ("name_key", False),
+    "Z - A": ("name_key", True),
+    "Newest": ("created_key", True),
+    "Oldest": ("created_key", False),
+    "Most Recently Edited": ("modified_key", True),
+}
+SORT_KEYS = ("name_key", "created_key", "modified_key")
+
+
+class SortIndex:
+    """
+    The character list kept presorted by name, creation date and modification date; each order is sorted
+    once, the first time it is read, and descending options read it backwards. Adding, removing or
+    editing one character moves only that entry (binary search), and filtered views are taken from the
+    presorted order, so nothing is re-sorted.
+    """
+
+    def __init__(self, characters=()):
+        self.rebuild(characters)
+
+    def rebuild(self, characters):
+        """Index a whole list (on load or reload). Each order is sorted when it is first read."""
+        self._keys = {}        # sort key -> ascending [(key, id)]
+        self._characters = {}  # sort key -> Character entries, parallel to _keys
+        # id -> (Character, key values as indexed), to find a character's entries again after an edit
+        self._indexed = {character.id: (character, self._key_values(character)) for character in characters}
+
+    def __len__(self):
+        return len(self._indexed)
+
+    @staticmethod
+    def _key_values(character):
+        return character.name_key, character.created_key, character.modified_key
+
+    def _order(self, attribute):
+        if attribute not in self._characters:
+            ordered = sorted((character for character, _ in self._indexed.values()), key=attrgetter(attribute, "id"))
+            self._keys[attribute] = [(getattr(character, attribute), character.id) for character in ordered]
+            self._characters[attribute] = ordered
+        return self._characters[attribute]
+
+    def add(self, character):
+        if character.id in self._indexed:
+            self.remove(character.id)
+        key_values = self._key_values(character)
+        for attribute, value in zip(SORT_KEYS, key_values):
+            if attribute in self._characters:
+                entry = (value, character.id)
+                position = bisect.bisect_left(self._keys[attribute], entry)
+                self._keys[attribute].insert(position, entry)
+                self._characters[attribute].insert(position, character)
+        self._indexed[character.id] = (character, key_values)
+
+    def remove(self, character_id):
+        _, key_values = self._indexed.pop(character_id, (None, None))
+        if key_values is None:
+            return
+        for attribute, value in zip(SORT_KEYS, key_values):
+            if attribute in self._characters:
+                position = bisect.bisect_left(self._keys[attribute], (value, character_id))
+                del self._keys[attribute][position]
+                del self._characters[attribute][position]
+
+    def update(self, character):
+        """Reposition a character after Character.update changed its name or dates."""
+        self.remove(character.id)
+        self.add(character)
+
+    def ordered(self, sort_option, members=None):
+        """
+        Characters in sort_option order, optionally only those in members (any iterable of Character
+        entries). Unknown options fall back to A - Z.
+        """
+        attribute, descending = SORT_OPTIONS.get(sort_option, SORT_OPTIONS["A - Z"])
+        characters = self._order(attribute)
+        if members is not None:
+            member_ids = {character.id for character in members}
+            if len(member_ids) < len(self._indexed):
+                characters = [character for character in characters if character.id in member_ids]
+        return characters[::-1] if descending else list(characters)
@@ -4,9 +4,10 @@ import unicodedata
 from pathlib import Path
 
 class SillyTavernTagManager:
-    def __init__(self, sillytavern_path):
+    def __init__(self, sillytavern_path, tag_mirror=None):
         self.sillytavern_path = sillytavern_path
         self.settings_file = Path(sillytavern_path).resolve() / "settings.json"
+        self.tag_mirror = tag_mirror  # Optional TagMirror kept in sync on every load and save
         self.tags = []       # List of tags
         self.tag_map = {}    # Mapping of characters to tag IDs
         self.load_tags()
@@ -17,6 +18,7 @@ class SillyTavernTagManager:
 
     def load_tags(self):
         """Load tags from SillyTavern settings.json."""
+        self._loaded_stat = self._settings_stat()
         if self.settings_file.exists():
             try:
                 with self.settings_file.open("r", encoding="utf-8", errors="replace") as file:
@@ -40,6 +42,8 @@ class SillyTavernTagManager:
             self.settings = {}
             self.tags = []
             self.tag_map = {}
+        if self.tag_mirror:
+            self.tag_mirror.sync(self.tags, self.tag_map)
 
 
     def reload_tags(self):
@@ -47,6 +51,18 @@ class SillyTavernTagManager:
         # print("Reloading tags...")
         self.load_tags()
 
+    def reload_tags_if_changed(self):
+        """Reload only if settings.json changed since it was last loaded or saved (it can be several MB)."""
+        if self._settings_stat() != self._loaded_stat:
+            self.load_tags()
+
+    def _settings_stat(self):
+        try:
+            stat = self.settings_file.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
     def save_tags(self):
         print("Saving tags...")  # Debug
         self.settings["tags"] = self.tags
@@ -54,6 +70,9 @@ class SillyTavernTagManager:
         try:
             with open(self.settings_file, "w", encoding="utf-8") as file:
                 json.dump(self.settings, file, indent=4, ensure_ascii=False)  # Use `ensure_ascii=False` for proper UTF-8 handling
+            self._loaded_stat = self._settings_stat()
+            if self.tag_mirror:
+                self.tag_mirror.sync(self.tags, self.tag_map)
             print("Tags saved successfully.")
         except Exception as e:
             print(f"Error saving tags: {e}")
@@ -0,0 +1,34 @@
+import time
+
+STARTUP_BUDGET = 1.5  # Seconds from launch until the window is drawn with the character list
+
+
+class StartupProfiler:
+    """
+    Times the phases of app startup. Marks are cheap and always taken; the breakdown is only printed
+    when the app is started with --profile-startup.
+    """
+
+    def __init__(self, started, enabled=False):
+        self.started = started
+        self.enabled = enabled
+        self.last = started
+        self.phases = []  # (label, seconds)
+
+    def mark(self, label):
+        """Close the current phase under label."""
+        now = time.perf_counter()
+        self.phases.append((label, now - self.last))
+        self.last = now
+
+    def finish(self, label):
+        """Close the last phase and print the breakdown."""
+        self.mark(label)
+        if not self.enabled:
+            return
+        total = self.last - self.started
+        print("Startup profile:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<32} {seconds * 1000:8.1f} ms")
+        status = "within" if total <= STARTUP_BUDGET else "OVER"
+        print(f"  {'total':<32} {total * 1000:8.1f} ms ({status} the {STARTUP_BUDGET * 1000:.0f} ms budget)")
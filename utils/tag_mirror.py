@@ -0,0 +1,133 @@
+import hashlib
+import json
+import sqlite3
+
+CHECKSUM_SETTING = "tag_mirror_checksum"
+
+
+def character_name_for(file_name):
+    """Tag map keys are card file names ("Name.png"); the mirror stores the character name they stand for."""
+    return file_name[:-4] if file_name.endswith(".png") else file_name
+
+
+class TagMirror:
+    """
+    Copy of SillyTavern's tags and tag map in the vault database (tags, character_tags), so tag filters
+    and counts can be answered with indexed queries and joined with character queries. sync() is called
+    whenever the tag manager loads or saves settings.json; a checksum of the tag data skips unchanged
+    files, and changes are applied as an insert/delete diff in one transaction.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._links = None  # character name -> frozenset of tag ids, as last written (loaded on first sync)
+
+    @staticmethod
+    def checksum(tags, tag_map):
+        data = json.dumps([tags, tag_map], separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def sync(self, tags, tag_map):
+        """Bring the mirror in line with the given tags and tag map. Returns True if anything changed."""
+        checksum = self.checksum(tags, tag_map)
+        try:
+            with sqlite3.connect(self.db_path) as connection:
+                row = connection.execute("SELECT value FROM settings WHERE key = ?", (CHECKSUM_SETTING,)).fetchone()
+                if row and row[0] == checksum:
+                    return False
+
+                wanted_tags = {tag["id"]: tag["name"] for tag in tags if tag.get("id") is not None}
+                current_tags = dict(connection.execute("SELECT id, name FROM tags"))
+                connection.executemany(
+                    "DELETE FROM tags WHERE id = ?", [(tag_id,) for tag_id in current_tags.keys() - wanted_tags.keys()]
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO tags (id, name) VALUES (?, ?)",
+                    [(tag_id, name) for tag_id, name in wanted_tags.items() if current_tags.get(tag_id) != name],
+                )
+
+                if self._links is None:
+                    links = {}
+                    for character_name, tag_id in connection.execute("SELECT character_name, tag_id FROM character_tags"):
+                        links.setdefault(character_name, set()).add(tag_id)
+                    self._links = {name: frozenset(tag_ids) for name, tag_ids in links.items()}
+
+                wanted_links = {}
+                for file_name, tag_ids in tag_map.items():
+                    if tag_ids:
+                        name = character_name_for(file_name)
+                        tag_ids = frozenset(tag_ids)
+                        wanted_links[name] = wanted_links[name] | tag_ids if name in wanted_links else tag_ids
+
+                # Only characters whose tag set changed are rewritten
+                changed = [
+                    name for name in wanted_links.keys() | self._links.keys()
+                    if wanted_links.get(name) != self._links.get(name)
+                ]
+                connection.executemany("DELETE FROM character_tags WHERE character_name = ?", [(name,) for name in changed])
+                connection.executemany(
+                    "INSERT INTO character_tags (character_name, tag_id) VALUES (?, ?)",
+                    [(name, tag_id) for name in changed for tag_id in wanted_links.get(name, ())],
+                )
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (CHECKSUM_SETTING, checksum)
+                )
+            self._links = wanted_links
+            return True
+        except sqlite3.Error as e:
+            self._links = None  # Reload from the database next time
+            print(f"Error syncing the tag mirror: {e}")
+            return False
+
+    ########## Queries ##########
+
+    @staticmethod
+    def _with_all_tags(tag_names):
+        """Subquery (and params) selecting the names of characters that have every tag in tag_names."""
+        tag_names = list(set(tag_names))
+        placeholders = ", ".join("?" * len(tag_names))
+        subquery = f"""
+            SELECT ct.character_name FROM character_tags ct JOIN tags t ON t.id = ct.tag_id
+            WHERE t.name IN ({placeholders})
+            GROUP BY ct.character_name HAVING COUNT(DISTINCT t.name) = ?
+        """
+        return subquery, [*tag_names, len(tag_names)]
+
+    def tag_filter_clause(self, tag_names):
+        """Condition on characters.name (and its params) for characters having every tag in tag_names."""
+        subquery, params = self._with_all_tags(tag_names)
+        return f"name IN ({subquery})", params
+
+    def untagged_clause(self):
+        """Condition on characters.name for characters without any tag."""
+        return "name NOT IN (SELECT character_name FROM character_tags)"
+
+    def names_with_tags(self, tag_names):
+        """Names of the characters that have every tag in tag_names."""
+        subquery, params = self._with_all_tags(tag_names)
+        with sqlite3.connect(self.db_path) as connection:
+            return {row[0] for row in connection.execute(subquery, params)}
+
+    def tagged_names(self):
+        """Names of the characters that have at least one tag."""
+        with sqlite3.connect(self.db_path) as connection:
+            return {row[0] for row in connection.execute("SELECT DISTINCT character_name FROM character_tags")}
+
+    def tag_counts(self):
+        """[(tag name, number of characters)] for every tag, sorted A-Z."""
+        with sqlite3.connect(self.db_path) as connection:
+            return connection.execute("""
+                SELECT t.name, COUNT(ct.character_name) FROM tags t
+                LEFT JOIN character_tags ct ON ct.tag_id = t.id
+                GROUP BY t.id
+                ORDER BY t.name COLLATE NOCASE
+            """).fetchall()
+
+    def search(self, query):
+        """Tag names containing query (case-insensitive)."""
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with sqlite3.connect(self.db_path) as connection:
+            return [row[0] for row in connection.execute(
+                "SELECT name FROM tags WHERE name LIKE ? ESCAPE '\\' ORDER BY name COLLATE NOCASE", (f"%{escaped}%",)
+            )]